@@ -15,17 +15,21 @@ def install_clib_shelf_button():
     SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
     icon_dir = os.path.join(SCRIPT_DIR, "icons")
     icon_name = os.path.join(icon_dir, "logo.png")
-    script = '''import CLib.main as CLib
-from importlib import reload
-reload(CLib)
-CLib'''
+    # the window is built once per session and raised on later clicks, see CLib/__init__.py
+    script = '''import CLib
+CLib.show()'''
 
     if not cmds.shelfLayout(shelf_name, exists=True):
         mel.eval(f'addNewShelfTab "{shelf_name}"')
 
+    # replace buttons left by older installs, their reload() script rebuilt the whole tool on every click
+    for button in cmds.shelfLayout(shelf_name, query=True, childArray=True) or []:
+        if cmds.shelfButton(button, exists=True) and cmds.shelfButton(button, query=True, label=True) == label:
+            cmds.deleteUI(button)
+
     cmds.setParent(shelf_name)
     cmds.shelfButton(
-        label="CLib",
+        label=label,
         annotation="Launch CLib Control Studio",
         image=icon_name,
         imageOverlayLabel="CLib",
@@ -0,0 +1,284 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def maya_knots(info):
+    if info.get('knots'):
+        return list(info['knots'])
+    # older shape files carry no knots, rebuild the uniform vector maya gives curves drawn from points
+    degree = info['degree']
+    if info['form'] == 2:
+        return list(range(1 - degree, info['spans'] + degree))
+    spans = len(info['cv_pos']) - degree
+    return [0] * degree + list(range(1, spans)) + [spans] * degree
+
+
+def full_knots(info):
+    # the shape files store maya's knot vector, which leaves out the first and last knot of the textbook one
+    knots = maya_knots(info)
+    if info['form'] == 2:
+        # periodic knots keep their spacing past the ends
+        return [2 * knots[0] - knots[1]] + knots + [2 * knots[-1] - knots[-2]]
+    return [knots[0]] + knots + [knots[-1]]
+
+
+def curve_points(info):
+    # cvs as maya holds them, periodic curves get their first <degree> cvs repeated at the end
+    points = [list(pt) for pt in info['cv_pos']]
+    if info['form'] == 2:
+        points += points[:info['degree']]
+    return points
+
+
+def _de_boor(span, t, degree, knots, points):
+    d = [list(points[j + span - degree]) for j in range(degree + 1)]
+    for r in range(1, degree + 1):
+        for j in range(degree, r - 1, -1):
+            left = knots[j + span - degree]
+            right = knots[j + 1 + span - r]
+            alpha = (t - left) / (right - left) if right != left else 0.0
+            d[j] = [(1.0 - alpha) * a + alpha * b for a, b in zip(d[j - 1], d[j])]
+    return d[degree]
+
+
+def sample_curve(info, samples_per_span=8):
+    # polyline along the actual curve, degree 1 curves are just their cvs
+    points = curve_points(info)
+    degree = info['degree']
+    if degree <= 1 or len(points) <= degree:
+        if info['form'] >= 1 and points and points[0] != points[-1]:
+            points.append(points[0])
+        return points
+
+    knots = full_knots(info)
+    samples = []
+    for span in range(degree, len(points)):
+        start, end = knots[span], knots[span + 1]
+        if end <= start:
+            continue
+        steps = samples_per_span if span < len(points) - 1 else samples_per_span + 1
+        for step in range(steps):
+            samples.append(_de_boor(span, start + (end - start) * step / samples_per_span, degree, knots, points))
+    return samples
+
+
+def _segment_distance(point, a, b):
+    ab = [b[i] - a[i] for i in range(3)]
+    length = ab[0] * ab[0] + ab[1] * ab[1] + ab[2] * ab[2]
+    t = 0.0
+    if length > 0.0:
+        t = max(0.0, min(1.0, sum((point[i] - a[i]) * ab[i] for i in range(3)) / length))
+    return math.dist(point, [a[i] + ab[i] * t for i in range(3)])
+
+
+def douglas_peucker(points, tolerance):
+    # sorted indices of the points to keep, no dropped point is further than tolerance from the kept chain
+    keep = {0, len(points) - 1}
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        furthest, distance = None, tolerance
+        for i in range(first + 1, last):
+            d = _segment_distance(points[i], points[first], points[last])
+            if d > distance:
+                furthest, distance = i, d
+        if furthest is not None:
+            keep.add(furthest)
+            stack += [(first, furthest), (furthest, last)]
+    return sorted(keep)
+
+
+def _douglas_peucker_ring(points, tolerance):
+    # a closed loop has no ends to anchor on, split it at the first cv and the cv furthest from it
+    far = max(range(len(points)), key=lambda i: math.dist(points[0], points[i]))
+    if far == 0:
+        return [0]
+    second = douglas_peucker(points[far:] + points[:1], tolerance)
+    return douglas_peucker(points[:far + 1], tolerance) + [far + i for i in second[1:-1]]
+
+
+def curve_deviation(info, simplified, samples_per_span=8):
+    # how far the simplified curve strays from the original, measured from samples along the original.
+    # both polylines run the same way, so each sample only looks at the segments just ahead of the last
+    # match (the first one looks everywhere), losing the way only ever overstates the deviation
+    original = sample_curve(info, samples_per_span)
+    polyline = sample_curve(simplified, samples_per_span)
+    if len(polyline) < 2:
+        return max((math.dist(pt, polyline[0]) for pt in original), default=0.0) if polyline else float('inf')
+    segments = len(polyline) - 1
+    closed = info['form'] >= 1
+    window = 4
+    worst, position = 0.0, None
+    for point in original:
+        if position is None:
+            candidates = range(segments)
+        elif closed:
+            candidates = [(position + i) % segments for i in range(-2, window + 1)]
+        else:
+            candidates = range(max(0, position - 2), min(segments, position + window + 1))
+        position = min(candidates, key=lambda i: _segment_distance(point, polyline[i], polyline[i + 1]))
+        worst = max(worst, _segment_distance(point, polyline[position], polyline[position + 1]))
+    return worst
+
+
+def decimate_shape(info, tolerance, attempts=6):
+    # the shape with as few cvs as douglas-peucker on its control polygon leaves within tolerance of the
+    # original curve, or info itself when no cv can go. removing cvs moves a smooth curve by less than the
+    # cv's distance from the chord, but not always by enough less, so each result is checked against the
+    # original curve and the reduction retried at half the tolerance if it strays too far.
+    # the knots of a decimated shape are rebuilt uniform
+    points = [list(pt) for pt in info['cv_pos']]
+    degree = info['degree']
+    periodic = info['form'] == 2
+    minimum = 2 * degree + 1 if periodic else degree + 1
+    if tolerance <= 0 or len(points) <= minimum:
+        return info
+    step = tolerance
+    for _ in range(attempts):
+        keep = _douglas_peucker_ring(points, step) if periodic else douglas_peucker(points, step)
+        if len(keep) >= len(points):
+            return info
+        if len(keep) >= minimum:
+            simplified = {key: value for key, value in info.items() if key != 'knots'}
+            simplified.update(cv_pos=[points[i] for i in keep], cv_len=len(keep),
+                              spans=len(keep) if periodic else len(keep) - degree)
+            simplified['knots'] = [float(k) for k in maya_knots(simplified)]
+            if curve_deviation(info, simplified) <= tolerance:
+                return simplified
+        step /= 2
+    return info
+
+
+def decimate_curve_data(curve_dict, tolerance):
+    # -> (decimated copy of a whole control's shapes, cv count before, cv count after)
+    decimated = {shape: decimate_shape(info, tolerance) for shape, info in curve_dict.items()}
+    return (decimated, sum(len(info['cv_pos']) for info in curve_dict.values()),
+            sum(len(info['cv_pos']) for info in decimated.values()))
+
+
+VIEW_AXES = {
+    # view: ((axis, sign) across the screen, (axis, sign) up the screen), as maya's orthographic cameras see it
+    'top': ((0, 1.0), (2, -1.0)),
+    'front': ((0, 1.0), (1, 1.0)),
+    'side': ((2, -1.0), (1, 1.0)),
+}
+
+
+def pick_view(points):
+    # looks down whichever axis the shape is flattest along
+    if not points:
+        return 'top'
+    extents = [max(pt[i] for pt in points) - min(pt[i] for pt in points) for i in range(3)]
+    flat_axis = extents.index(min(extents))
+    return ('side', 'top', 'front')[flat_axis]
+
+
+def project(points, view='top'):
+    (x_axis, x_sign), (y_axis, y_sign) = VIEW_AXES[view]
+    return [(pt[x_axis] * x_sign, pt[y_axis] * y_sign) for pt in points]
+
+
+# 4x4 matrices below follow maya's row-vector convention: point * matrix, translation in the last row,
+# and compose(a, b) applies a first.
+def identity_matrix():
+    return [[1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0], [0.0, 0.0, 0.0, 1.0]]
+
+
+def scale_matrix(scale):
+    sx, sy, sz = scale if isinstance(scale, (list, tuple)) else (scale, scale, scale)
+    return [[sx, 0.0, 0.0, 0.0], [0.0, sy, 0.0, 0.0], [0.0, 0.0, sz, 0.0], [0.0, 0.0, 0.0, 1.0]]
+
+
+def translate_matrix(translation):
+    matrix = identity_matrix()
+    matrix[3][:3] = [float(v) for v in translation]
+    return matrix
+
+
+def rotate_matrix(rotation):
+    # euler angles in degrees, xyz rotate order like a default maya transform
+    rx, ry, rz = [math.radians(a) for a in rotation]
+    cx, sx = math.cos(rx), math.sin(rx)
+    cy, sy = math.cos(ry), math.sin(ry)
+    cz, sz = math.cos(rz), math.sin(rz)
+    x = [[1.0, 0.0, 0.0, 0.0], [0.0, cx, sx, 0.0], [0.0, -sx, cx, 0.0], [0.0, 0.0, 0.0, 1.0]]
+    y = [[cy, 0.0, -sy, 0.0], [0.0, 1.0, 0.0, 0.0], [sy, 0.0, cy, 0.0], [0.0, 0.0, 0.0, 1.0]]
+    z = [[cz, sz, 0.0, 0.0], [-sz, cz, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0], [0.0, 0.0, 0.0, 1.0]]
+    return compose(x, y, z)
+
+
+def multiply(a, b):
+    return [[sum(a[i][k] * b[k][j] for k in range(4)) for j in range(4)] for i in range(4)]
+
+
+def compose(*matrices):
+    result = identity_matrix()
+    for matrix in matrices:
+        result = multiply(result, matrix)
+    return result
+
+
+def is_identity(matrix):
+    return all(abs(matrix[i][j] - (1.0 if i == j else 0.0)) < 1e-12 for i in range(4) for j in range(4))
+
+
+def fit_matrix(source, target):
+    # the row-vector matrix taking the source points closest to the target points (least squares, affine).
+    # a flat shape leaves the axis across it undetermined, the small ridge term keeps that part at zero
+    rows = [[x, y, z, 1.0] for x, y, z in source]
+    normal = [[sum(row[i] * row[j] for row in rows) for j in range(4)] for i in range(4)]
+    ridge = 1e-9 * max(1.0, sum(normal[i][i] for i in range(4)))
+    for i in range(4):
+        normal[i][i] += ridge
+    rhs = [[sum(row[i] * pt[k] for row, pt in zip(rows, target)) for k in range(3)] for i in range(4)]
+    # gauss-jordan with partial pivoting, the ridge keeps the system solvable
+    for col in range(4):
+        pivot = max(range(col, 4), key=lambda r: abs(normal[r][col]))
+        normal[col], normal[pivot] = normal[pivot], normal[col]
+        rhs[col], rhs[pivot] = rhs[pivot], rhs[col]
+        for r in range(4):
+            if r != col and normal[r][col]:
+                factor = normal[r][col] / normal[col][col]
+                normal[r] = [a - factor * b for a, b in zip(normal[r], normal[col])]
+                rhs[r] = [a - factor * b for a, b in zip(rhs[r], rhs[col])]
+    solution = [[v / normal[i][i] for v in rhs[i]] for i in range(4)]
+    return [solution[0] + [0.0], solution[1] + [0.0], solution[2] + [0.0], solution[3] + [1.0]]
+
+
+def curve_tuples(info, matrix=None):
+    # curve_points through the matrix as the (x, y, z) tuples maya's setAttr takes. cvs still in the flat
+    # array of a binary shape file go through without a list per cv
+    flat = getattr(info['cv_pos'], 'flat', None)
+    if flat is None:
+        points = [tuple(pt) for pt in transform_points(info['cv_pos'], matrix)]
+    elif matrix is None:
+        values = iter(flat)
+        points = list(zip(values, values, values))
+    elif np is not None:
+        m = np.asarray(matrix, dtype=float)
+        points = list(map(tuple, (np.frombuffer(flat, dtype=flat.typecode).reshape(-1, 3) @ m[:3, :3]
+                                  + m[3, :3]).tolist()))
+    else:
+        (a, b, c, _), (d, e, f, _), (g, h, i, _), (tx, ty, tz, _) = matrix
+        values = iter(flat)
+        points = [(x * a + y * d + z * g + tx, x * b + y * e + z * h + ty, x * c + y * f + z * i + tz)
+                  for x, y, z in zip(values, values, values)]
+    if info['form'] == 2:
+        points += points[:info['degree']]
+    return points
+
+
+def transform_points(points, matrix):
+    # every point through the matrix at once, numpy when maya's python has it
+    if matrix is None or not points:
+        return [list(pt) for pt in points]
+    if np is not None:
+        m = np.asarray(matrix, dtype=float)
+        return (np.asarray(points, dtype=float) @ m[:3, :3] + m[3, :3]).tolist()
+    (a, b, c, _), (d, e, f, _), (g, h, i, _), (tx, ty, tz, _) = matrix
+    return [[x * a + y * d + z * g + tx, x * b + y * e + z * h + ty, x * c + y * f + z * i + tz]
+            for x, y, z in points]
@@ -0,0 +1,95 @@
+import os
+import sys
+import json
+import shutil
+import argparse
+
+from . import shape_format
+from . import curve_math
+from .library_roots import load_library, Library, LibraryRoot, LibraryConfigError
+
+# Decimates every stored control of the library offline, the same reduction saving with a tolerance does
+# (see curve_math.decimate_shape):
+#
+#   python -m CLib.decimate --tolerance 0.01                    the writable roots of the configured library
+#   python -m CLib.decimate --tolerance 0.01 --root path/to/library
+#   python -m CLib.decimate --tolerance 0.01 --dry-run          only report how many cvs would go
+#   python -m CLib.decimate --tolerance 0.01 --backup old/      copy every rewritten file there first
+#
+# The tolerance is in the controls' own units, so a library of very differently sized shapes is better done
+# a folder at a time. Read-only roots are left alone, decimate them where they are published.
+
+
+def decimate_library(shape_dir, tolerance, dry_run=False, backup_dir=None, index=None):
+    # -> [(name, cvs before, cvs after), ...] of every shape file in shape_dir, rewrites those that shrank.
+    # the LibraryIndex of shape_dir, when given, is refreshed once the files are rewritten
+    results = []
+    for name, file_path in sorted(shape_format.list_shape_files(shape_dir).items(), key=lambda item: item[0].lower()):
+        try:
+            curve_dict = shape_format.read_shape_file(file_path)
+        except (OSError, ValueError) as e:
+            print(f"[CLib] Skipping unreadable shape file {file_path}: {e}")
+            continue
+        decimated, before, after = curve_math.decimate_curve_data(curve_dict, tolerance)
+        results.append((name, before, after))
+        if after == before or dry_run:
+            continue
+        if backup_dir:
+            os.makedirs(backup_dir, exist_ok=True)
+            shutil.copy2(file_path, backup_dir)
+        shape_format.write_shape_file(file_path, decimated)
+    if index is not None and not dry_run:
+        index.refresh()
+    return results
+
+
+def format_report(root, results, dry_run=False):
+    before = sum(result[1] for result in results)
+    after = sum(result[2] for result in results)
+    changed = [result for result in results if result[2] < result[1]]
+    lines = [f"[CLib] {root.name}: {len(changed)} of {len(results)} controls {'would lose' if dry_run else 'lost'} "
+             f"cvs, {before} -> {after} cvs in total"]
+    lines += [f"  {name:<32} {cvs_before:>6} -> {cvs_after}" for name, cvs_before, cvs_after in changed]
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Decimate the stored controls of the library within a tolerance.")
+    parser.add_argument('--tolerance', type=float, required=True,
+                        help="furthest a decimated curve may stray from the original, in the controls' units")
+    parser.add_argument('--root', help="a single library root (folder holding shapes and icons) instead of the config")
+    parser.add_argument('--config', help="library config, the usual one by default")
+    parser.add_argument('--dry-run', action='store_true', help="only report what would be decimated")
+    parser.add_argument('--backup', help="copy every file before it is rewritten to this folder")
+    parser.add_argument('--json', help="also write {root: {control: [cvs before, cvs after]}} to this json file")
+    args = parser.parse_args(argv)
+
+    if args.tolerance <= 0:
+        print("[CLib] --tolerance has to be above 0")
+        return 1
+    try:
+        library = Library([LibraryRoot(args.root)]) if args.root else load_library(args.config)
+    except LibraryConfigError as e:
+        print(f"[CLib] {e}")
+        return 1
+
+    report = {}
+    for root in library.roots:
+        if root.read_only:
+            print(f"[CLib] {root.name}: read-only, skipped")
+            continue
+        backup_dir = os.path.join(args.backup, root.name) if args.backup else None
+        results = decimate_library(root.shape_dir, args.tolerance, args.dry_run, backup_dir)
+        print(format_report(root, results, args.dry_run))
+        report[root.name] = {name: [before, after] for name, before, after in results}
+    if not args.dry_run:
+        # the persisted indexes carry cv counts and content ids, search facets and dedup go by them
+        library.refresh()
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
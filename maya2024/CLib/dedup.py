@@ -0,0 +1,106 @@
+import os
+import sys
+import json
+import shutil
+import argparse
+
+from . import shape_format
+from .library_roots import load_library, Library, LibraryRoot, LibraryConfigError
+
+# Finds controls stored more than once under different names, going by the content id of their geometry
+# (see library_index.content_id), and merges them down to one each:
+#
+#   python -m CLib.dedup                          report the duplicates of the configured library
+#   python -m CLib.dedup --root path/to/library   ... of a single library root instead
+#   python -m CLib.dedup --merge                  delete all but one control of every group
+#   python -m CLib.dedup --merge --map renamed.json    also write which name replaced which, for rig specs
+#
+# Of each group the control kept is, in order of preference: one from a read-only root (those can't be
+# deleted anyway), one with a hand-made icon, the oldest file, the shortest name. A hand-made icon of a
+# deleted duplicate moves over to the kept control when that one has none.
+
+
+def keep_order(library, entry):
+    return (library.is_writable(entry), entry['icon'] is None, entry['mtime'], len(entry['name']),
+            entry['name'].lower())
+
+
+def find_duplicates(library):
+    # [[kept entry, duplicate, ...], ...] for every content id held by more than one control
+    groups = {}
+    for entry in library.entries.values():
+        groups.setdefault(entry['content_id'], []).append(entry)
+    return sorted((sorted(group, key=lambda entry: keep_order(library, entry))
+                   for group in groups.values() if len(group) > 1), key=lambda group: group[0]['name'].lower())
+
+
+def merge_duplicates(library, groups, dry_run=False):
+    # deletes the writable duplicates of every group, returns {deleted name: kept name}
+    renamed = {}
+    for kept, *duplicates in groups:
+        for entry in duplicates:
+            if not library.is_writable(entry):
+                continue
+            renamed[entry['name']] = kept['name']
+            if dry_run:
+                continue
+            if entry['icon'] and not kept['icon'] and library.is_writable(kept):
+                icon_path = os.path.join(library.owners[kept['name']].icon_dir, kept['name'] + '.png')
+                shutil.move(entry['icon'], icon_path)
+                kept['icon'] = icon_path
+            elif entry['icon'] and os.path.exists(entry['icon']):
+                os.remove(entry['icon'])
+            shape_format.remove_shape_files(entry['file'])
+    return renamed
+
+
+def format_report(library, groups):
+    removable = [entry for group in groups for entry in group[1:] if library.is_writable(entry)]
+    size = sum(entry['size'] for entry in removable)
+    lines = [f"[CLib] {len(groups)} shapes stored more than once, {len(removable)} of the {len(library.entries)} "
+             f"controls in the library can go ({size / 1024:.1f} KB)"]
+    for kept, *duplicates in groups:
+        others = ', '.join(f"{entry['name']} ({library.owners[entry['name']].name}"
+                           + ('' if library.is_writable(entry) else ', read-only') + ')' for entry in duplicates)
+        lines.append(f"  {kept['name']} ({library.owners[kept['name']].name})  <-  {others}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report and merge controls stored more than once in the library.")
+    parser.add_argument('--root', help="a single library root (folder holding shapes and icons) instead of the config")
+    parser.add_argument('--config', help="library config, the usual one by default")
+    parser.add_argument('--merge', action='store_true', help="delete the duplicates, keeping one control per shape")
+    parser.add_argument('--dry-run', action='store_true', help="with --merge, only print what would be deleted")
+    parser.add_argument('--map', help="write the {deleted name: kept name} map of a merge to this json file")
+    parser.add_argument('--json', help="also write the duplicate groups to this json file")
+    args = parser.parse_args(argv)
+
+    try:
+        library = Library([LibraryRoot(args.root)]) if args.root else load_library(args.config)
+    except LibraryConfigError as e:
+        print(f"[CLib] {e}")
+        return 1
+    library.refresh()
+    groups = find_duplicates(library)
+    print(format_report(library, groups))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump([[{'name': entry['name'], 'file': entry['file'], 'root': library.owners[entry['name']].name}
+                        for entry in group] for group in groups], f, indent=2)
+
+    if args.merge:
+        renamed = merge_duplicates(library, groups, args.dry_run)
+        for name, kept in sorted(renamed.items()):
+            print(f"  {'would delete' if args.dry_run else 'deleted'} {name}, use {kept}")
+        if not args.dry_run:
+            # drops the deleted controls from the persisted indexes, moved icons included
+            library.refresh()
+        if args.map:
+            with open(args.map, 'w') as f:
+                json.dump(renamed, f, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+from collections import OrderedDict
+
+from PySide2.QtCore import Qt, QObject, QRunnable, QThreadPool, QSize, Signal
+from PySide2.QtGui import QImage, QImageReader, QPixmap
+
+ICON_SIZE = QSize(48, 48)
+
+
+def read_scaled_image(path, size=ICON_SIZE):
+    # decodes straight to display size instead of loading the full png and scaling it afterwards
+    reader = QImageReader(path)
+    source_size = reader.size()
+    if source_size.isValid():
+        source_size.scale(size, Qt.KeepAspectRatio)
+        reader.setScaledSize(source_size)
+    return reader.read()
+
+
+class _IconSignals(QObject):
+    loaded = Signal(str, object, QImage)
+
+
+class _IconTask(QRunnable):
+    def __init__(self, path, stamp, size, signals):
+        super(_IconTask, self).__init__()
+        self.path = path
+        self.stamp = stamp
+        self.size = size
+        self.signals = signals
+
+    def run(self):
+        # QImage is safe off the ui thread, QPixmap is not, so only the decode happens here
+        self.signals.loaded.emit(self.path, self.stamp, read_scaled_image(self.path, self.size))
+
+
+class IconLoader(QObject):
+    # Decodes icons on a thread pool into a bounded pixmap cache keyed by path + mtime.
+    # pixmap() never blocks, it returns None until the icon arrives and iconReady(path) is emitted.
+    iconReady = Signal(str)
+
+    def __init__(self, size=ICON_SIZE, max_entries=4096, parent=None):
+        super(IconLoader, self).__init__(parent)
+        self.size = size
+        self.max_entries = max_entries
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(2, QThreadPool.globalInstance().maxThreadCount() // 2))
+        self._cache = OrderedDict()
+        self._pending = set()
+        self._failed = set()
+        self._signals = _IconSignals(self)
+        self._signals.loaded.connect(self._on_loaded)
+
+    def pixmap(self, path, stamp=None):
+        key = (path, stamp)
+        pixmap = self._cache.get(key)
+        if pixmap is not None:
+            self._cache.move_to_end(key)
+            return pixmap
+        if key not in self._pending and key not in self._failed:
+            self._pending.add(key)
+            self.pool.start(_IconTask(path, stamp, self.size, self._signals))
+        return None
+
+    def load_now(self, path):
+        # for the odd icon that has to be there before the first paint (the placeholder)
+        return QPixmap.fromImage(read_scaled_image(path, self.size))
+
+    def insert(self, path, stamp, image):
+        # for images made in memory (rendered thumbnails), same signal as a finished decode
+        self._on_loaded(path, stamp, image)
+
+    def clear(self):
+        self._cache.clear()
+        self._failed.clear()
+
+    def _on_loaded(self, path, stamp, image):
+        key = (path, stamp)
+        self._pending.discard(key)
+        if image.isNull():
+            self._failed.add(key)
+            print(f"[CLib] Couldn't read icon {path}")
+            return
+        self._cache[key] = QPixmap.fromImage(image)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        self.iconReady.emit(path)
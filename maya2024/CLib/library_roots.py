@@ -0,0 +1,408 @@
+import os
+import sys
+import json
+import shutil
+import hashlib
+import argparse
+import threading
+
+from .library_index import LibraryIndex
+
+# CLib reads controls from an ordered list of library roots, each one a folder holding a shapes and an
+# icons folder like CLib's own. Without a config CLib's own folder is the only root, as it always was. With
+# one, e.g. a per-user library to save into in front of a read-only studio library on a network share:
+#
+#   {
+#     "roots": [
+#       {"path": "~/maya/clib_library", "name": "mine"},
+#       {"path": "//studio/rigging/clib", "name": "studio", "read_only": true, "locked": true}
+#     ],
+#     "cache_dir": "~/.clib/mirrors",       where read-only roots are mirrored to
+#     "sync_interval": 300,                 seconds between background syncs of the mirrors
+#     "builtin": true                       CLib's own shapes as a last, read-only root
+#   }
+#
+# The config is read from $CLIB_LIBRARY_CONFIG, or libraries.json beside this file. Relative paths in it
+# are relative to the config file.
+#
+# Override rules: when roots hold a shape of the same name, the first root in the list wins, so a user
+# library shadows the studio one. Locked roots can't be shadowed, their shapes win over every unlocked
+# root's. Controls are saved into the first root that isn't read-only.
+#
+# Read-only roots are mirrored into the local cache (unless "mirror": false). The ui and control creation
+# only ever read the mirror, at local disk speed however slow the share is, and sync() brings the mirror up
+# to date from a background thread. A manifest on the share (write it with
+# `python -m CLib.library_roots publish <root>`) lets a sync find what changed by reading one file instead
+# of stat-ing every file of the share. Copies are checked against the manifest hashes before replacing
+# anything in the mirror.
+CONFIG_ENV = 'CLIB_LIBRARY_CONFIG'
+CONFIG_FILE = 'libraries.json'
+CONFIG_KEYS = ('roots', 'cache_dir', 'sync_interval', 'builtin')
+ROOT_KEYS = ('path', 'name', 'read_only', 'locked', 'mirror')
+MANIFEST_FILE = '.clib_manifest.json'
+MANIFEST_VERSION = 1
+LIBRARY_DIRS = ('shapes', 'icons')
+BUILTIN_DIR = os.path.dirname(os.path.realpath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.clib', 'mirrors')
+DEFAULT_SYNC_INTERVAL = 300
+# suffix of files still being copied into a mirror
+PART_SUFFIX = '.part'
+
+
+class LibraryConfigError(ValueError):
+    pass
+
+
+def file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def library_files(root):
+    # {'shapes/circle.json': full path} for every file of a root's library folders
+    files = {}
+    for folder in LIBRARY_DIRS:
+        path = os.path.join(root, folder)
+        if not os.path.isdir(path):
+            continue
+        for item in os.scandir(path):
+            if item.is_file() and not item.name.startswith('.') and not item.name.endswith(PART_SUFFIX):
+                files[f"{folder}/{item.name}"] = item.path
+    return files
+
+
+def read_json(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path, data):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def write_manifest(root):
+    # writes the manifest of a (shared) root, hashes of files unchanged since the last one are reused
+    manifest_path = os.path.join(root, MANIFEST_FILE)
+    old = (read_json(manifest_path) or {}).get('files', {})
+    files = {}
+    for rel, path in library_files(root).items():
+        stat = os.stat(path)
+        info = {'mtime': stat.st_mtime_ns, 'size': stat.st_size}
+        previous = old.get(rel)
+        if previous and previous.get('mtime') == info['mtime'] and previous.get('size') == info['size']:
+            info['hash'] = previous['hash']
+        else:
+            info['hash'] = file_hash(path)
+        files[rel] = info
+    write_json(manifest_path, {'version': MANIFEST_VERSION, 'files': files})
+    return files
+
+
+def mirror_dir(cache_dir, path):
+    # one folder per source root, readable name plus a hash of the full path so roots can't collide
+    name = os.path.basename(path.rstrip('/\\')) or 'root'
+    return os.path.join(cache_dir, f"{name}_{hashlib.sha1(path.encode('utf-8')).hexdigest()[:10]}")
+
+
+class LibraryMirror:
+    # Local copy of a read-only root. Everything that touches the source goes through remote_manifest,
+    # remote_scan and remote_copy, sync() is the only caller, and it only ever runs one at a time.
+    def __init__(self, source, local):
+        self.source = source
+        self.local = local
+        self.manifest_path = os.path.join(local, MANIFEST_FILE)
+        self.last_sync = None
+        self.last_error = None
+        self._lock = threading.Lock()
+        for folder in LIBRARY_DIRS:
+            try:
+                os.makedirs(os.path.join(local, folder), exist_ok=True)
+            except OSError:
+                pass
+
+    def remote_manifest(self):
+        data = read_json(os.path.join(self.source, MANIFEST_FILE))
+        if not data or data.get('version') != MANIFEST_VERSION:
+            return None
+        return data.get('files', {})
+
+    def remote_scan(self):
+        # without a manifest every file is stat-ed, and only compared by mtime and size
+        if not os.path.isdir(self.source):
+            # an unreachable share mustn't read as an empty one, that would empty the mirror
+            raise OSError(f"{self.source} isn't reachable")
+        files = {}
+        for rel, path in library_files(self.source).items():
+            stat = os.stat(path)
+            files[rel] = {'mtime': stat.st_mtime_ns, 'size': stat.st_size}
+        return files
+
+    def remote_copy(self, rel, dest):
+        shutil.copyfile(os.path.join(self.source, rel), dest)
+
+    def local_manifest(self):
+        data = read_json(self.manifest_path)
+        if not data or data.get('version') != MANIFEST_VERSION:
+            return {}
+        return data.get('files', {})
+
+    def is_current(self, rel, have, info):
+        if not have:
+            return False
+        if info.get('hash') and have.get('hash') != info['hash']:
+            return False
+        if not info.get('hash') and (have.get('mtime'), have.get('size')) != (info['mtime'], info['size']):
+            return False
+        # the copy itself has to be the one that was made, not edited or deleted since
+        try:
+            stat = os.stat(os.path.join(self.local, rel))
+        except OSError:
+            return False
+        return have.get('local') == [stat.st_mtime_ns, stat.st_size]
+
+    def sync(self):
+        # -> {'copied': [...], 'removed': [...], 'failed': [...]}, relative paths like 'shapes/circle.json'
+        with self._lock:
+            result = {'copied': [], 'removed': [], 'failed': []}
+            try:
+                remote = self.remote_manifest()
+                if remote is None:
+                    remote = self.remote_scan()
+            except OSError as e:
+                # share unreachable, the mirror stays as it is
+                self.last_error = str(e)
+                return result
+
+            local = self.local_manifest()
+            for rel, info in remote.items():
+                have = local.get(rel)
+                if self.is_current(rel, have, info):
+                    continue
+                dest = os.path.join(self.local, rel)
+                part = dest + PART_SUFFIX
+                try:
+                    self.remote_copy(rel, part)
+                    copied_hash = file_hash(part)
+                    if info.get('hash') and copied_hash != info['hash']:
+                        # changed on the share since the manifest was written, picked up by a later sync
+                        os.remove(part)
+                        result['failed'].append(rel)
+                        continue
+                    os.replace(part, dest)
+                except OSError:
+                    result['failed'].append(rel)
+                    if os.path.exists(part):
+                        os.remove(part)
+                    continue
+                stat = os.stat(dest)
+                local[rel] = dict(info, hash=copied_hash, local=[stat.st_mtime_ns, stat.st_size])
+                result['copied'].append(rel)
+
+            for rel in [rel for rel in local if rel not in remote]:
+                try:
+                    os.remove(os.path.join(self.local, rel))
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    continue
+                del local[rel]
+                result['removed'].append(rel)
+
+            write_json(self.manifest_path, {'version': MANIFEST_VERSION, 'source': self.source, 'files': local})
+            self.last_error = f"couldn't copy {', '.join(result['failed'])}" if result['failed'] else None
+            self.last_sync = result
+            return result
+
+
+class LibraryRoot:
+    def __init__(self, path, name=None, read_only=False, locked=False, mirror=True, cache_dir=None):
+        self.path = os.path.abspath(os.path.expanduser(os.path.expandvars(path)))
+        self.name = name or os.path.basename(self.path.rstrip('/\\'))
+        self.read_only = bool(read_only)
+        self.locked = bool(locked)
+        self.mirror = None
+        if self.read_only and mirror:
+            self.mirror = LibraryMirror(self.path, mirror_dir(cache_dir or DEFAULT_CACHE_DIR, self.path))
+        # where the library is read from: the mirror for mirrored roots, the root itself otherwise
+        self.local_path = self.mirror.local if self.mirror else self.path
+        self.shape_dir = os.path.join(self.local_path, 'shapes')
+        self.icon_dir = os.path.join(self.local_path, 'icons')
+        if not self.read_only:
+            # a new personal library starts out as an empty folder, saving and the watcher need both of these
+            for path in (self.shape_dir, self.icon_dir):
+                try:
+                    os.makedirs(path, exist_ok=True)
+                except OSError:
+                    pass
+
+
+class Library:
+    # The merged view of every root, shaped like a LibraryIndex (entries, refresh(), sorted_entries()) so the
+    # ui can take it in its place. Each root has its own LibraryIndex over its local folders.
+    def __init__(self, roots, cache_dir=None, sync_interval=DEFAULT_SYNC_INTERVAL):
+        self.roots = list(roots)
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.sync_interval = sync_interval
+        # locked roots can't be shadowed, so they're looked up first
+        self.lookup_order = [root for root in self.roots if root.locked] + [root for root in self.roots
+                                                                            if not root.locked]
+        self.write_root = next((root for root in self.roots if not root.read_only), None)
+        self.indexes = [LibraryIndex(root.shape_dir, root.icon_dir) for root in self.lookup_order]
+        self.entries = {}
+        self.owners = {}
+        self._merged = False
+        self._sync_thread = None
+
+    @property
+    def shape_dir(self):
+        # where controls are saved, None when every root is read-only
+        return self.write_root.shape_dir if self.write_root else None
+
+    @property
+    def data_dir(self):
+        # for CLib's own caches, like thumbnails
+        return self.write_root.path if self.write_root else self.cache_dir
+
+    def search_dirs(self):
+        return [root.shape_dir for root in self.lookup_order]
+
+    def watch_dirs(self):
+        return [path for root in self.roots for path in (root.shape_dir, root.icon_dir)]
+
+    def is_writable(self, entry):
+        owner = self.owners.get(entry['name'])
+        return owner is not None and not owner.read_only
+
+    def sorted_entries(self):
+        return [self.entries[name] for name in sorted(self.entries, key=str.lower)]
+
+    def refresh(self, full=False):
+        # returns the merged (added, updated, removed) names, like LibraryIndex.refresh()
+        touched = set()
+        for index in self.indexes:
+            for names in index.refresh(full):
+                touched.update(names)
+        if self._merged and not touched:
+            return [], [], []
+
+        entries, owners = {}, {}
+        for root, index in zip(self.lookup_order, self.indexes):
+            for name, entry in index.entries.items():
+                if name not in entries:
+                    entries[name] = entry
+                    owners[name] = root
+        added = [name for name in entries if name not in self.entries]
+        removed = [name for name in self.entries if name not in entries]
+        # a name is also updated when another root's copy of it took over
+        updated = [name for name in entries if name in self.entries
+                   and (name in touched or owners[name] is not self.owners[name])]
+        self.entries, self.owners = entries, owners
+        self._merged = True
+        return added, updated, removed
+
+    def mirrors(self):
+        return [root.mirror for root in self.roots if root.mirror]
+
+    def sync_mirrors(self, background=True):
+        # background syncs run on one daemon thread, asking again while one runs just returns it
+        if not background:
+            return [mirror.sync() for mirror in self.mirrors()]
+        if not self.mirrors():
+            return None
+        if self._sync_thread is None or not self._sync_thread.is_alive():
+            self._sync_thread = threading.Thread(target=self.sync_mirrors, args=(False,), name='CLibMirrorSync',
+                                                 daemon=True)
+            self._sync_thread.start()
+        return self._sync_thread
+
+
+def config_path():
+    return os.environ.get(CONFIG_ENV) or os.path.join(BUILTIN_DIR, CONFIG_FILE)
+
+
+def builtin_library():
+    # CLib's own folder as the only, writable root
+    return Library([LibraryRoot(BUILTIN_DIR, 'builtin')])
+
+
+def load_library(path=None):
+    # the Library the config describes, builtin_library() when there is no config
+    path = path or config_path()
+    if not os.path.exists(path):
+        return builtin_library()
+    config = read_json(path)
+    if not isinstance(config, dict):
+        raise LibraryConfigError(f"{path} isn't a valid library config")
+    unknown = sorted(set(config) - set(CONFIG_KEYS))
+    if unknown:
+        raise LibraryConfigError(f"{path}: unknown keys {unknown}, expected some of {list(CONFIG_KEYS)}")
+
+    base = os.path.dirname(os.path.abspath(path))
+
+    def resolve(value):
+        return os.path.join(base, os.path.expanduser(os.path.expandvars(value)))
+
+    cache_dir = resolve(config['cache_dir']) if config.get('cache_dir') else DEFAULT_CACHE_DIR
+    roots = []
+    for root in config.get('roots', []):
+        if not isinstance(root, dict) or not root.get('path'):
+            raise LibraryConfigError(f"{path}: every root needs a path, got {root!r}")
+        unknown = sorted(set(root) - set(ROOT_KEYS))
+        if unknown:
+            raise LibraryConfigError(f"{path}: unknown root keys {unknown}, expected some of {list(ROOT_KEYS)}")
+        roots.append(LibraryRoot(resolve(root['path']), root.get('name'), root.get('read_only', False),
+                                 root.get('locked', False), root.get('mirror', True), cache_dir))
+    if config.get('builtin', True):
+        # already local, nothing to mirror
+        roots.append(LibraryRoot(BUILTIN_DIR, 'builtin', read_only=bool(roots), mirror=False))
+    if not roots:
+        raise LibraryConfigError(f"{path} has no library roots")
+    return Library(roots, cache_dir, config.get('sync_interval', DEFAULT_SYNC_INTERVAL))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publish and mirror CLib library roots.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    publish = commands.add_parser('publish', help="write the manifest of a shared root, run after changing it")
+    publish.add_argument('roots', nargs='+')
+    sync = commands.add_parser('sync', help="bring the local mirrors of the configured read-only roots up to date")
+    sync.add_argument('--config', help="library config, the usual one by default")
+    show = commands.add_parser('list', help="list the configured roots in lookup order")
+    show.add_argument('--config', help="library config, the usual one by default")
+    args = parser.parse_args(argv)
+
+    if args.command == 'publish':
+        for root in args.roots:
+            files = write_manifest(root)
+            print(f"[CLib] {os.path.join(root, MANIFEST_FILE)}: {len(files)} files")
+        return 0
+
+    library = load_library(args.config)
+    if args.command == 'sync':
+        for root in library.roots:
+            if root.mirror:
+                result = root.mirror.sync()
+                print(f"[CLib] {root.name}: {len(result['copied'])} copied, {len(result['removed'])} removed, "
+                      f"{len(result['failed'])} failed")
+                if root.mirror.last_error:
+                    print(f"  {root.mirror.last_error}")
+        return 0
+    for root in library.lookup_order:
+        flags = [flag for flag, on in (('read-only', root.read_only), ('locked', root.locked),
+                                       ('save target', root is library.write_root)) if on]
+        print(f"{root.name:<16} {root.path}" + (f"  [{', '.join(flags)}]" if flags else "")
+              + (f"\n{'':<16} mirrored in {root.local_path}" if root.mirror else ""))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,264 @@
+import os
+import bisect
+
+from PySide2.QtCore import Qt, QObject, QAbstractListModel, QModelIndex, QSize, QRect, QTimer, QFileSystemWatcher, Signal
+from PySide2.QtGui import QColor, QPen, QPixmap
+from PySide2.QtWidgets import QListView, QStyledItemDelegate, QStyle, QMenu, QMessageBox, QAbstractItemView
+
+from . import shape_format
+from . import theme
+
+ICON_SIZE = QSize(48, 48)
+ITEM_SIZE = QSize(104, 86)
+
+
+class LibraryModel(QAbstractListModel):
+    # One row per library index entry. Icons are requested from the IconLoader when a row is first
+    # painted, the default icon stands in until they arrive.
+    EntryRole = Qt.UserRole + 1
+    NameRole = Qt.UserRole + 2
+
+    def __init__(self, default_icon=None, icon_loader=None, thumbnails=None, parent=None):
+        super(LibraryModel, self).__init__(parent)
+        self.entries = []
+        self.default_icon = QPixmap() if default_icon is None else default_icon
+        self.icon_loader = icon_loader
+        # renders icons for shapes without a hand-made png
+        self.thumbnails = thumbnails
+        self._icon_rows = None
+        if icon_loader:
+            icon_loader.iconReady.connect(self.on_icon_ready)
+
+    def set_entries(self, entries):
+        self.beginResetModel()
+        self.entries = list(entries)
+        self._icon_rows = None
+        self.endResetModel()
+
+    def row_of(self, name):
+        for row, entry in enumerate(self.entries):
+            if entry['name'] == name:
+                return row
+        return -1
+
+    def apply_changes(self, entries, added, updated, removed):
+        # patches the rows in place so the view keeps its scroll position and untouched tiles
+        self._icon_rows = None
+        # updated names missing from the model get inserted with the added ones, the caller's list stays as is
+        added = list(added)
+        for name in removed:
+            row = self.row_of(name)
+            if row < 0:
+                continue
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self.entries.pop(row)
+            self.endRemoveRows()
+
+        for name in updated:
+            row = self.row_of(name)
+            if row < 0:
+                added.append(name)
+                continue
+            self.entries[row] = entries[name]
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+        keys = [entry['name'].lower() for entry in self.entries]
+        for name in added:
+            row = bisect.bisect(keys, name.lower())
+            self.beginInsertRows(QModelIndex(), row, row)
+            self.entries.insert(row, entries[name])
+            keys.insert(row, name.lower())
+            self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.entries):
+            return None
+        entry = self.entries[index.row()]
+        if role in (Qt.DisplayRole, self.NameRole):
+            return entry['name']
+        if role == Qt.DecorationRole:
+            return self.icon(entry)
+        if role == Qt.ToolTipRole:
+            return f"{entry['name']}\ntag: {entry['tag']}\n{entry['shape_count']} shapes, {entry['cv_count']} cvs"
+        if role == self.EntryRole:
+            return entry
+        return None
+
+    def icon(self, entry):
+        if not self.icon_loader:
+            return self.default_icon
+        if entry['icon']:
+            pixmap = self.icon_loader.pixmap(entry['icon'], entry['icon_mtime'])
+        elif self.thumbnails:
+            thumb_path = self.thumbnails.thumbnail(entry)
+            pixmap = self.icon_loader.pixmap(thumb_path) if thumb_path else None
+        else:
+            pixmap = None
+        return self.default_icon if pixmap is None else pixmap
+
+    def icon_path(self, entry):
+        if entry['icon'] or not self.thumbnails:
+            return entry['icon']
+        return self.thumbnails.path_for(entry)
+
+    def refresh_icons(self):
+        self._icon_rows = None
+        if self.entries:
+            self.dataChanged.emit(self.index(0), self.index(len(self.entries) - 1), [Qt.DecorationRole])
+
+    def on_icon_ready(self, path):
+        if self._icon_rows is None:
+            self._icon_rows = {}
+            for row, entry in enumerate(self.entries):
+                self._icon_rows.setdefault(self.icon_path(entry), []).append(row)
+        for row in self._icon_rows.get(path, ()):
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+
+class LibraryDelegate(QStyledItemDelegate):
+    # Paints a library tile (icon over name) in the look of the old per-shape buttons.
+    # colors holds the tile_* entries of a theme palette.
+    def __init__(self, parent=None):
+        super(LibraryDelegate, self).__init__(parent)
+        self.colors = {}
+        self.set_colors(theme.palette())
+
+    def set_colors(self, colors):
+        self.colors = {key: QColor(value) for key, value in colors.items() if key.startswith('tile')}
+
+    def sizeHint(self, option, index):
+        return ITEM_SIZE
+
+    def paint(self, painter, option, index):
+        painter.save()
+        rect = option.rect.adjusted(1, 1, -1, -1)
+        if option.state & QStyle.State_Sunken:
+            background, border = self.colors['tile_pressed'], self.colors['tile_pressed_border']
+        elif option.state & QStyle.State_MouseOver:
+            background, border = self.colors['tile_hover'], self.colors['tile_hover_border']
+        else:
+            background, border = self.colors['tile'], self.colors['tile_border']
+        painter.fillRect(rect, background)
+        painter.setPen(QPen(border, 2))
+        painter.drawRect(rect)
+
+        icon = index.data(Qt.DecorationRole)
+        icon_rect = QRect(rect.center().x() - ICON_SIZE.width() // 2, rect.top() + 8, ICON_SIZE.width(), ICON_SIZE.height())
+        if icon is not None and not icon.isNull():
+            # icons are decoded at display size already, just centre them in the slot
+            painter.drawPixmap(icon_rect.center().x() - icon.width() // 2,
+                               icon_rect.center().y() - icon.height() // 2, icon)
+
+        text_rect = QRect(rect.left() + 4, icon_rect.bottom() + 4, rect.width() - 8, rect.bottom() - icon_rect.bottom() - 6)
+        font = painter.font()
+        font.setPixelSize(12)
+        painter.setFont(font)
+        painter.setPen(self.colors['tile_text'])
+        name = painter.fontMetrics().elidedText(index.data(Qt.DisplayRole), Qt.ElideRight, text_rect.width())
+        painter.drawText(text_rect, Qt.AlignHCenter | Qt.AlignTop, name)
+        painter.restore()
+
+
+class LibraryView(QListView):
+    # Icon grid over a LibraryModel, only the visible tiles are ever laid out and painted.
+    shapeClicked = Signal(str)
+    shapeDeleted = Signal(str)
+
+    def __init__(self, parent=None):
+        super(LibraryView, self).__init__(parent)
+        self.setViewMode(QListView.IconMode)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(256)
+        self.setGridSize(ITEM_SIZE)
+        self.setIconSize(ICON_SIZE)
+        self.setSpacing(0)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setMouseTracking(True)
+        self.setObjectName("libraryView")
+        self.delegate = LibraryDelegate(self)
+        self.setItemDelegate(self.delegate)
+        # entry -> bool, shapes it turns down (from read-only library roots) can't be deleted
+        self.can_delete = None
+
+        self.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.customContextMenuRequested.connect(self.open_menu)
+        self.clicked.connect(self.on_clicked)
+
+    def set_colors(self, colors):
+        self.delegate.set_colors(colors)
+        self.viewport().update()
+
+    def entry(self, index):
+        return self.model().entries[index.row()]
+
+    def on_clicked(self, index):
+        self.shapeClicked.emit(self.entry(index)['name'])
+
+    def open_menu(self, pos):
+        index = self.indexAt(pos)
+        if not index.isValid():
+            return
+        menu = QMenu(self)
+        delete_action = menu.addAction("Delete")
+        delete_action.setEnabled(self.can_delete is None or self.can_delete(self.entry(index)))
+        action = menu.exec_(self.viewport().mapToGlobal(pos))
+        if action == delete_action:
+            self.confirm_and_delete(self.entry(index))
+
+    def confirm_and_delete(self, entry):
+        confirm = QMessageBox.question(
+            self,
+            "Delete Control",
+            f"Delete '{entry['name']}'?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if confirm == QMessageBox.Yes:
+            shape_format.remove_shape_files(entry['file'])
+            if entry['icon'] and os.path.exists(entry['icon']):
+                os.remove(entry['icon'])
+            self.shapeDeleted.emit(entry['name'])
+
+
+class LibraryWatcher(QObject):
+    # Watches the library folders and emits changed once things settle, so a burst of file writes (a save, a
+    # sync, another artist's script) turns into a single refresh. The folders only tell about files coming and
+    # going; a file rewritten in place is caught by polling instead, since a refresh stats every file anyway
+    # and a watch per file runs into the system's limit on big libraries.
+    changed = Signal()
+
+    def __init__(self, paths, delay=300, poll_interval=10000, parent=None):
+        super(LibraryWatcher, self).__init__(parent)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay)
+        self.timer.timeout.connect(self.changed.emit)
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+        self.dirs = [path for path in paths if os.path.isdir(path)]
+        if self.dirs:
+            self.watcher.addPaths(self.dirs)
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(poll_interval)
+        self.poll_timer.timeout.connect(self.poll)
+        if poll_interval > 0:
+            self.poll_timer.start()
+
+    def on_directory_changed(self, path):
+        self.timer.start()
+
+    def poll(self):
+        # a hidden window has nothing to show, it catches up on the next poll once it's open again
+        parent = self.parent()
+        if parent is None or parent.isVisible():
+            self.timer.start()
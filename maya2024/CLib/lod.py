@@ -0,0 +1,66 @@
+import os
+import math
+import threading
+from collections import OrderedDict
+
+from . import curve_math
+from .shape_cache import load_shape
+
+# Level of detail variants of the library shapes, made on the fly by decimating the stored shape (see
+# curve_math.decimate_shape) rather than stored next to it, so every shape has them and they follow
+# the shape when it changes. high is the stored shape itself, the others may stray from it by a
+# fraction of the shape's size (the diagonal of its bounding box): small details like gear teeth go first,
+# the silhouette stays readable on a background character with far fewer cvs to draw.
+LODS = ('high', 'medium', 'low')
+LOD_TOLERANCES = {'high': 0.0, 'medium': 0.03, 'low': 0.08}
+# variants kept in memory, keyed on the shape file as it was when they were made
+MAX_VARIANTS = 256
+
+_variants = OrderedDict()
+_lock = threading.Lock()
+
+
+def check_lod(lod):
+    if lod not in LODS:
+        raise ValueError(f"LOD has to be one of {', '.join(LODS)}, not {lod!r}")
+    return lod
+
+
+def shape_size(curve_dict):
+    # diagonal of the bounding box of every cv of the control
+    points = [pt for info in curve_dict.values() for pt in info['cv_pos']]
+    if not points:
+        return 0.0
+    return math.dist([min(pt[i] for pt in points) for i in range(3)], [max(pt[i] for pt in points) for i in range(3)])
+
+
+def make_lod(curve_dict, lod):
+    tolerance = LOD_TOLERANCES[check_lod(lod)] * shape_size(curve_dict)
+    if tolerance <= 0:
+        return curve_dict
+    return curve_math.decimate_curve_data(curve_dict, tolerance)[0]
+
+
+def load_lod(file_path, lod='high'):
+    # the shape file's variant at lod, shared between callers like load_shape's dicts
+    curve_dict = load_shape(file_path)
+    if check_lod(lod) == 'high':
+        return curve_dict
+    stat = os.stat(file_path)
+    key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, lod)
+    with _lock:
+        variant = _variants.get(key)
+        if variant is not None:
+            _variants.move_to_end(key)
+            return variant
+    variant = make_lod(curve_dict, lod)
+    with _lock:
+        _variants[key] = variant
+        while len(_variants) > MAX_VARIANTS:
+            _variants.popitem(last=False)
+    return variant
+
+
+def lod_cv_counts(file_path):
+    # {lod: cv count} of a shape file, for showing what each level saves
+    return {lod: sum(len(info['cv_pos']) for info in load_lod(file_path, lod).values()) for lod in LODS}
@@ -1,5 +1,6 @@
 import os
-import json
+import time
+import importlib
 import functools
 from PySide2.QtCore import *
 from PySide2 import QtWidgets, QtCore
@@ -8,128 +9,23 @@ from PySide2.QtUiTools import QUiLoader
 import PySide2.QtWidgets as QT
 from PySide2.QtGui import QIcon, QColor, QMovie
 import maya.cmds as cmds
-from shiboken2 import wrapInstance
+from shiboken2 import wrapInstance, isValid
 from maya import OpenMayaUI as omui
+from .core import ControlBuilder
+from .lod import LODS
+from .profiling import profiler, profiled
+from .profiler_panel import ProfilerPanel
+from .library_roots import load_library, builtin_library, LibraryConfigError
+from .library_search import SearchIndex
+from .library_view import LibraryModel, LibraryView, LibraryWatcher
+from .icon_loader import IconLoader
+from .thumbnails import ThumbnailRenderer, THUMB_DIR
+from . import theme
+from .build_ui import COMPILED_MODULE, COMPILED_FILE, ensure_built, is_current
 
 
 
 
-class ControlButton(QPushButton):
-    def __init__(self, name, file_path, icon_path=None, delete_callback=None):
-        super(ControlButton, self).__init__(name)
-        self.name = name
-        self.file_path = file_path
-        self.icon_path = icon_path
-        self.delete_callback = delete_callback
-
-        self.setContextMenuPolicy(Qt.CustomContextMenu)
-        self.customContextMenuRequested.connect(self.open_menu)
-
-    def open_menu(self, pos):
-        menu = QMenu(self)
-        delete_action = menu.addAction("Delete")
-        action = menu.exec_(self.mapToGlobal(pos))
-        if action == delete_action:
-            self.confirm_and_delete()
-
-    def confirm_and_delete(self):
-        confirm = QMessageBox.question(
-            self,
-            "Delete Control",
-            f"Delete '{self.name}'?",
-            QMessageBox.Yes | QMessageBox.No
-        )
-        if confirm == QMessageBox.Yes:
-            if self.file_path and os.path.exists(self.file_path):
-                os.remove(self.file_path)
-            if self.icon_path and os.path.exists(self.icon_path):
-                os.remove(self.icon_path)
-            if self.delete_callback:
-                self.delete_callback(self)
-
-class Draw:
-    def __init__(self, curve=None):
-        self.curve = curve
-        if curve:
-            self.curve = curve
-        elif len(cmds.ls(selection=True)):
-            self.curve = cmds.ls(selection=True)[0]
-
-    def get_cv_positions(self, curve, cv_len):
-        cv_pose = []
-        for i in range(cv_len):
-            pos = cmds.xform(f'{curve}.cv[{i}]', query=True, objectSpace=True, translation=True)
-            cv_pose.append(pos)
-        return cv_pose
-
-    def get_curve_info(self, curve=None):
-        if not curve:
-            curve = self.curve
-        self.curve_dict = {}
-        for crv in cmds.listRelatives(curve, shapes=True, fullPath=True):
-            spans = cmds.getAttr(crv + '.spans')
-            degree = cmds.getAttr(crv + '.degree')
-            form = cmds.getAttr(crv + '.form')
-            cv_len = len(cmds.ls(crv + '.cv[*]', flatten=True))
-            cv_pose = self.get_cv_positions(crv, cv_len)
-
-            curve_info = {
-                'spans': spans,
-                'degree': degree,
-                'form': form,
-                'cv_len': cv_len,
-                'cv_pos': cv_pose,
-                'tag': 'default'
-            }
-            self.curve_dict[crv] = curve_info
-        return self.curve_dict
-
-    def write_curve(self, name=None, force=True, tag="default"):
-        if not self.curve:
-            cmds.error('No curve selected.')
-
-        if not name:
-            name = self.curve
-
-        curve_data = self.get_curve_info(self.curve)
-        for data in curve_data.values():
-            data['tag'] = tag
-
-        json_path = os.path.join(SHAPE_DIR, f"{name}.json")
-
-        if os.path.isfile(json_path) and not force:
-            cmds.error(f"Curve {name} already exists. Use force=True to overwrite.")
-
-        with open(json_path, 'w') as f:
-            json.dump(curve_data, f, indent=4)
-
-    def create_curve(self, name='default', shape='circle', scale=1.0):
-        file_path = os.path.join(SHAPE_DIR, f"{shape}.json")
-        if not os.path.isfile(file_path):
-            cmds.error(f"No shape file found: {file_path}")
-
-        with open(file_path, 'r') as f:
-            curve_dict = json.load(f)
-
-        for i, (shp, info) in enumerate(curve_dict.items()):
-            points = [[p * scale for p in pt] for pt in info['cv_pos']]
-            if i == 0:
-                self.curve = cmds.curve(point=points, degree=info['degree'], name=name)
-            else:
-                tmp = cmds.curve(point=points, degree=info['degree'])
-                shape = cmds.listRelatives(tmp, shapes=True)[0]
-                cmds.parent(shape, self.curve, shape=True, relative=True)
-                cmds.delete(tmp)
-
-            if info['form'] >= 1:
-                shape_nodes = cmds.listRelatives(self.curve, shapes=True, fullPath=True)
-                for shape_node in shape_nodes:
-                    if cmds.getAttr(f"{shape_node}.form") == 0:
-                        cmds.closeCurve(shape_node, ch=False, ps=0, rpo=True)
-
-        cmds.select(cl=True)
-        return self.curve
-
 class SaveNotification(QtWidgets.QWidget):
     def __init__(self, text=".  .Curve active.  .", duration=1500, parent=None):
         super(SaveNotification, self).__init__(parent or master_window())
@@ -203,41 +99,43 @@ class SaveNotification(QtWidgets.QWidget):
         overlay = SaveNotification(text=text, duration=duration)
         overlay.show()
 
-class ControlLoader:
-    def __init__(self, scroll_layout, icon_dir):
-        # def __init__(self, scroll_layout, icon_dir, color_manager):
-        self.scroll_layout = scroll_layout
+class ControlLoader(ControlBuilder):
+    def __init__(self, library_view, icon_dir):
+        # def __init__(self, library_view, icon_dir, color_manager):
+        # every configured library root merged, controls are saved into the first writable one
+        try:
+            self.library = load_library()
+        except LibraryConfigError as e:
+            print(f"[CLib] {e}, using CLib's own library only.")
+            self.library = builtin_library()
+        super(ControlLoader, self).__init__(self.library.shape_dir, self.library.search_dirs())
+        self.library_view = library_view
+        self.library_model = None
+        self.library_watcher = None
+        # which way shapes without an icon are looked at for their thumbnail: auto, top, front or side
+        self.thumbnail_view = 'auto'
         self.icon_dir = icon_dir
         # self.color_manager = color_manager
-        self.selected_color = (1.0, 1.0, 0.0) 
         self.preset_colors = [
             (1.0, 0.0, 0.0), (0.0, 0.0, 1.0), (0.0, 1.0, 0.0),
             (1.0, 1.0, 0.0), (1.0, 0.5, 0.0), (1.0, 1.0, 1.0), (0.0, 0.0, 0.0)
         ]
 
-        self.ctrlscalevalue = 1.0
-        self.prefix = None
-        self.curvename = None
-        self.suffix = None
-        
-        #column resize button storage
-        self.control_buttons = []
-
-        # offset grp state
-        self.addOffset = False
-        # axis to affect the direction the curve is pointing
-        self.axis = "Y"
-        self.axis_rotation = {
-            "X": (0, 0, -90),
-            "Y": (0, 0, 0),
-            "Z": (90, 0, 0),
-        }
+        self.sync_timer = None
+        # tag/name/trigram search over the same entries, the grid shows what it returns for search_text
+        self.search_index = SearchIndex()
+        self.search_text = ''
+        # names the grid shows for search_text, None when it shows everything
+        self.search_names = None
+        self.search_label = None
+        self.tag_model = None
         delete_callback = None
         self.delete_callback = delete_callback
                         
     def get_color_style(self, color_tuple):
+        # only the colour is per swatch, the rest of their look comes from the window theme
         r, g, b = [int(c * 255) for c in color_tuple]
-        return f"background-color: rgb({r}, {g}, {b}); border: 1px solid gray;"
+        return f"background-color: rgb({r}, {g}, {b});"
 
     def get_color_tooltip(self, color_tuple):
         r, g, b = [int(c * 255) for c in color_tuple]
@@ -245,40 +143,22 @@ class ControlLoader:
 
     def scalevalue(self, value):
         self.ctrlscalevalue = value
-        #print('scale value is updating')
-        print(self.ctrlscalevalue)
 
     def add_color_swatch(self, color):
         self.swatch_style = self.get_color_style(color)  
         self.swatch_tooltip = self.get_color_tooltip(self.selected_color)
-        self.extraswatch_style = """
-                border-radius: 2px;
-            }
-            QFrame:hover {
-                border: 1px solid #888;
-            """
         self.color_swatch = QLabel() 
+        self.color_swatch.setObjectName("colorSwatch")
         self.color_swatch.setFixedSize(40, 20)
-        self.color_swatch.setStyleSheet(self.swatch_style + self.extraswatch_style)
+        self.color_swatch.setStyleSheet(self.swatch_style)
         self.color_swatch.setToolTip(self.swatch_tooltip)
         self.pickcolorlayout.addWidget(self.color_swatch)
 
         for color in self.preset_colors:
             self.swatch = QPushButton()
+            self.swatch.setObjectName("presetSwatch")
             self.swatch.setFixedSize(12, 12)
-            base_presetstyle = self.get_color_style(color)
-            extra_style = """
-                border-radius: 6px;
-                min-width: 10px;
-                min-height: 10px;
-            }
-            QFrame:hover {
-                border: 2px solid #888;
-                background-color: rgba(255, 255, 255, 30);
-            """
-
-            # self.swatch.setStyleSheet(self.get_color_style(color))
-            self.swatch.setStyleSheet(base_presetstyle + extra_style)
+            self.swatch.setStyleSheet(self.get_color_style(color))
             self.swatch.clicked.connect(functools.partial(self.set_color_from_preset, color))
             self.swatch.clicked.connect(functools.partial(self.set_color_from_preset, color))
 
@@ -286,208 +166,168 @@ class ControlLoader:
 
     def set_color_from_preset(self, color_tuple):
         self.selected_color = color_tuple
-        self.color_swatch.setStyleSheet(self.get_color_style(color_tuple) + self.extraswatch_style)
+        self.color_swatch.setStyleSheet(self.get_color_style(color_tuple))
         self.color_swatch.setToolTip(self.get_color_tooltip(color_tuple))
         # self.color_manager = color_manager
 
 
 
-    def save_selected(self):
-        if not cmds.ls(selection=True):
-            cmds.warning("No curve to save selected.")
+    @profiled
+    def save_selected(self, tag='default'):
+        if self.library.write_root is None:
+            cmds.warning("Every library root is read-only, add a writable one to the library config to save.")
             return
-        name = cmds.ls(selection=True)[0]
-        #
-        sel_shape = cmds.listRelatives(name, shapes=True, fullPath=True)
-        sel_shaper = sel_shape[0]
-        curvepos = cmds.xform(name, q=True, ws=True, rp=True)
-        cmds.select(cl=True)
-        tmp_grp = cmds.group(empty=True, name='tmp_grp')
-        cmds.delete(cmds.parentConstraint(name, tmp_grp))
-        for shape in sel_shape:
-            dup_transform = cmds.duplicate(shape, name=shape.split('|')[-1] + "_dup")[0]
-            dup_shapes = cmds.listRelatives(dup_transform, shapes=True, fullPath=True) or []
-            
-            for dup_shape_node in dup_shapes:
-                cmds.parent(dup_shape_node, tmp_grp, shape=True, relative=True)
-            
-            cmds.delete(dup_transform)
-            
-        cmds.setAttr(f"{tmp_grp}.translate", 0, 0, 0)
-        cmds.setAttr(f"{tmp_grp}.rotate", 0, 0, 0)
-        cmds.setAttr(f"{tmp_grp}.scale", 1, 1, 1)
-                
-        
-        draw = Draw(tmp_grp)
-        draw.write_curve(name=name, force=True)
-        SaveNotification.show_message(f'Saved control:    {name}')
+        name = super(ControlLoader, self).save_selected(tag, self.confirm_save)
+        if not name:
+            return
+        before, after = self.last_cv_counts
+        if after < before:
+            SaveNotification.show_message(f'Saved control:    {name}    ({before} -> {after} cvs)')
+        else:
+            SaveNotification.show_message(f'Saved control:    {name}')
         #widget = SaveNotification()
         #widget.show_message()
         #cmds.inViewMessage(amg=f'Saved control: <hl>{name}</hl>', pos='topCenter', fade=True)
-        cmds.delete(tmp_grp)
-        self.load_controls()
-
-    def load_controls(self):
-        columns = 3
-        control_files = [f for f in os.listdir(SHAPE_DIR) if f.endswith(".json")]
-        default_icon_path = os.path.join(self.icon_dir, "default.png")
-
-        if not os.path.exists(default_icon_path):
-            print(f"Warning: No default icon at {default_icon_path}.")
-            default_icon = QIcon()
-        else:
-            default_icon = QIcon(default_icon_path)
-
-        for index, file in enumerate(control_files):
-            name = os.path.splitext(file)[0]
-            self.name = os.path.splitext(file)[0]
-            file_path = os.path.join(SHAPE_DIR, file)
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-
-            row = index // columns
-            col = index % columns
-            icon_path = os.path.join(self.icon_dir, f"{name}.png")
-            btn = ControlButton(
-                    name=name,
-                    file_path=file_path,
-                    icon_path=icon_path if os.path.exists(icon_path) else None,
-                    delete_callback=self.remove_button
-            )
-            if os.path.exists(icon_path):
-                btn_icon = QIcon(icon_path)
-            else:
-                btn_icon = default_icon
-
-            btn.setIcon(btn_icon)
-            btn.setIconSize(QSize(48, 48))
-
-            btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #444444;
-                    color: white;
-                    text-align: center;
-                    border: 2px solid #333333;
-                    border-radius: 0px;
-                    padding: 8px 16px;
-                    font-size: 14px;
-                }
-                QPushButton:hover {
-                    background-color: #555555;
-                    border: 2px solid #666666;
-                    cursor: pointer;
-                }
-                QPushButton:pressed {
-                    background-color: #333333;
-                    border: 2px solid #444444;
-                }
-            """)
-            btn.clicked.connect(functools.partial(self.create_control, name))
-            
-        
+        self.refresh_buttons()
 
-            self.control_buttons.append(btn)
-            self.scroll_layout.addWidget(btn, row, col)
-            self.parent_ui = self.scroll_layout.parent().parent()
+    def confirm_save(self, name, shape_id):
+        # the same geometry already stored under another name gets pointed out before it's saved again
+        same = sorted(entry['name'] for entry in self.library.entries.values()
+                      if entry.get('content_id') == shape_id and entry['name'] != name)
+        if not same:
+            return True
+        answer = QMessageBox.question(
+            self.library_view,
+            "Identical Control",
+            f"'{name}' is the same shape as {', '.join(repr(other) for other in same)}, "
+            f"already in the library.\n\nStore it anyway?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        return answer == QMessageBox.Yes
 
+    def switch_lod(self, lod):
+        # the selected CLib controls, or every one in the scene when nothing is selected
+        selected = cmds.ls(selection=True, long=True, transforms=True)
+        switched = self.set_lod(lod, selected or None)
+        SaveNotification.show_message(f'{len(switched)} controls at {lod} detail')
 
+    @profiled
+    def load_controls(self):
+        self.library.refresh()
+        if self.library_model is None:
+            # icons are decoded in the background, the default one stands in until each arrives
+            self.icon_loader = IconLoader(parent=self.library_view)
+            default_icon_path = os.path.join(self.icon_dir, "default.png")
+            if not os.path.exists(default_icon_path):
+                print(f"Warning: No default icon at {default_icon_path}.")
+                default_icon = None
+            else:
+                default_icon = self.icon_loader.load_now(default_icon_path)
+            thumb_dir = os.path.join(self.library.data_dir, THUMB_DIR)
+            self.thumbnails = ThumbnailRenderer(self.icon_loader, thumb_dir, self.thumbnail_view, self.library_view)
+            self.library_model = LibraryModel(default_icon, self.icon_loader, self.thumbnails, self.library_view)
+            self.library_view.setModel(self.library_model)
+            # profiled methods are looked up on each call, so switching the profiler on reaches them
+            self.library_view.shapeClicked.connect(lambda name: self.create_control(name))
+            self.library_view.shapeDeleted.connect(self.remove_button)
+            self.library_view.can_delete = self.library.is_writable
+            # picks up shapes and icons added or removed by other artists and scripts, and by mirror syncs
+            self.library_watcher = LibraryWatcher(self.library.watch_dirs(), parent=self.library_view)
+            self.library_watcher.changed.connect(lambda: self.refresh_buttons())
+            # read-only roots are browsed from their local mirror, which is synced in the background
+            if self.library.mirrors():
+                self.library.sync_mirrors()
+                self.sync_timer = QTimer(self.library_view)
+                self.sync_timer.setInterval(int(self.library.sync_interval * 1000))
+                self.sync_timer.timeout.connect(lambda: self.library.sync_mirrors())
+                self.sync_timer.start()
+
+        self.search_index = SearchIndex(self.library.entries)
+        self.search_index_changed()
+        self.show_search_results()
         cmds.select(cl=True)
 
+    def set_thumbnail_view(self, view):
+        self.thumbnail_view = view
+        if self.library_model is not None:
+            self.thumbnails.set_view(view)
+            self.library_model.refresh_icons()
+
+    @profiled
     def refresh_buttons(self):
-        for btn in self.control_buttons:
-            self.scroll_layout.removeWidget(btn)
-            btn.deleteLater()
-        self.control_buttons.clear()
-        self.load_controls()
-        
-    def remove_button(self, btn):
+        # only the entries that changed on disk are added, updated or removed in the grid
+        if self.library_model is None:
+            self.load_controls()
+            return
+        added, updated, removed = self.library.refresh()
+        if added or updated or removed:
+            self.search_index.update(self.library.entries, added, updated, removed)
+            self.search_index_changed()
+            if self.search_text:
+                self.show_search_results()
+            else:
+                self.library_model.apply_changes(self.library.entries, added, updated, removed)
+                self.update_search_status(len(self.library_model.entries))
+
+    @profiled
+    def filter_library(self, text):
+        # runs on every keystroke in the search bar
+        self.search_text = text.strip()
+        if self.library_model is not None:
+            self.show_search_results()
+
+    def show_search_results(self):
+        if self.search_text:
+            names = self.search_index.search(self.search_text)
+            entries = self.library.entries
+            self.library_model.set_entries([entries[name] for name in names])
+        else:
+            names = None
+            self.library_model.set_entries(self.library.sorted_entries())
+        self.update_search_status(len(self.library_model.entries), names)
+
+    def search_index_changed(self):
+        self.search_index.prepare()
+        if self.tag_model is not None:
+            self.tag_model.setStringList(self.search_index.tags())
+
+    def update_search_status(self, shown, names=None):
+        # runs on every keystroke too, the facet counts wait until the tooltip is asked for
+        self.search_names = names
+        if self.search_label is not None:
+            self.search_label.setText(f"{shown} / {len(self.search_index)}")
+
+    def search_tooltip(self):
+        facets = self.search_index.facets(self.search_names)
+        lines = []
+        for facet, title in (('tag', 'tags'), ('shapes', 'shapes'), ('cvs', 'cvs')):
+            counts = ', '.join(f"{value} ({count})" for value, count in facets[facet].most_common())
+            lines.append(f"{title}: {counts}")
+        return '\n'.join(lines)
+
+    def remove_button(self, name):
         self.refresh_buttons()
-            
-    def set_prefix(self, prefixname):
-        self.prefix = prefixname
-
-    def set_name(self, name):
-        self.curvename = name
 
-    def set_suffix(self, suffix):
-        self.suffix = suffix
+class TooltipLabel(QLabel):
+    # a label whose tooltip is only worked out when it's about to show
+    def __init__(self, tooltip_func, parent=None):
+        super(TooltipLabel, self).__init__(parent)
+        self.tooltip_func = tooltip_func
 
+    def event(self, event):
+        if event.type() == QEvent.ToolTip:
+            QToolTip.showText(event.globalPos(), self.tooltip_func(), self)
+            return True
+        return super(TooltipLabel, self).event(event)
 
-    def create_control(self, name):
-        cmds.undoInfo(openChunk=True)
-        try:
-
-            selected_objects = cmds.ls(selection=True)
-
-            # come back to this if/not and work a way to not have to duplicate the draw command
-            if not selected_objects:
-                print('No object selected')
-                draw = Draw()
-                ctrl = draw.create_curve(name=name, shape=name)
-                shapes = cmds.listRelatives(ctrl, shapes=True, fullPath=True)
-                for shape in shapes:
-                    cmds.setAttr(f"{shape}.overrideEnabled", 1)
-                    cmds.setAttr(f"{shape}.overrideRGBColors", 1)
-                    cmds.setAttr(f"{shape}.overrideColorRGB", *self.selected_color)
-                control_points = cmds.ls(f"{ctrl}.cv[*]", flatten=True)
-                cmds.scale(self.ctrlscalevalue, self.ctrlscalevalue, self.ctrlscalevalue, control_points, relative=True)
-                return
-
-            # selected_axis = self.get_selected_axis()
-            draw = Draw()
-            ctrl = draw.create_curve(name=name, shape=name)
-
-            print('scale value in update class')
-            print(self.ctrlscalevalue)
-            #Assuming a single selection for simplicity
-            selected_obj = selected_objects[0]
-            obj_pos = cmds.xform(selected_obj, query=True, worldSpace=True, rp=True)
-            obj_rot = cmds.xform(selected_obj, query=True, worldSpace=True, ro=True)
-            control_points = cmds.ls(f"{ctrl}.cv[*]", flatten=True)
-            cmds.scale(self.ctrlscalevalue, self.ctrlscalevalue, self.ctrlscalevalue, control_points, relative=True)
-            cmds.xform(ctrl, worldSpace=True, translation=obj_pos)
-            cmds.xform(ctrl, worldSpace=True, ro=obj_rot)
-            
-            #override curve color with the selected color from the picker
-            shapes = cmds.listRelatives(ctrl, shapes=True, fullPath=True)
-            for shape in shapes:
-                cmds.setAttr(f"{shape}.overrideEnabled", 1)
-                cmds.setAttr(f"{shape}.overrideRGBColors", 1)
-                cmds.setAttr(f"{shape}.overrideColorRGB", *self.selected_color)
-        except Exception as e:
-            print("Error creating control:", e)
-        finally:
-            print(self.prefix, 'helloworld')
-            # Axis orrientation Block ( Consider restructure/implementing a fail check)
-            rot = self.axis_rotation[self.axis]
-            if shapes:
-                for shape in shapes:
-                    cvs = cmds.ls(f"{shape}.cv[*]", flatten=True)
-                    for cv in cvs:
-                        cmds.rotate(rot[0], rot[1], rot[2], cv, relative=True, objectSpace=True)
-            # Name setup for Control
-            originalname = ctrl
-            name_parts = []
-            if hasattr(self, 'prefix') and self.prefix:
-                name_parts.append(self.prefix.rstrip('_'))
-
-            if hasattr(self, 'curvename') and self.curvename:
-                name_parts.append(self.curvename)
-            else:
-                name_parts.append(originalname)
 
-            if hasattr(self, 'suffix') and self.suffix:
-                name_parts.append(self.suffix.lstrip('_'))
-
-            ctrl = cmds.rename(ctrl, ("_".join(name_parts) if name_parts else self.name))
-
-            # Implement NPO/Offset group
-            if self.addOffset:
-                offset_grp_name = f"{ctrl}_npo"
-                offset_grp = cmds.group(empty=True, name=offset_grp_name)
-                cmds.delete(cmds.parentConstraint(ctrl, offset_grp))
-                cmds.parent(ctrl, offset_grp)
-            cmds.undoInfo(closeChunk=True)
+class UiWidgets:
+    # gives a QUiLoader-built window the same widget-by-attribute access as the compiled Ui_MainWindow
+    def __init__(self, root):
+        setattr(self, root.objectName(), root)
+        for child in root.findChildren(QObject):
+            if child.objectName():
+                setattr(self, child.objectName(), child)
 
 
 class ControlLibraryUI:
@@ -495,22 +335,50 @@ class ControlLibraryUI:
         self.ui_file = ui_file
         self.icon_dir = icon_dir
         self.ui = None
+        self.form = None
+        self.startup_times = {}
+        self.theme_name = theme.DEFAULT_THEME
         # self.grid_layout = QGridLayout(self.scrollAreaWidgetContents)
         # self.scrollAreaWidgetContents.setLayout(self.grid_layout)
         self.load_ui()
-        self.control_loader = ControlLoader(self, self.icon_dir)
+        self.control_loader = ControlLoader(None, self.icon_dir)
         self.setup_ui()
-        self.control_loader.scroll_layout = self.scroll_layout
+        self.control_loader.library_view = self.library_view
         self.control_loader.load_controls()
         self.control_loader.add_color_swatch(self.control_loader.selected_color)
 
     
     def load_ui(self):
-        ui_file = QFile(self.ui_file)
-        ui_file.open(QFile.ReadOnly)
-        loader = QUiLoader()
-        self.ui = loader.load(ui_file)
-        ui_file.close()
+        # the module compiled by build_ui.py skips parsing the .ui xml, QUiLoader is only the fallback
+        # for when it can't be built
+        start = time.perf_counter()
+        compiled = self.compiled_ui()
+        if compiled:
+            self.ui = QMainWindow()
+            self.form = compiled.Ui_MainWindow()
+            self.form.setupUi(self.ui)
+        else:
+            ui_file = QFile(self.ui_file)
+            ui_file.open(QFile.ReadOnly)
+            loader = QUiLoader()
+            self.ui = loader.load(ui_file)
+            ui_file.close()
+            self.form = UiWidgets(self.ui)
+        self.startup_times['load_ui'] = time.perf_counter() - start
+        self.startup_times['compiled_ui'] = bool(compiled)
+
+    def compiled_ui(self):
+        # built here on the first launch after ClibUI.ui changed, a session that already imported an
+        # older build picks the new one up
+        if not ensure_built(self.ui_file, COMPILED_FILE):
+            return None
+        try:
+            module = importlib.import_module(f".{COMPILED_MODULE}", __package__)
+            if not is_current(module, self.ui_file):
+                module = importlib.reload(module)
+        except ImportError:
+            return None
+        return module if is_current(module, self.ui_file) else None
 
     def setup_ui(self):
         #UI settings
@@ -523,56 +391,38 @@ class ControlLibraryUI:
         self.ui.resize(1000, 200)
 
         # Locate widgets
-        groupbox_widget = self.ui.findChild(QGroupBox, "groupBox")
-        namesetting_widget = self.ui.findChild(QGroupBox, "nameSetting_Grp")
-        preset_color_Widget = self.ui.findChild(QWidget, "preset_color_Wdg")
-        pick_color_Widget = self.ui.findChild(QWidget, "pick_color_Wdg")
-        uiborder_R_widget = self.ui.findChild(QWidget, "widget_4")
-        OffsetGrp_chck = self.ui.findChild(QCheckBox, "offsetgroup_Chck")
-        leftborder_line = self.ui.findChild(QFrame, "line")
-        leftborder_line2 = self.ui.findChild(QFrame, "line2")
-        rightborder_line = self.ui.findChild(QFrame, "line")
-        rightborder_dot1 = self.ui.findChild(QLabel, "label_4")
-        rightborder_dot2 = self.ui.findChild(QLabel, "label_5")
-        luckynote = self.ui.findChild(QLabel, "luckyNumber")
-        self.scalelabel = self.ui.findChild(QLabel, "scale_Lbl")
-
-        color_radiobutton = self.ui.findChild(QRadioButton, "colorradio")
-        setup_radiobutton = self.ui.findChild(QRadioButton, "setupradio")
-        # radiobutton_z = self.ui.findChild(QRadioButton, "radioButton")
-        pickcolor_btn = self.ui.findChild(QPushButton, "pickColor_Btn")
-        storecontrol_btn = self.ui.findChild(QPushButton, "pushButton_2")
-        radiobutton_widget = self.ui.findChild(QWidget, "axis_Wdg")
-        scaleLabel_widget = self.ui.findChild(QWidget, "ctrlscale_Wdg")
-        scaleSlider_widget = self.ui.findChild(QWidget, "scaleSlider_Wdg")
-
-        self.color_widget = self.ui.findChild(QStackedWidget, "stackedWidget")
-        self.setting_widget = self.ui.findChild(QStackedWidget, "stackedWidget_2")
-        self.mainhubwidget = self.ui.findChild(QStackedWidget, "stackedWidget_3")
-
-        self.prefixLineEdit = self.ui.findChild(QLineEdit, "PrefixLine")
-        self.suffixLineEdit = self.ui.findChild(QLineEdit, "SuffixLine")
-        self.nameLineEdit = self.ui.findChild(QLineEdit, "NameLine")
+        groupbox_widget = self.form.groupBox
+        namesetting_widget = self.form.nameSetting_Grp
+        preset_color_Widget = self.form.preset_color_Wdg
+        pick_color_Widget = self.form.pick_color_Wdg
+        OffsetGrp_chck = self.form.offsetgroup_Chck
+        luckynote = self.form.luckyNumber
+        self.scalelabel = self.form.scale_Lbl
+
+        color_radiobutton = self.form.colorradio
+        setup_radiobutton = self.form.setupradio
+        # radiobutton_z = self.form.radioButton
+        pickcolor_btn = self.form.pickColor_Btn
+        storecontrol_btn = self.form.pushButton_2
+        radiobutton_widget = self.form.axis_Wdg
+        scaleLabel_widget = self.form.ctrlscale_Wdg
+        scaleSlider_widget = self.form.scaleSlider_Wdg
+
+        self.color_widget = self.form.stackedWidget
+        self.setting_widget = self.form.stackedWidget_2
+        self.mainhubwidget = self.form.stackedWidget_3
+
+        self.prefixLineEdit = self.form.PrefixLine
+        self.suffixLineEdit = self.form.SuffixLine
+        self.nameLineEdit = self.form.NameLine
 
         self.prefixLineEdit.setPlaceholderText("Type a Prefix")
         self.suffixLineEdit.setPlaceholderText("Type a Suffix")
         self.nameLineEdit.setPlaceholderText("Name of Curve")
-        self.testname = self.ui.findChild(QLabel, "demo_text")
+        self.testname = self.form.demo_text
 
         luckynote.setToolTip(
             "why IV? its just one of my favorite numbers :D, thanks for using my little tool, hope you like it and if it ever helps you down the line even better")
-        luckynote.setStyleSheet("""
-            QToolTip {
-                background-color: #444444;
-                color: #f0f0f0;
-                border: 1px solid #888888;
-                padding: 10px;
-                font-size: 12px;
-                font-family: Arial, sans-serif;
-                border-radius: 5px;
-                opacity: 0.9;
-            }
-        """)
         self.nameLineEdit.textChanged.connect(lambda: self.replace_invalid_chars(self.nameLineEdit))
         self.prefixLineEdit.textChanged.connect(lambda: self.replace_invalid_chars(self.prefixLineEdit))
         self.suffixLineEdit.textChanged.connect(lambda: self.replace_invalid_chars(self.suffixLineEdit))
@@ -586,82 +436,27 @@ class ControlLibraryUI:
         self.nameLineEdit.textChanged.connect(self.handle_name_changed)
         self.suffixLineEdit.textChanged.connect(self.handle_suffix_changed)
 
-        self.prefixLineEdit.setStyleSheet("""
-            QLineEdit {
-                background-color: #2b2b2b;
-                color: #ffffff;
-                border: 1px solid #444444;
-                border-radius: 6px;
-                padding: 6px 10px;
-                font-size: 11px;
-            }
-            QLineEdit:focus {
-                border: 1px solid #6a9fb5;
-                background-color: #333333;
-            }
-        """)
-
-        self.suffixLineEdit.setStyleSheet("""
-            QLineEdit {
-                background-color: #2b2b2b;
-                color: #ffffff;
-                border: 1px solid #444444;
-                border-radius: 6px;
-                padding: 6px 10px;
-                font-size: 11px;
-            }
-            QLineEdit:focus {
-                border: 1px solid #6a9fb5;
-                background-color: #333333;
-            }
-        """)
-
-        self.nameLineEdit.setStyleSheet("""
-            QLineEdit {
-                background-color: #2b2b2b;
-                color: #ffffff;
-                border: 1px solid #444444;
-                border-radius: 6px;
-                padding: 6px 10px;
-                font-size: 11px;
-            }
-            QLineEdit:focus {
-                border: 1px solid #6a9fb5;
-                background-color: #333333;
-            }
-        """)
-
         # state check for offsetbtn connecting to update offset method
         OffsetGrp_chck.stateChanged.connect(self.update_offset_state)
-        OffsetGrp_chck.setStyleSheet("""
-        QCheckBox {
-            spacing: 8px;
-            font-size: 14px;
-            color: #CCCCCC;
-        }
-
-        QCheckBox::indicator {
-            width: 18px;
-            height: 18px;
-            border-radius: 4px;
-            border-radius: 7px;
-            border: 2px solid #888888;
-        }
-
-        QCheckBox::indicator:checked {
-            background-color: #645d12;
-            border: 2px solid #fed42b;
-        }
-
-        QCheckBox::indicator:unchecked:hover {
-            border: 1px solid #888888;
-        }
-
-        QCheckBox::indicator:checked:hover {
-            background-color: #fbd22c;
-            border: 2px solid #cccccc;
-        }
-        """)
+
+        # level of detail new controls are built at, and switching controls already in the scene
+        self.lodComboBox = QComboBox()
+        self.lodComboBox.setObjectName("lod_Cmb")
+        self.lodComboBox.addItems([lod.capitalize() + " Detail" for lod in LODS])
+        self.lodComboBox.setToolTip("Medium and low detail controls drop the smaller details of their shape, "
+                                    "for background characters and big sets")
+        self.lodComboBox.currentIndexChanged.connect(self.update_lod)
+        lod_btn = QPushButton("Switch Scene Controls")
+        lod_btn.setObjectName("lod_Btn")
+        lod_btn.setToolTip("Switch the selected CLib controls to this detail, every CLib control in the scene "
+                           "when nothing is selected")
+        lod_btn.clicked.connect(lambda: self.control_loader.switch_lod(LODS[self.lodComboBox.currentIndex()]))
+        lod_layout = QHBoxLayout()
+        lod_layout.addWidget(self.lodComboBox)
+        lod_layout.addWidget(lod_btn)
+        # a row of its own under the offset group checkbox
+        self.form.widget_45.layout().addLayout(lod_layout)
+
         # seetup layound for scale slider widget
         if not scaleSlider_widget.layout():
             scaleSlider_layout = QHBoxLayout(scaleSlider_widget)
@@ -696,115 +491,10 @@ class ControlLibraryUI:
         self.radio_z.toggled.connect(self.update_axis)
         self.radio_y.setChecked(True)
 
-
         #connect the top buttons to switch between color and attribute menu
         color_radiobutton.toggled.connect(lambda checked: self.set_page_if_checked(0, checked))
         setup_radiobutton.toggled.connect(lambda checked: self.set_page_if_checked(1, checked))
 
-        color_radiobutton.setStyleSheet("""
-            QRadioButton {
-                spacing: 8px;
-                color: #dddddd;
-            }
-            QRadioButton::indicator {
-                border-radius: 7px;
-                border: 2px solid #888888;
-                background-color: transparent;
-            }
-            QRadioButton::indicator:checked {
-                background-color: #444444;
-                border: 2px solid #fed42b;
-            }
-            QRadioButton::indicator:hover {
-                border: 2px solid #cccccc;
-            }
-        """)
-
-        setup_radiobutton.setStyleSheet("""
-            QRadioButton {
-                spacing: 8px;
-                color: #dddddd;
-            }
-            QRadioButton::indicator {
-                border-radius: 7px;
-                border: 2px solid #888888;
-                background-color: transparent;
-            }
-            QRadioButton::indicator:checked {
-                background-color: #444444;
-                border: 2px solid #fed42b;
-            }
-            QRadioButton::indicator:hover {
-                border: 2px solid #cccccc;
-            }
-        """)
-
-        self.radio_x.setStyleSheet("""
-            QRadioButton {
-                spacing: 8px;
-                color: #f4f4f4;
-                font-size: 13px;
-            }
-            QRadioButton::indicator {
-                width: 12px;
-                height: 12px;
-                border-radius: 6px; /* half of width/height */
-                border: 2px solid #888888;
-                background-color: transparent;
-            }
-            QRadioButton::indicator:checked {
-                background-color: #b6a344;
-                border: 2px solid #fed42b;
-            }
-            QRadioButton::indicator:hover {
-                border: 2px solid #cccccc;
-            }
-        """)
-
-        self.radio_y.setStyleSheet("""
-            QRadioButton {
-                spacing: 8px;
-                color: #f4f4f4;
-                font-size: 13px;
-            }
-            QRadioButton::indicator {
-                width: 12px;
-                height: 12px;
-                border-radius: 6px; /* half of width/height */
-                border: 2px solid #888888;
-                background-color: transparent;
-            }
-            QRadioButton::indicator:checked {
-                background-color: #b6a344;
-                border: 2px solid #fed42b;
-            }
-            QRadioButton::indicator:hover {
-                border: 2px solid #cccccc;
-            }
-        """)
-
-        self.radio_z.setStyleSheet("""
-            QRadioButton {
-                spacing: 8px;
-                color: #f4f4f4;
-                font-size: 13px;
-            }
-            QRadioButton::indicator {
-                width: 12px;
-                height: 12px;
-                border-radius: 6px; /* half of width/height */
-                border: 2px solid #888888;
-                background-color: transparent;
-            }
-            QRadioButton::indicator:checked {
-                background-color: #b6a344;
-                border: 2px solid #fed42b;
-            }
-            QRadioButton::indicator:hover {
-                border: 2px solid #cccccc;
-            }
-        """)
-
         #Scale slider init
         self.slider = QSlider(Qt.Horizontal)
         self.slider.setMinimum(1)
@@ -819,102 +509,33 @@ class ControlLibraryUI:
         self.slider.valueChanged.connect(self.update_label)
         self.slider.valueChanged.connect(lambda val: self.control_loader.scalevalue(val / 10.0))
 
-        self.slider.setStyleSheet("""
-            QSlider::groove:horizontal {
-                border: none;
-                height: 6px;
-                background: #ccc;
-                margin: 0 8px;
-                border-radius: 3px;
-            }
-
-            QSlider::handle:horizontal {
-                background: #555;
-                border: none;
-                width: 14px;
-                height: 14px;
-                margin: -4px 0;
-                border-radius: 7px;
-            }
-
-            QSlider::handle:horizontal:hover {
-                background: #777;
-            }
-
-            QSlider::sub-page:horizontal {
-                background: #ffd52b;
-                border-radius: 3px;
-            }
-
-            QSlider::add-page:horizontal {
-                background: #e0e0e0;
-                border-radius: 3px;
-            }
-            """)
-
-        self.scalelabel.setStyleSheet("""
-            QLabel {
-                font-size: 12px;
-                color: #dddddd;
-                padding: 1px;
-            }
-        """)
-
         #connect the pick Color and Save Curve buttons
         pickcolor_btn.clicked.connect(self.pick_color)
-        storecontrol_btn.clicked.connect(self.control_loader.save_selected)
-
-        pickcolor_btn.setStyleSheet("""
-            QPushButton {
-                border: 1px solid #bdbdbd;   
-                background-color: #c1c1c1;   
-                color: black;                
-                padding: 2px 5px;           
-                font: bold 10pt;             
-                border-radius: 5px;         
-                hover: rgb(255, 255, 255);
-
-            }
-            QPushButton:hover {
-                background-color: #ffee6f; 
-                border: 1px solid #3c8e40;
-            }
-            QPushButton:pressed {
-                background-color: #ffcc33; 
-                border: 1.3px solid #d7a21b;
-            }
-            QPushButton:disabled {
-                background-color: #e0e0e0;
-                color: #9e9e9e;
-                border: 1px solid #cccccc;
-            }
-        """)
-
-        storecontrol_btn.setStyleSheet("""
-            QPushButton {
-                border: 1px solid #bdbdbd;   
-                background-color: #c1c1c1;   
-                color: black;                
-                padding: 2px 5px;           
-                font: bold 10pt;             
-                border-radius: 5px;         
-                hover: rgb(255, 255, 255);
-
-            }
-            QPushButton:hover {
-                background-color: #ffee6f; 
-                border: 1px solid #3c8e40;
-            }
-            QPushButton:pressed {
-                background-color: #ffcc33; 
-                border: 1.3px solid #d7a21b;
-            }
-            QPushButton:disabled {
-                background-color: #e0e0e0; 
-                color: #9e9e9e;
-                border: 1px solid #cccccc;
-            }
-        """)
+        storecontrol_btn.clicked.connect(lambda: self.control_loader.save_selected(self.tag_text()))
+
+        # tag stored with saved controls, offered from the tags already in the library
+        self.tagLineEdit = QLineEdit()
+        self.tagLineEdit.setObjectName("tag_Line")
+        self.tagLineEdit.setPlaceholderText("Tag (default)")
+        self.tagLineEdit.setToolTip("Tag the control is stored with, search for it with tag:<tag>")
+        self.tagLineEdit.textChanged.connect(lambda: self.replace_invalid_chars(self.tagLineEdit))
+        self.control_loader.tag_model = QStringListModel()
+        tag_completer = QCompleter(self.control_loader.tag_model, self.tagLineEdit)
+        tag_completer.setCaseSensitivity(Qt.CaseInsensitive)
+        self.tagLineEdit.setCompleter(tag_completer)
+        storecontrol_btn.parentWidget().layout().insertWidget(0, self.tagLineEdit)
+
+        # decimation tolerance for stored controls, in the control's own units
+        self.simplifySpinBox = QDoubleSpinBox()
+        self.simplifySpinBox.setObjectName("simplify_Spin")
+        self.simplifySpinBox.setDecimals(3)
+        self.simplifySpinBox.setRange(0.0, 10.0)
+        self.simplifySpinBox.setSingleStep(0.005)
+        self.simplifySpinBox.setSpecialValueText("Keep all cvs")
+        self.simplifySpinBox.setToolTip("Drop the cvs a stored control can spare while its curve stays within "
+                                        "this distance of the original, 0 keeps every cv")
+        self.simplifySpinBox.valueChanged.connect(self.update_tolerance)
+        storecontrol_btn.parentWidget().layout().insertWidget(1, self.simplifySpinBox)
 
         # Set up layout for groupbox widget
         if not groupbox_widget.layout():
@@ -940,53 +561,65 @@ class ControlLibraryUI:
         self.control_loader.pickcolorlayout = pickcolorlayout
         self.control_loader.presetcolorlayout = presetcolorlayout
 
-        # Creating the scroll layout before using it in ControlLoader
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_content = QWidget()
-        self.scroll_layout = QGridLayout(scroll_content)
-        scroll_area.setWidget(scroll_content)
-        groupboxlayout.addWidget(scroll_area)
-        scroll_area.setStyleSheet("background: #232323; border-radius: 8px;")
-        scroll_content.setStyleSheet("background: #242424; border-radius: 8px;")
-        self.scroll_layout.setVerticalSpacing(0)
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setMinimumHeight(400)
-        scroll_area.setMinimumWidth(170)
-        scroll_content.setMinimumHeight(500)
-
-        # group box style setting
-        groupbox_widget.setStyleSheet("""
-            QGroupBox {
-                border: 1px solid white;
-                border-radius: 7px;
-            }
-            QGroupBox:title {
-                font-size: 14px;
-                top: -1px;
-            }
-        """)
+        # search bar over the grid, filters it as you type
+        search_widget = QWidget()
+        search_layout = QHBoxLayout(search_widget)
+        search_layout.setContentsMargins(0, 0, 0, 0)
+        self.searchLineEdit = QLineEdit()
+        self.searchLineEdit.setObjectName("search_Line")
+        self.searchLineEdit.setPlaceholderText("Search controls")
+        self.searchLineEdit.setClearButtonEnabled(True)
+        self.searchLineEdit.setToolTip("Name words and tags, typos are fine. Narrow down with\n"
+                                       "tag:fk   shapes:2   shapes:>1   cvs:<50   cvs:10-100")
+        self.searchLineEdit.textChanged.connect(lambda text: self.control_loader.filter_library(text))
+        search_layout.addWidget(self.searchLineEdit)
+        self.control_loader.search_label = TooltipLabel(self.control_loader.search_tooltip)
+        self.control_loader.search_label.setObjectName("searchCount_Lbl")
+        search_layout.addWidget(self.control_loader.search_label)
+        groupboxlayout.addWidget(search_widget)
+
+        # Creating the library view before using it in ControlLoader
+        self.library_view = LibraryView()
+        groupboxlayout.addWidget(self.library_view)
+        self.library_view.setMinimumHeight(400)
+        self.library_view.setMinimumWidth(170)
 
-        # group box style setting
-        namesetting_widget.setStyleSheet("""
-            QGroupBox {
-                border: 1px solid white;
-                border-radius: 7px;
-            }
-            QGroupBox:title {
-                font-size: 14px;
-                top: -1px;
-            }
-        """)
         # radio button on by default
         color_radiobutton.setChecked(True)
 
+        # profiling switch and its stats panel along the bottom of the window, the panel only shows while it's on
+        central_layout = self.ui.centralWidget().layout()
+        self.profile_check = QCheckBox("Profile")
+        self.profile_check.setObjectName("profile_Chck")
+        self.profile_check.setToolTip("Time CLib's operations and count the maya commands they issue")
+        self.profile_check.setChecked(profiler.enabled)
+        self.profile_check.toggled.connect(self.set_profiling)
+        central_layout.addWidget(self.profile_check, 0, Qt.AlignRight)
+        self.profiler_panel = ProfilerPanel(profiler)
+        self.profiler_panel.setVisible(profiler.enabled)
+        central_layout.addWidget(self.profiler_panel)
+
+        # one stylesheet for the whole window instead of one per widget
+        self.set_theme(self.theme_name)
+
+    def set_theme(self, name):
+        colors = theme.apply_theme(self.ui, name)
+        self.theme_name = name
+        self.library_view.set_colors(colors)
+
+    def set_profiling(self, enabled):
+        if enabled:
+            profiler.enable()
+        else:
+            profiler.disable()
+        self.profiler_panel.setVisible(enabled)
+
     def pick_color(self):
         color = QColorDialog.getColor(parent=self.ui, title="Pick a custom Curve Color")
         if color.isValid():
             self.control_loader.selected_color = (color.redF(), color.greenF(), color.blueF())
             self.control_loader.color_swatch.setStyleSheet(self.control_loader.get_color_style(
-                self.control_loader.selected_color) + self.control_loader.extraswatch_style)
+                self.control_loader.selected_color))
             self.control_loader.color_swatch.setToolTip(
                 self.control_loader.get_color_tooltip(self.control_loader.selected_color))
 
@@ -996,6 +629,9 @@ class ControlLibraryUI:
             self.mainhubwidget.setCurrentIndex(index)
             self.setting_widget.setCurrentIndex(0 if index == 1 else 1)
 
+    def tag_text(self):
+        return self.tagLineEdit.text().strip() or 'default'
+
     def replace_invalid_chars(self, line_edit):
         text = line_edit.text()
         new_text = text.replace(" ", "_")
@@ -1065,38 +701,26 @@ class ControlLibraryUI:
     def update_label(self, value):
         self.scalelabel.setText(f"Universal Scale:    {self.slider.value()}")
 
-    def resizeEvent(self, event):
-        print('all this time')
-        super().resizeEvent(event)
-        self.rebuild_control_layout()
-    
-    def rebuild_control_layout(self):
-        if not hasattr(self, "scroll_layout") or not self.control_loader.control_buttons:
-            return
-    
-        # Clear existing layout
-        while self.control_loader.scroll_layout.count():
-            child = self.control_loader.scroll_layout.takeAt(0)
-            if child.widget():
-                child.widget().setParent(None)
-    
-        # Compute column count based on width
-        available_width = self.control_loader.scrollArea.viewport().width()
-        button_width = 100  # Width + spacing estimate
-        columns = max(1, available_width // button_width)
-    
-        for index, btn in enumerate(self.control_loader.control_buttons):
-            row = index // columns
-            col = index % columns
-            self.control_loader.scroll_layout.addWidget(btn, row, col)
-        
     # Update the control_loader addOffset value based on the checkbox.
     def update_offset_state(self, state):
 
         self.control_loader.addOffset = state == Qt.Checked
 
+    def update_lod(self, index):
+        self.control_loader.lod = LODS[index]
+
+    def update_tolerance(self, value):
+        self.control_loader.tolerance = value
+
+    def is_alive(self):
+        # False once maya has deleted the window underneath us (new scene/prefs reset, closing maya's main window)
+        return self.ui is not None and isValid(self.ui)
+
     def show(self):
         self.ui.show()
+        self.ui.setWindowState(self.ui.windowState() & ~Qt.WindowMinimized)
+        self.ui.raise_()
+        self.ui.activateWindow()
 
 
 def master_window():
@@ -1106,11 +730,31 @@ def master_window():
 #Final UI init and Execution
 SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
 ui_file = os.path.join(SCRIPT_DIR, "ClibUI.ui")
-SHAPE_DIR = os.path.join(SCRIPT_DIR, "shapes")
 icon_dir = os.path.join(SCRIPT_DIR, "icons")
 LOGO_PATH = os.path.join(icon_dir, "logo.gif")
 # color_manager = ControlLoader()
-control_ui = ControlLibraryUI(ui_file, icon_dir)
+# built on the first show() and reused by every launch after it
+control_ui = None
+
+
+def show():
+    global control_ui
+    if control_ui is None or not control_ui.is_alive():
+        start = time.perf_counter()
+        control_ui = ControlLibraryUI(ui_file, icon_dir)
+        show_splash()
+        # the timer fires once the event loop has painted the freshly shown window
+        QTimer.singleShot(0, functools.partial(report_startup, control_ui, start))
+    else:
+        show_splash()
+    return control_ui
+
+
+def report_startup(window, start):
+    times = window.startup_times
+    times['first_paint'] = time.perf_counter() - start
+    print(f"[CLib] window ready in {times['first_paint'] * 1000:.0f} ms "
+          f"(ui {'compiled' if times['compiled_ui'] else 'QUiLoader'} {times['load_ui'] * 1000:.0f} ms)")
 
 
 # my little launch animation
@@ -1133,6 +777,3 @@ def show_splash():
 def continue_to_ui():
     #splash.close()
     control_ui.show()
-
-
-show_splash()
\ No newline at end of file
@@ -0,0 +1,282 @@
+import functools
+
+# Every widget style of the tool lives in one stylesheet, keyed by objectName/class, applied once at the
+# window root. Widgets never get their own sheet (bar the colour swatches, whose colour is the point),
+# so building the window costs a single style parse and swapping themes is one setStyleSheet call.
+DEFAULT_THEME = 'dark'
+
+THEMES = {
+    'dark': {
+        'window': '#1e1e1e',
+        'panel': '#232323',
+        'text': '#dddddd',
+        'text_bright': '#f4f4f4',
+        'text_dim': '#cccccc',
+        'field': '#2b2b2b',
+        'field_focus': '#333333',
+        'field_text': '#ffffff',
+        'border': '#444444',
+        'border_focus': '#6a9fb5',
+        'outline': 'white',
+        'indicator': '#888888',
+        'indicator_hover': '#cccccc',
+        'accent': '#fed42b',
+        'accent_fill': '#b6a344',
+        'accent_dark': '#645d12',
+        'accent_hover': '#fbd22c',
+        'button': '#c1c1c1',
+        'button_border': '#bdbdbd',
+        'button_text': 'black',
+        'button_hover': '#ffee6f',
+        'button_hover_border': '#3c8e40',
+        'button_pressed': '#ffcc33',
+        'button_pressed_border': '#d7a21b',
+        'button_disabled': '#e0e0e0',
+        'button_disabled_text': '#9e9e9e',
+        'slider_groove': '#ccc',
+        'slider_handle': '#555',
+        'slider_handle_hover': '#777',
+        'slider_add': '#e0e0e0',
+        'tooltip': '#444444',
+        'tooltip_text': '#f0f0f0',
+        'tile': '#444444',
+        'tile_border': '#333333',
+        'tile_hover': '#555555',
+        'tile_hover_border': '#666666',
+        'tile_pressed': '#333333',
+        'tile_pressed_border': '#444444',
+        'tile_text': 'white',
+    },
+}
+THEMES['light'] = dict(THEMES['dark'], **{
+    'window': '#d9d9d9',
+    'panel': '#c8c8c8',
+    'text': '#222222',
+    'text_bright': '#111111',
+    'text_dim': '#333333',
+    'field': '#f2f2f2',
+    'field_focus': '#ffffff',
+    'field_text': '#111111',
+    'border': '#9a9a9a',
+    'outline': '#555555',
+    'indicator': '#666666',
+    'indicator_hover': '#333333',
+    'slider_groove': '#999',
+    'slider_add': '#b0b0b0',
+    'tooltip': '#f5f5f5',
+    'tooltip_text': '#111111',
+    'tile': '#e6e6e6',
+    'tile_border': '#b5b5b5',
+    'tile_hover': '#f5f5f5',
+    'tile_hover_border': '#8a8a8a',
+    'tile_pressed': '#d0d0d0',
+    'tile_pressed_border': '#9a9a9a',
+    'tile_text': '#111111',
+})
+
+_TEMPLATE = """
+#centralwidget {{
+    background-color: {window};
+}}
+QToolTip {{
+    background-color: {tooltip};
+    color: {tooltip_text};
+    border: 1px solid {indicator};
+    padding: 10px;
+    font-size: 12px;
+    font-family: Arial, sans-serif;
+    border-radius: 5px;
+}}
+QLineEdit {{
+    background-color: {field};
+    color: {field_text};
+    border: 1px solid {border};
+    border-radius: 6px;
+    padding: 6px 10px;
+    font-size: 11px;
+}}
+QLineEdit:focus {{
+    border: 1px solid {border_focus};
+    background-color: {field_focus};
+}}
+QCheckBox#offsetgroup_Chck {{
+    spacing: 8px;
+    font-size: 14px;
+    color: {text_dim};
+}}
+QCheckBox#offsetgroup_Chck::indicator {{
+    width: 18px;
+    height: 18px;
+    border-radius: 7px;
+    border: 2px solid {indicator};
+}}
+QCheckBox#offsetgroup_Chck::indicator:checked {{
+    background-color: {accent_dark};
+    border: 2px solid {accent};
+}}
+QCheckBox#offsetgroup_Chck::indicator:unchecked:hover {{
+    border: 1px solid {indicator};
+}}
+QCheckBox#offsetgroup_Chck::indicator:checked:hover {{
+    background-color: {accent_hover};
+    border: 2px solid {indicator_hover};
+}}
+QRadioButton#colorradio, QRadioButton#setupradio {{
+    spacing: 8px;
+    color: {text};
+}}
+QRadioButton#colorradio::indicator, QRadioButton#setupradio::indicator {{
+    border-radius: 7px;
+    border: 2px solid {indicator};
+    background-color: transparent;
+}}
+QRadioButton#colorradio::indicator:checked, QRadioButton#setupradio::indicator:checked {{
+    background-color: {border};
+    border: 2px solid {accent};
+}}
+QRadioButton#colorradio::indicator:hover, QRadioButton#setupradio::indicator:hover {{
+    border: 2px solid {indicator_hover};
+}}
+#axis_Wdg QRadioButton {{
+    spacing: 8px;
+    color: {text_bright};
+    font-size: 13px;
+}}
+#axis_Wdg QRadioButton::indicator {{
+    width: 12px;
+    height: 12px;
+    border-radius: 6px;
+    border: 2px solid {indicator};
+    background-color: transparent;
+}}
+#axis_Wdg QRadioButton::indicator:checked {{
+    background-color: {accent_fill};
+    border: 2px solid {accent};
+}}
+#axis_Wdg QRadioButton::indicator:hover {{
+    border: 2px solid {indicator_hover};
+}}
+#scaleSlider_Wdg QSlider::groove:horizontal {{
+    border: none;
+    height: 6px;
+    background: {slider_groove};
+    margin: 0 8px;
+    border-radius: 3px;
+}}
+#scaleSlider_Wdg QSlider::handle:horizontal {{
+    background: {slider_handle};
+    border: none;
+    width: 14px;
+    height: 14px;
+    margin: -4px 0;
+    border-radius: 7px;
+}}
+#scaleSlider_Wdg QSlider::handle:horizontal:hover {{
+    background: {slider_handle_hover};
+}}
+#scaleSlider_Wdg QSlider::sub-page:horizontal {{
+    background: {accent};
+    border-radius: 3px;
+}}
+#scaleSlider_Wdg QSlider::add-page:horizontal {{
+    background: {slider_add};
+    border-radius: 3px;
+}}
+QLabel#scale_Lbl {{
+    font-size: 12px;
+    color: {text};
+    padding: 1px;
+}}
+QLabel#searchCount_Lbl {{
+    color: {text_dim};
+    font-size: 11px;
+    padding: 0px 2px;
+}}
+QCheckBox#profile_Chck {{
+    color: {text_dim};
+    font-size: 11px;
+}}
+#profilerPanel QTableWidget {{
+    background-color: {field};
+    color: {field_text};
+    gridline-color: {border};
+    border: 1px solid {border};
+    border-radius: 4px;
+}}
+#profilerPanel QHeaderView::section {{
+    background-color: {panel};
+    color: {text};
+    border: none;
+    padding: 3px 6px;
+}}
+QPushButton#pickColor_Btn, QPushButton#pushButton_2, QPushButton#profilerButton {{
+    border: 1px solid {button_border};
+    background-color: {button};
+    color: {button_text};
+    padding: 2px 5px;
+    font: bold 10pt;
+    border-radius: 5px;
+}}
+QPushButton#pickColor_Btn:hover, QPushButton#pushButton_2:hover, QPushButton#profilerButton:hover {{
+    background-color: {button_hover};
+    border: 1px solid {button_hover_border};
+}}
+QPushButton#pickColor_Btn:pressed, QPushButton#pushButton_2:pressed, QPushButton#profilerButton:pressed {{
+    background-color: {button_pressed};
+    border: 1.3px solid {button_pressed_border};
+}}
+QPushButton#pickColor_Btn:disabled, QPushButton#pushButton_2:disabled, QPushButton#profilerButton:disabled {{
+    background-color: {button_disabled};
+    color: {button_disabled_text};
+    border: 1px solid {text_dim};
+}}
+QGroupBox#groupBox, QGroupBox#nameSetting_Grp {{
+    border: 1px solid {outline};
+    border-radius: 7px;
+}}
+QGroupBox#groupBox:title, QGroupBox#nameSetting_Grp:title {{
+    font-size: 14px;
+    top: -1px;
+}}
+#libraryView {{
+    background: {panel};
+    border-radius: 8px;
+}}
+QLabel#colorSwatch {{
+    border: 1px solid gray;
+    border-radius: 2px;
+}}
+QLabel#colorSwatch:hover {{
+    border: 1px solid #888;
+}}
+QPushButton#presetSwatch {{
+    border: 1px solid gray;
+    border-radius: 6px;
+    min-width: 10px;
+    min-height: 10px;
+}}
+QPushButton#presetSwatch:hover {{
+    border: 2px solid #888;
+}}
+"""
+
+
+def theme_names():
+    return sorted(THEMES)
+
+
+def palette(name=DEFAULT_THEME):
+    if name not in THEMES:
+        raise ValueError(f"Unknown theme '{name}', expected one of {theme_names()}")
+    return THEMES[name]
+
+
+@functools.lru_cache(maxsize=None)
+def build_stylesheet(name=DEFAULT_THEME):
+    # formatted once per theme for the whole session
+    return _TEMPLATE.format(**palette(name))
+
+
+def apply_theme(root_widget, name=DEFAULT_THEME):
+    root_widget.setStyleSheet(build_stylesheet(name))
+    return palette(name)
@@ -0,0 +1,115 @@
+import os
+
+from PySide2.QtCore import Qt, QObject, QRunnable, QPointF, QSize, Signal
+from PySide2.QtGui import QImage, QPainter, QPen, QColor, QPolygonF
+
+from . import curve_math
+from .shape_cache import load_shape
+
+THUMB_DIR = '.clib_thumbs'
+THUMB_SIZE = QSize(48, 48)
+THUMB_COLOR = QColor('#fed42b')
+VIEWS = ('auto', 'top', 'front', 'side')
+
+
+def render_thumbnail(curve_dict, view='auto', size=THUMB_SIZE, color=THUMB_COLOR, margin=4):
+    # projects every shape of the control onto the view plane and draws it, fitted and centred
+    polylines = [curve_math.sample_curve(info) for info in curve_dict.values()]
+    if view == 'auto':
+        view = curve_math.pick_view([pt for line in polylines for pt in line])
+    polylines = [curve_math.project(line, view) for line in polylines if line]
+
+    image = QImage(size, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    points = [pt for line in polylines for pt in line]
+    if not points:
+        return image
+
+    min_x, max_x = min(p[0] for p in points), max(p[0] for p in points)
+    min_y, max_y = min(p[1] for p in points), max(p[1] for p in points)
+    extent = max(max_x - min_x, max_y - min_y) or 1.0
+    scale = (min(size.width(), size.height()) - 2 * margin) / extent
+    centre_x, centre_y = (min_x + max_x) * 0.5, (min_y + max_y) * 0.5
+
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(QPen(color, 1.5, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
+    for line in polylines:
+        # screen y grows downwards, the projected y axis points up
+        painter.drawPolyline(QPolygonF([QPointF(size.width() * 0.5 + (x - centre_x) * scale,
+                                                size.height() * 0.5 - (y - centre_y) * scale) for x, y in line]))
+    painter.end()
+    return image
+
+
+class _ThumbnailSignals(QObject):
+    rendered = Signal(str, str, QImage)
+
+
+class _ThumbnailTask(QRunnable):
+    def __init__(self, shape_file, thumb_path, view, signals):
+        super(_ThumbnailTask, self).__init__()
+        self.shape_file = shape_file
+        self.thumb_path = thumb_path
+        self.view = view
+        self.signals = signals
+
+    def run(self):
+        try:
+            image = render_thumbnail(load_shape(self.shape_file), self.view)
+            tmp_path = self.thumb_path + '.tmp.png'
+            if image.save(tmp_path, 'PNG'):
+                os.replace(tmp_path, self.thumb_path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[CLib] Couldn't render a thumbnail for {self.shape_file}: {e}")
+            image = QImage()
+        self.signals.rendered.emit(self.shape_file, self.thumb_path, image)
+
+
+class ThumbnailRenderer(QObject):
+    # Icons for shapes that have no hand-made png. Thumbnails are rendered from the cv data on the icon
+    # loader's thread pool and cached on disk under the shape's content id, so a shape is only drawn
+    # again once its geometry changes and identical shapes share one thumbnail.
+    def __init__(self, icon_loader, cache_dir, view='auto', parent=None):
+        super(ThumbnailRenderer, self).__init__(parent)
+        self.icon_loader = icon_loader
+        self.cache_dir = cache_dir
+        self.view = view
+        self._pending = set()
+        self._failed = set()
+        self._signals = _ThumbnailSignals(self)
+        self._signals.rendered.connect(self._on_rendered)
+        if not os.path.isdir(cache_dir):
+            try:
+                os.makedirs(cache_dir)
+            except OSError:
+                pass
+        self._cached = set(os.listdir(cache_dir)) if os.path.isdir(cache_dir) else set()
+
+    def set_view(self, view):
+        if view not in VIEWS:
+            raise ValueError(f"Unknown thumbnail view '{view}', expected one of {VIEWS}")
+        self.view = view
+
+    def path_for(self, entry):
+        return os.path.join(self.cache_dir, f"{entry['content_id']}_{self.view}.png")
+
+    def thumbnail(self, entry):
+        # the cached thumbnail's path, or None while it is still being rendered
+        thumb_path = self.path_for(entry)
+        if os.path.basename(thumb_path) in self._cached:
+            return thumb_path
+        if thumb_path not in self._pending and thumb_path not in self._failed:
+            self._pending.add(thumb_path)
+            self.icon_loader.pool.start(_ThumbnailTask(entry['file'], thumb_path, self.view, self._signals))
+        return None
+
+    def _on_rendered(self, shape_file, thumb_path, image):
+        self._pending.discard(thumb_path)
+        if image.isNull():
+            self._failed.add(thumb_path)
+            return
+        # counted as cached even if the png couldn't be written, the pixmap below still holds it
+        self._cached.add(os.path.basename(thumb_path))
+        # the freshly drawn image goes straight into the pixmap cache, no need to decode the png again
+        self.icon_loader.insert(thumb_path, None, image)
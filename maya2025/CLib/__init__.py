@@ -0,0 +1,7 @@
+# Launcher for the shelf button: CLib.show() builds the window on first use and only raises it afterwards.
+# Nothing heavy (PySide, the .ui file, the library scan) is imported until the first show().
+
+
+def show():
+    from . import main
+    return main.show()
@@ -0,0 +1,282 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+import maya.cmds as cmds
+from .core import ControlBuilder, bulk_session
+from .lod import LODS
+from .library_roots import load_library, LibraryConfigError
+from .profiling import profiler
+
+# Builds every control of a rig spec in one go, no window needed, so rig builds can run unattended:
+#
+#   mayapy -m CLib.batch rig.json [more.json ...] [--save out.ma] [--report report.json] [--profile stats.csv]
+#
+# A spec is json. Paths in it are relative to the spec file, everything but "controls" is optional and
+# each control entry falls back on "defaults" for whatever it leaves out:
+#
+#   {
+#     "library": "shapes",                  folder of shape files (the configured library roots by default)
+#     "scene": "rig_skeleton.ma",           opened before building, otherwise a new scene
+#     "output": "rig_controls.ma",          saved after building
+#     "defaults": {"suffix": "ctrl", "offset": true},
+#     "controls": [
+#       {"shape": "circle", "targets": ["L_*_jnt"], "name": "{target}", "color": [1, 0, 0], "axis": "X"},
+#       {"shape": "cog", "targets": [{"translate": [0, 100, 0]}], "name": "cog", "scale": 4}
+#     ]
+#   }
+#
+# targets are node names or patterns (one control per match) or explicit {"translate", "rotate"}
+# placements, no targets builds one control at the origin. "{target}" and "{index}" in a name are filled in
+# per control. Other settings: prefix, suffix, color (rgb 0-1), axis (X/Y/Z), scale, offset (npo group),
+# bake (target placement baked into the cvs) and lod (high/medium/low, see lod.py).
+SPEC_KEYS = ('library', 'scene', 'output', 'defaults', 'controls')
+CONTROL_KEYS = ('shape', 'targets', 'name', 'prefix', 'suffix', 'color', 'axis', 'scale', 'offset', 'bake', 'lod')
+CONTROL_DEFAULTS = {
+    'targets': [],
+    'name': None,
+    'prefix': None,
+    'suffix': None,
+    'color': (1.0, 1.0, 0.0),
+    'axis': 'Y',
+    'scale': 1.0,
+    'offset': False,
+    'bake': False,
+    'lod': 'high',
+}
+
+
+class SpecError(ValueError):
+    pass
+
+
+def initialize_maya():
+    # under mayapy the commands only exist once maya.standalone has started, inside maya they already do
+    if not hasattr(cmds, 'createNode'):
+        import maya.standalone
+        maya.standalone.initialize(name='python')
+
+
+def _check_keys(data, allowed, where):
+    if not isinstance(data, dict):
+        raise SpecError(f"{where} has to be an object")
+    unknown = sorted(set(data) - set(allowed))
+    if unknown:
+        raise SpecError(f"{where} has unknown keys {unknown}, expected some of {list(allowed)}")
+
+
+def _check_control(control, where):
+    if not isinstance(control.get('shape'), str) or not control['shape']:
+        raise SpecError(f"{where} needs a shape name")
+    if control['axis'] not in ('X', 'Y', 'Z'):
+        raise SpecError(f"{where} axis has to be X, Y or Z, not {control['axis']!r}")
+    color = control['color']
+    if (not isinstance(color, (list, tuple)) or len(color) != 3
+            or not all(isinstance(c, (int, float)) and 0 <= c <= 1 for c in color)):
+        raise SpecError(f"{where} color has to be three values between 0 and 1")
+    if not isinstance(control['scale'], (int, float)) or control['scale'] <= 0:
+        raise SpecError(f"{where} scale has to be a number above 0")
+    if control['lod'] not in LODS:
+        raise SpecError(f"{where} lod has to be one of {', '.join(LODS)}, not {control['lod']!r}")
+    for target in control['targets']:
+        if isinstance(target, dict):
+            _check_keys(target, ('translate', 'rotate'), f"{where} target")
+        elif not isinstance(target, str):
+            raise SpecError(f"{where} targets have to be names or {{translate, rotate}} placements")
+
+
+def read_spec(spec_path):
+    # loads and checks a spec up front, so a typo fails before anything is built
+    with open(spec_path, 'r') as f:
+        try:
+            spec = json.load(f)
+        except ValueError as e:
+            raise SpecError(f"{spec_path} isn't valid json: {e}")
+    _check_keys(spec, SPEC_KEYS, spec_path)
+    defaults = spec.get('defaults', {})
+    _check_keys(defaults, CONTROL_KEYS, f"{spec_path} defaults")
+    if not isinstance(spec.get('controls'), list) or not spec['controls']:
+        raise SpecError(f"{spec_path} has no controls to build")
+
+    controls = []
+    for i, entry in enumerate(spec['controls']):
+        where = f"{spec_path} control {i + 1}"
+        _check_keys(entry, CONTROL_KEYS, where)
+        control = dict(CONTROL_DEFAULTS, **defaults)
+        control.update(entry)
+        if isinstance(control['targets'], (str, dict)):
+            control['targets'] = [control['targets']]
+        _check_control(control, where)
+        controls.append(control)
+
+    spec_dir = os.path.dirname(os.path.abspath(spec_path))
+    resolved = {'path': spec_path, 'controls': controls}
+    for key in ('library', 'scene', 'output'):
+        resolved[key] = os.path.join(spec_dir, spec[key]) if spec.get(key) else None
+    return resolved
+
+
+def short_name(node):
+    return node.split('|')[-1].split(':')[-1]
+
+
+def resolve_targets(builder, targets):
+    # (name, placement) per control, node names and patterns are looked up in the scene
+    resolved = []
+    missing = []
+    for target in targets:
+        if isinstance(target, dict):
+            resolved.append((None, (target.get('translate', (0.0, 0.0, 0.0)), target.get('rotate', (0.0, 0.0, 0.0)))))
+            continue
+        nodes = cmds.ls(target, long=True, transforms=True)
+        if not nodes:
+            missing.append(target)
+            continue
+        resolved.extend(zip(nodes, builder.get_world_placements(nodes)))
+    if missing:
+        raise SpecError(f"targets not found in the scene: {missing}")
+    return resolved or [(None, None)]
+
+
+def build_control_entry(control, search_dirs):
+    builder = ControlBuilder(search_dirs[0], search_dirs)
+    builder.set_prefix(control['prefix'])
+    builder.set_suffix(control['suffix'])
+    builder.selected_color = tuple(float(c) for c in control['color'])
+    builder.ctrlscalevalue = float(control['scale'])
+    builder.axis = control['axis']
+    builder.addOffset = bool(control['offset'])
+    builder.bake_placement = bool(control['bake'])
+    builder.lod = control['lod']
+
+    targets = resolve_targets(builder, control['targets'])
+    names = None
+    if control['name']:
+        names = [control['name'].format(target=short_name(target) if target else control['shape'], index=index)
+                 for index, (target, _) in enumerate(targets, 1)]
+    # the same path the window builds controls through
+    return builder.build_controls(control['shape'], [placement for _, placement in targets], names)
+
+
+def build_spec(spec, undoable=True, library=None):
+    # builds every control entry, a failing entry is reported and skipped so one typo doesn't sink the rig.
+    # the build is one bulk_session, undoable=False switches maya's undo queue off for it, nothing in a batch
+    # run gets undone anyway.
+    search_dirs = [spec['library']] if spec['library'] else (library or load_library()).search_dirs()
+    report = {'spec': spec['path'], 'entries': [], 'controls': 0, 'failed': 0}
+    start = time.perf_counter()
+    with bulk_session("CLib_batch", undoable):
+        for control in spec['controls']:
+            entry_start = time.perf_counter()
+            entry = {'shape': control['shape'], 'controls': [], 'error': None}
+            try:
+                entry['controls'] = build_control_entry(control, search_dirs)
+            except (RuntimeError, ValueError, OSError, KeyError) as e:
+                entry['error'] = str(e)
+                report['failed'] += 1
+            entry['seconds'] = time.perf_counter() - entry_start
+            report['controls'] += len(entry['controls'])
+            report['entries'].append(entry)
+    report['build_seconds'] = time.perf_counter() - start
+    return report
+
+
+def run_spec(spec_path, output=None, library=None):
+    # the whole unattended job for one spec: scene in, controls built, scene out, every step timed
+    start = time.perf_counter()
+    timings = {}
+    spec = read_spec(spec_path)
+
+    step = time.perf_counter()
+    if spec['scene']:
+        cmds.file(spec['scene'], open=True, force=True)
+    else:
+        cmds.file(new=True, force=True)
+    timings['scene'] = time.perf_counter() - step
+
+    report = build_spec(spec, undoable=False, library=library)
+    timings['build'] = report.pop('build_seconds')
+
+    output = output or spec['output']
+    step = time.perf_counter()
+    if output:
+        cmds.file(rename=output)
+        cmds.file(save=True, force=True, type='mayaBinary' if output.endswith('.mb') else 'mayaAscii')
+    timings['save'] = time.perf_counter() - step
+    timings['total'] = time.perf_counter() - start
+
+    report['output'] = output
+    report['timings'] = timings
+    return report
+
+
+def format_report(report):
+    timings = report['timings']
+    count = report['controls']
+    lines = [f"[CLib] {report['spec']}: {count} controls from {len(report['entries'])} entries "
+             f"in {timings['total']:.2f} s"
+             + (f" ({timings['build'] / count * 1000:.1f} ms per control)" if count else "")]
+    lines.append(f"  scene {timings['scene']:.3f} s   build {timings['build']:.3f} s   save {timings['save']:.3f} s")
+    for entry in report['entries']:
+        built = len(entry['controls'])
+        result = f"error: {entry['error']}" if entry['error'] else f"{built} control{'' if built == 1 else 's'}"
+        lines.append(f"  {entry['shape']:<24} {entry['seconds'] * 1000:8.1f} ms   {result}")
+    if report['output']:
+        lines.append(f"  saved {report['output']}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build CLib controls from rig spec files without the window.")
+    parser.add_argument('specs', nargs='+', help="rig spec json files, built one after another")
+    parser.add_argument('--save', help="scene to save to, overrides the spec's output (only with a single spec)")
+    parser.add_argument('--report', help="also write the timing report of every spec to this json file")
+    parser.add_argument('--profile', help="profile CLib's operations and write the stats to this .json or .csv file")
+    args = parser.parse_args(argv)
+    if args.save and len(args.specs) > 1:
+        parser.error("--save only works with a single spec, give each spec an output instead")
+
+    initialize_maya()
+    try:
+        library = load_library()
+    except LibraryConfigError as e:
+        print(f"[CLib] {e}")
+        return 1
+    # unattended machines may never have opened the window, so their mirrors are brought up to date first
+    for mirror in library.mirrors():
+        mirror.sync()
+        if mirror.last_error:
+            print(f"[CLib] mirror of {mirror.source}: {mirror.last_error}")
+    if args.profile:
+        profiler.enable()
+    reports = []
+    failed = False
+    for spec_path in args.specs:
+        try:
+            report = run_spec(spec_path, args.save, library)
+        except (SpecError, RuntimeError, OSError) as e:
+            print(f"[CLib] {spec_path}: {e}")
+            reports.append({'spec': spec_path, 'error': str(e)})
+            failed = True
+            continue
+        print(format_report(report))
+        reports.append(report)
+        failed = failed or bool(report['failed'])
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(reports, f, indent=2)
+    if args.profile:
+        profiler.disable()
+        print(profiler.format_stats())
+        if args.profile.endswith('.csv'):
+            profiler.export_csv(args.profile)
+        else:
+            profiler.export_json(args.profile)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+import os
+import sys
+import shutil
+import hashlib
+import argparse
+import tempfile
+import subprocess
+
+# Compiles ClibUI.ui into ui_clib.py so launching the tool doesn't have to parse the .ui xml with QUiLoader.
+# The compiled module remembers the hash of the .ui it was built from. It isn't kept in the repo: main.py
+# builds it on the first launch that finds it missing or older than the .ui, and falls back to QUiLoader
+# when that can't be done (no uic, a read-only install), so an edited .ui is never shown stale.
+#
+#   mayapy build_ui.py            (re)build ui_clib.py
+#   mayapy build_ui.py --check    exit 1 if ui_clib.py is missing or out of date
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+UI_FILE = os.path.join(SCRIPT_DIR, "ClibUI.ui")
+COMPILED_MODULE = 'ui_clib'
+COMPILED_FILE = os.path.join(SCRIPT_DIR, COMPILED_MODULE + '.py')
+UIC_COMMANDS = (['pyside6-uic'], ['uic', '-g', 'python'])
+
+
+def ui_hash(ui_file=UI_FILE):
+    with open(ui_file, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def find_uic():
+    # maya keeps its uic next to mayapy, so look there before PATH
+    search_path = os.pathsep.join([os.path.dirname(sys.executable), os.environ.get('PATH', '')])
+    for command in UIC_COMMANDS:
+        found = shutil.which(command[0], path=search_path)
+        if found:
+            return [found] + command[1:]
+    return None
+
+
+def is_current(module, ui_file=UI_FILE):
+    return getattr(module, 'UI_HASH', None) == ui_hash(ui_file)
+
+
+def is_built(ui_file=UI_FILE, output=COMPILED_FILE):
+    # checks the file rather than importing it, a stale module has no business being imported
+    if not os.path.isfile(output):
+        return False
+    with open(output, 'r') as f:
+        return f"UI_HASH = '{ui_hash(ui_file)}'" in f.read()
+
+
+def ensure_built(ui_file=UI_FILE, output=COMPILED_FILE):
+    # -> True when output is current, building it first if it has to
+    if is_built(ui_file, output):
+        return True
+    try:
+        build(ui_file, output)
+    except (RuntimeError, OSError, subprocess.SubprocessError) as e:
+        print(f"[CLib] Couldn't build {os.path.basename(output)}: {e}")
+        return False
+    return True
+
+
+def build(ui_file=UI_FILE, output=COMPILED_FILE, uic=None):
+    uic = uic or find_uic()
+    if not uic:
+        raise RuntimeError("Couldn't find pyside6-uic or uic, pass one with --uic.")
+    fd, tmp_path = tempfile.mkstemp(suffix='.py')
+    os.close(fd)
+    try:
+        subprocess.check_call(uic + [ui_file, '-o', tmp_path])
+        with open(tmp_path, 'r') as f:
+            code = f.read()
+    finally:
+        os.remove(tmp_path)
+
+    with open(output, 'w') as f:
+        f.write(f"# Generated from {os.path.basename(ui_file)} by build_ui.py, don't edit by hand.\n")
+        f.write(code)
+        f.write(f"\n\nUI_HASH = '{ui_hash(ui_file)}'\n")
+    return output
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile ClibUI.ui into a python module.")
+    parser.add_argument('--uic', help="uic executable to use instead of searching for one")
+    parser.add_argument('--check', action='store_true', help="only report whether the compiled module is current")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        current = is_built()
+        print(f"[CLib] {COMPILED_MODULE}.py is {'up to date' if current else 'missing or stale'}")
+        return 0 if current else 1
+
+    print(f"[CLib] wrote {build(uic=[args.uic] if args.uic else None)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,391 @@
+import os
+import math
+import contextlib
+import maya.cmds as cmds
+import maya.api.OpenMaya as om2
+from . import shape_format
+from . import curve_math
+from .lod import LODS, check_lod, load_lod
+from .library_index import content_id
+from .profiling import profiled
+
+# Everything that reads and builds controls without the window: main.py puts the Qt tool on top of it and
+# batch.py drives it from rig spec files under mayapy.
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+SHAPE_DIR = os.path.join(SCRIPT_DIR, "shapes")
+# attributes CLib leaves on the controls it builds: the library shape and the lod (an index into LODS)
+SHAPE_ATTR = 'clibShape'
+LOD_ATTR = 'clibLod'
+# depth of the bulk_session being run (nested sessions join the outermost one), and whether maya has a
+# viewport to suspend, asked once
+_bulk = {'depth': 0, 'interactive': None}
+
+
+@contextlib.contextmanager
+def bulk_session(name='CLib_bulk', undoable=True):
+    # for building or changing many controls at once: the viewport stops redrawing and everything done inside
+    # lands in one undo step named name, or, with undoable=False, isn't recorded for undo at all (batch builds).
+    # Refresh and undo are put back however the block ends, each on its own so one failing can't skip the other
+    if _bulk['depth']:
+        _bulk['depth'] += 1
+        try:
+            yield
+        finally:
+            _bulk['depth'] -= 1
+        return
+    if _bulk['interactive'] is None:
+        _bulk['interactive'] = not cmds.about(batch=True)
+    interactive = _bulk['interactive']
+    undo_state = None
+    if interactive:
+        cmds.refresh(suspend=True)
+    try:
+        if undoable:
+            cmds.undoInfo(openChunk=True, chunkName=name)
+        else:
+            undo_state = cmds.undoInfo(query=True, state=True)
+            cmds.undoInfo(stateWithoutFlush=False)
+        _bulk['depth'] = 1
+        try:
+            yield
+        finally:
+            _bulk['depth'] = 0
+            if undoable:
+                cmds.undoInfo(closeChunk=True)
+            else:
+                cmds.undoInfo(stateWithoutFlush=undo_state)
+    finally:
+        if interactive:
+            cmds.refresh(suspend=False)
+
+
+class Draw:
+    def __init__(self, curve=None, shape_dir=None, search_dirs=None):
+        self.curve = curve
+        # shapes are written to shape_dir and looked up in search_dirs, first match wins
+        self.shape_dir = shape_dir or SHAPE_DIR
+        self.search_dirs = search_dirs or [self.shape_dir]
+        if curve:
+            self.curve = curve
+        elif len(cmds.ls(selection=True)):
+            self.curve = cmds.ls(selection=True)[0]
+
+    def get_curve_fn(self, shape):
+        sel = om2.MSelectionList()
+        sel.add(shape)
+        return om2.MFnNurbsCurve(sel.getDagPath(0))
+
+    def get_cv_positions(self, curve, cv_len=None):
+        # pulls every cv in one query instead of an xform round-trip per cv
+        curve_fn = self.get_curve_fn(curve)
+        points = curve_fn.cvPositions(om2.MSpace.kObject)
+        if cv_len is None:
+            cv_len = self.get_cv_count(curve_fn)
+        return [[points[i].x, points[i].y, points[i].z] for i in range(cv_len)]
+
+    def get_cv_count(self, curve_fn):
+        # periodic curves repeat their first <degree> cvs at the end, the shape files only store the unique ones
+        if curve_fn.form == om2.MFnNurbsCurve.kPeriodic:
+            return curve_fn.numCVs - curve_fn.degree
+        return curve_fn.numCVs
+
+    def get_shape_info(self, shape):
+        # degree/spans/form/knots and every cv position from a single function set per shape
+        curve_fn = self.get_curve_fn(shape)
+        points = curve_fn.cvPositions(om2.MSpace.kObject)
+        cv_len = self.get_cv_count(curve_fn)
+        return {
+            'spans': curve_fn.numSpans,
+            'degree': curve_fn.degree,
+            # MFnNurbsCurve forms start at kOpen = 1, the .form attribute (and the shape files) start at 0
+            'form': curve_fn.form - om2.MFnNurbsCurve.kOpen,
+            'cv_len': cv_len,
+            'cv_pos': [[points[i].x, points[i].y, points[i].z] for i in range(cv_len)],
+            'knots': list(curve_fn.knots()),
+            'tag': 'default'
+        }
+
+    @profiled
+    def get_curve_info(self, curve=None):
+        if not curve:
+            curve = self.curve
+        self.curve_dict = {}
+        for crv in cmds.listRelatives(curve, shapes=True, fullPath=True, type='nurbsCurve') or []:
+            self.curve_dict[crv] = self.get_shape_info(crv)
+        return self.curve_dict
+
+    @profiled
+    def write_curve(self, name=None, force=True, tag="default", binary=False, curve_data=None, tolerance=0.0):
+        # curve_data is what get_curve_info returned, if the caller has it already.
+        # a tolerance decimates the shapes first (see curve_math.decimate_shape), returns (cvs before, cvs after)
+        if not self.curve:
+            cmds.error('No curve selected.')
+
+        if not name:
+            name = self.curve
+
+        if curve_data is None:
+            curve_data = self.get_curve_info(self.curve)
+        curve_data, before, after = curve_math.decimate_curve_data(curve_data, tolerance)
+        for data in curve_data.values():
+            data['tag'] = tag
+
+        file_path = os.path.join(self.shape_dir, name + (shape_format.BINARY_EXT if binary else shape_format.JSON_EXT))
+        existing = shape_format.find_shape_file(self.shape_dir, name)
+
+        if existing and not force:
+            cmds.error(f"Curve {name} already exists. Use force=True to overwrite.")
+
+        # drop the other format first so a stale copy can't shadow the new one
+        if existing:
+            shape_format.remove_shape_files(file_path)
+        shape_format.write_shape_file(file_path, curve_data)
+        return before, after
+
+    def get_knots(self, info):
+        return curve_math.maya_knots(info)
+
+    def set_shape_data(self, shape_node, info, matrix=None):
+        # writes the whole curve (knots, form and cvs) into the shape in one undoable setAttr,
+        # the cvs go through the matrix (scale/axis/placement) on the way in
+        points = curve_math.curve_tuples(info, matrix)
+        cmds.setAttr(f"{shape_node}.cached", info['degree'], info['spans'], info['form'], False, 3,
+                     self.get_knots(info), len(points), *points, type='nurbsCurve')
+
+    def load_shape_data(self, shape, lod='high'):
+        for shape_dir in self.search_dirs:
+            file_path = shape_format.find_shape_file(shape_dir, shape)
+            if file_path:
+                return load_lod(file_path, lod)
+        cmds.error(f"No shape file found for {shape} in {', '.join(self.search_dirs)}")
+
+    @profiled
+    def build_curve(self, name, curve_dict, matrix=None, parent=None):
+        # every stored shape is built straight under one transform, periodic shapes come out periodic
+        # parent has to be a full path, the full path of the new transform is returned
+        if parent:
+            ctrl = cmds.createNode('transform', name=name, parent=parent, skipSelect=True)
+            self.curve = f"{parent}|{ctrl}"
+        else:
+            ctrl = cmds.createNode('transform', name=name, skipSelect=True)
+            self.curve = f"|{ctrl}"
+        for i, info in enumerate(curve_dict.values()):
+            shape_name = f"{ctrl}Shape{i if i else ''}"
+            shape_node = cmds.createNode('nurbsCurve', name=shape_name, parent=self.curve, skipSelect=True)
+            self.set_shape_data(f"{self.curve}|{shape_node}", info, matrix)
+        return self.curve
+
+    @profiled
+    def create_curve(self, name='default', shape='circle', scale=1.0):
+        matrix = None if scale == 1.0 else curve_math.scale_matrix(scale)
+        self.build_curve(name, self.load_shape_data(shape), matrix)
+        cmds.select(cl=True)
+        return self.curve
+
+
+class ControlBuilder:
+    # control settings (name parts, colour, scale, axis, offset group) and the code that builds controls from them
+    def __init__(self, shape_dir=None, search_dirs=None):
+        self.shape_dir = shape_dir or SHAPE_DIR
+        self.search_dirs = search_dirs
+        self.selected_color = (1.0, 1.0, 0.0)
+        self.ctrlscalevalue = 1.0
+        self.prefix = None
+        self.curvename = None
+        self.suffix = None
+
+        # offset grp state
+        self.addOffset = False
+        # bake the target's position/rotation into the cvs instead of onto the control's transform
+        self.bake_placement = False
+        # axis to affect the direction the curve is pointing
+        self.axis = "Y"
+        # level of detail new controls are built at, one of lod.LODS
+        self.lod = 'high'
+        # saved controls lose the cvs they can spare within this distance of their curve, 0 keeps every cv
+        self.tolerance = 0.0
+        # (cvs before, cvs after) of the last save_selected
+        self.last_cv_counts = None
+        self.axis_rotation = {
+            "X": (0, 0, -90),
+            "Y": (0, 0, 0),
+            "Z": (90, 0, 0),
+        }
+
+    def set_prefix(self, prefixname):
+        self.prefix = prefixname
+
+    def set_name(self, name):
+        self.curvename = name
+
+    def set_suffix(self, suffix):
+        self.suffix = suffix
+
+    def control_name(self, default_name, name=None):
+        # Name setup for Control, name stands in for the name setting of a single control
+        name_parts = []
+        if self.prefix:
+            name_parts.append(self.prefix.rstrip('_'))
+        name_parts.append(name or self.curvename or default_name)
+        if self.suffix:
+            name_parts.append(self.suffix.lstrip('_'))
+        return "_".join(name_parts)
+
+    def get_world_placements(self, objects):
+        # world rotate pivot + rotation of every target from one selection list instead of two xforms each
+        sel = om2.MSelectionList()
+        for obj in objects:
+            sel.add(obj)
+        placements = []
+        for i in range(sel.length()):
+            dag_path = sel.getDagPath(i)
+            pivot = om2.MFnTransform(dag_path).rotatePivot(om2.MSpace.kWorld)
+            rotation = om2.MTransformationMatrix(dag_path.inclusiveMatrix()).rotation()
+            placements.append(([pivot.x, pivot.y, pivot.z],
+                               [math.degrees(rotation.x), math.degrees(rotation.y), math.degrees(rotation.z)]))
+        return placements
+
+    def control_matrix(self, placement=None):
+        # scale, then the primary axis rotation, then (when baking) the placement, as one matrix for the cvs
+        matrices = [curve_math.scale_matrix(self.ctrlscalevalue), curve_math.rotate_matrix(self.axis_rotation[self.axis])]
+        if placement:
+            matrices += [curve_math.rotate_matrix(placement[1]), curve_math.translate_matrix(placement[0])]
+        matrix = curve_math.compose(*matrices)
+        return None if curve_math.is_identity(matrix) else matrix
+
+    def apply_color(self, controls):
+        #override curve color with the selected color from the picker, one shape query for every control
+        for shape in cmds.listRelatives(controls, shapes=True, fullPath=True) or []:
+            cmds.setAttr(f"{shape}.overrideEnabled", 1)
+            cmds.setAttr(f"{shape}.overrideRGBColors", 1)
+            cmds.setAttr(f"{shape}.overrideColorRGB", *self.selected_color)
+
+    @profiled
+    def build_control(self, name, curve_dict, placement=None, control_name=None):
+        ctrl_name = self.control_name(name, control_name)
+        draw = Draw(ctrl_name, self.shape_dir, self.search_dirs)
+        if placement and self.bake_placement:
+            # cvs land at the target while the transform stays at the origin, like frozen transforms
+            matrix = self.control_matrix(placement)
+            placement = None
+        else:
+            matrix = self.control_matrix()
+        if self.addOffset:
+            # Implement NPO/Offset group, the control is built inside it so nothing needs matching afterwards
+            offset_grp = "|" + cmds.createNode('transform', name=f"{ctrl_name}_npo", skipSelect=True)
+            if placement:
+                cmds.xform(offset_grp, worldSpace=True, translation=placement[0], rotation=placement[1])
+            ctrl = draw.build_curve(ctrl_name, curve_dict, matrix, parent=offset_grp)
+        else:
+            ctrl = draw.build_curve(ctrl_name, curve_dict, matrix)
+            if placement:
+                cmds.xform(ctrl, worldSpace=True, translation=placement[0], rotation=placement[1])
+        return ctrl
+
+    @profiled
+    def save_selected(self, tag='default', confirm=None):
+        # stores the selected curve in the library under its own name and tag, returns that name.
+        # the cvs are read in the shapes' object space, the control's own frame with its placement and scale
+        # left out, so the scene isn't touched and nothing lands on the undo queue.
+        # confirm(name, content id) is asked before anything is written, returning False cancels the save
+        selection = cmds.ls(selection=True)
+        if not selection:
+            cmds.warning("No curve to save selected.")
+            return None
+        name = selection[0]
+        draw = Draw(name, self.shape_dir)
+        curve_data = draw.get_curve_info()
+        if not curve_data:
+            cmds.warning(f"{name} has no curves to save.")
+            return None
+        # decimated before the content id, so the id is that of what gets stored
+        curve_data, before, after = curve_math.decimate_curve_data(curve_data, self.tolerance)
+        if self.tolerance > 0:
+            print(f"[CLib] {name}: {before} -> {after} cvs within {self.tolerance:g}")
+        if confirm and not confirm(name, content_id(curve_data)):
+            return None
+        draw.write_curve(name=name, force=True, tag=tag, curve_data=curve_data)
+        self.last_cv_counts = (before, after)
+        return name
+
+    def tag_controls(self, controls, shape):
+        # records the library shape and lod the controls were built from, so set_lod can swap them later
+        if not controls:
+            return
+        cmds.addAttr(controls, longName=SHAPE_ATTR, dataType='string')
+        cmds.addAttr(controls, longName=LOD_ATTR, attributeType='enum', enumName=':'.join(LODS),
+                     defaultValue=LODS.index(self.lod))
+        for ctrl in controls:
+            cmds.setAttr(f"{ctrl}.{SHAPE_ATTR}", shape, type='string')
+
+    @profiled
+    def build_controls(self, name, placements, names=None):
+        # one control per placement (None builds it at the origin), errors are left to the caller.
+        # names, one per placement, replace the name setting for each control
+        curve_dict = Draw(name, self.shape_dir, self.search_dirs).load_shape_data(name, check_lod(self.lod))
+        controls = [self.build_control(name, curve_dict, placement, names[i] if names else None)
+                    for i, placement in enumerate(placements)]
+        self.apply_color(controls)
+        self.tag_controls(controls, name)
+        return controls
+
+    @profiled
+    def create_control(self, name):
+        # one control per selected object (or one at the origin), all in a single undo step
+        targets = cmds.ls(selection=True, long=True, transforms=True)
+        controls = []
+        try:
+            with bulk_session(f"CLib_create_{name}"):
+                controls = self.build_controls(name, self.get_world_placements(targets) if targets else [None])
+                cmds.select(cl=True)
+        except Exception as e:
+            print("Error creating control:", e)
+        return controls
+
+    @profiled
+    def set_lod(self, lod, controls=None):
+        # swaps the curves of CLib controls (the given ones, every one in the scene by default) for another lod
+        # of their library shape, in a single undo step. The new curves are fitted onto the current ones, so
+        # scale, axis and baked placements carry over, edits to single cvs don't. Returns the controls switched
+        check_lod(lod)
+        if controls is None:
+            controls = cmds.ls(f"*.{SHAPE_ATTR}", objectsOnly=True, long=True, recursive=True) or []
+        elif controls:
+            controls = cmds.ls([f"{ctrl}.{SHAPE_ATTR}" for ctrl in controls], objectsOnly=True, long=True) or []
+        if not controls:
+            return []
+        draw = Draw(controls[0], self.shape_dir, self.search_dirs)
+        shapes = {}
+        switched = []
+        with bulk_session(f"CLib_lod_{lod}"):
+            for ctrl in controls:
+                current = LODS[cmds.getAttr(f"{ctrl}.{LOD_ATTR}")]
+                if current == lod:
+                    continue
+                shape = cmds.getAttr(f"{ctrl}.{SHAPE_ATTR}")
+                for level in (current, lod):
+                    if (shape, level) not in shapes:
+                        try:
+                            shapes[shape, level] = draw.load_shape_data(shape, level)
+                        except RuntimeError:
+                            shapes[shape, level] = None
+                if shapes[shape, current] is None or shapes[shape, lod] is None:
+                    cmds.warning(f"{ctrl}: no library shape {shape} to switch to")
+                    continue
+                nodes = cmds.listRelatives(ctrl, shapes=True, fullPath=True, type='nurbsCurve') or []
+                old = list(shapes[shape, current].values())
+                # the cvs a control has now, fitted against the lod it was at, give its build matrix
+                matrices = []
+                for node, info in zip(nodes, old):
+                    points = draw.get_shape_info(node)['cv_pos']
+                    if len(points) != len(info['cv_pos']):
+                        break
+                    matrices.append(curve_math.fit_matrix(info['cv_pos'], points))
+                if len(nodes) != len(old) or len(matrices) != len(old):
+                    cmds.warning(f"{ctrl}: its curves no longer match {shape}, rebuild it to switch lod")
+                    continue
+                for node, info, matrix in zip(nodes, shapes[shape, lod].values(), matrices):
+                    draw.set_shape_data(node, info, matrix)
+                cmds.setAttr(f"{ctrl}.{LOD_ATTR}", LODS.index(lod))
+                switched.append(ctrl)
+        return switched
@@ -0,0 +1,175 @@
+import os
+import json
+import hashlib
+
+from . import shape_format
+from . import curve_math
+from .shape_cache import load_shape
+
+INDEX_FILE = '.clib_index.json'
+INDEX_VERSION = 3
+# decimals cvs and knots are rounded to for content ids, far below anything visible on a control
+ID_PRECISION = 4
+
+
+def _dir_stamp(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _scan_shapes(shape_dir):
+    # {shape name: (file path, stat)} in one scandir, the binary file wins when a shape is in both formats
+    found = {}
+    with os.scandir(shape_dir) as items:
+        for item in items:
+            name, dot, ext = item.name.rpartition('.')
+            ext = dot + ext
+            if name and ext in shape_format.SHAPE_EXTS and (name not in found or ext == shape_format.BINARY_EXT):
+                try:
+                    found[name] = (item.path, item.stat())
+                except OSError:
+                    # gone between the listing and now, the next refresh drops it
+                    continue
+    return found
+
+
+def content_hash(curve_dict):
+    # hash of the shape data itself, so the same curve hashes the same in either file format
+    raw = json.dumps(list(curve_dict.values()), sort_keys=True, separators=(',', ':'), default=shape_format.to_json)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def normalize_shape(info):
+    def rounded(value):
+        # + 0.0 folds -0.0 into 0.0, float() makes the int knots of older files match float ones
+        return float(round(value, ID_PRECISION)) + 0.0
+    return {
+        'degree': info['degree'],
+        'form': info['form'],
+        'knots': [rounded(k) for k in curve_math.maya_knots(info)],
+        'cvs': [[rounded(c) for c in pt] for pt in info['cv_pos']],
+    }
+
+
+def content_id(curve_dict):
+    # the same geometry gets the same id whatever the control, its shapes and its tag are called and in
+    # whichever order its shapes were stored
+    shapes = sorted(json.dumps(normalize_shape(info), separators=(',', ':')) for info in curve_dict.values())
+    return hashlib.sha1('\n'.join(shapes).encode('utf-8')).hexdigest()
+
+
+def summarize(curve_dict):
+    points = [pt for info in curve_dict.values() for pt in info['cv_pos']]
+    if points:
+        bbox = [[min(pt[i] for pt in points) for i in range(3)],
+                [max(pt[i] for pt in points) for i in range(3)]]
+    else:
+        bbox = [[0.0, 0.0, 0.0], [0.0, 0.0, 0.0]]
+    first = next(iter(curve_dict.values()), {})
+    return {
+        'tag': first.get('tag', 'default'),
+        'shape_count': len(curve_dict),
+        'cv_count': len(points),
+        'bbox': bbox,
+        'hash': content_hash(curve_dict),
+        'content_id': content_id(curve_dict)
+    }
+
+
+class LibraryIndex:
+    # Everything the library ui needs to list a shape, persisted so opening the tool doesn't have to parse
+    # the shape files. Every refresh stats the files of both folders (a file rewritten in place leaves its
+    # folder's mtime alone) and only re-reads those whose mtime/size changed since the last one.
+    def __init__(self, shape_dir, icon_dir, index_path=None):
+        self.shape_dir = shape_dir
+        self.icon_dir = icon_dir
+        # kept beside the shapes folder rather than in it, writing it would otherwise bump the folder mtime
+        self.index_path = index_path or os.path.join(os.path.dirname(os.path.abspath(shape_dir)), INDEX_FILE)
+        self.entries = {}
+        self.shape_dir_stamp = None
+        self.icon_dir_stamp = None
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != INDEX_VERSION:
+            return
+        self.entries = data.get('entries', {})
+        self.shape_dir_stamp = data.get('shape_dir_stamp')
+        self.icon_dir_stamp = data.get('icon_dir_stamp')
+
+    def save(self):
+        data = {
+            'version': INDEX_VERSION,
+            'shape_dir_stamp': self.shape_dir_stamp,
+            'icon_dir_stamp': self.icon_dir_stamp,
+            'entries': self.entries
+        }
+        tmp_path = self.index_path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            # read-only libraries still work, they just rescan on every launch
+            pass
+
+    def sorted_entries(self):
+        return [self.entries[name] for name in sorted(self.entries, key=str.lower)]
+
+    def refresh(self, full=False):
+        # returns the names that were (added, updated, removed), full=True also re-reads unchanged files
+        shape_stamp = _dir_stamp(self.shape_dir)
+        icon_stamp = _dir_stamp(self.icon_dir)
+
+        added, updated, removed = [], [], []
+        files = _scan_shapes(self.shape_dir) if shape_stamp is not None else {}
+        for name in list(self.entries):
+            if name not in files:
+                del self.entries[name]
+                removed.append(name)
+        for name, (file_path, stat) in files.items():
+            entry = self.entries.get(name)
+            if (not full and entry and entry['file'] == file_path and entry['mtime'] == stat.st_mtime_ns
+                    and entry['size'] == stat.st_size):
+                continue
+            try:
+                entry_data = summarize(load_shape(file_path))
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f"[CLib] Skipping unreadable shape file {file_path}: {e}")
+                continue
+            entry_data.update({
+                'name': name,
+                'file': file_path,
+                'mtime': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'icon': None,
+                'icon_mtime': None
+            })
+            (updated if entry else added).append(name)
+            self.entries[name] = entry_data
+
+        icons = {}
+        if icon_stamp is not None:
+            for item in os.scandir(self.icon_dir):
+                if item.name.endswith('.png'):
+                    icons[item.name[:-4]] = (item.path, item.stat().st_mtime_ns)
+        for name, entry in self.entries.items():
+            icon, icon_mtime = icons.get(name, (None, None))
+            if icon != entry['icon'] or icon_mtime != entry.get('icon_mtime'):
+                entry['icon'] = icon
+                entry['icon_mtime'] = icon_mtime
+                if name not in added and name not in updated:
+                    updated.append(name)
+
+        if added or updated or removed or (shape_stamp, icon_stamp) != (self.shape_dir_stamp, self.icon_dir_stamp):
+            self.shape_dir_stamp = shape_stamp
+            self.icon_dir_stamp = icon_stamp
+            self.save()
+        return added, updated, removed
@@ -0,0 +1,276 @@
+import re
+import bisect
+from collections import Counter
+
+# In-memory search over the library index entries, for filtering the grid as you type.
+#
+# A query is whitespace separated terms, all of which have to match. A plain term matches a shape whose tag
+# or a word of whose name starts with it or whose name contains it. When nothing does, names with a word
+# close to the term by shared trigrams (typos, missing letters) match instead. Facet terms narrow on the
+# entry's numbers and tag:
+#
+#   arrow                   tag/name words starting with "arrow", names containing it
+#   tag:fk                  tagged exactly fk
+#   shapes:2  shapes:>1     shape count, also <n, >=n, <=n and a-b ranges
+#   cvs:<50  cvs:10-100     cv count, same forms
+FACETS = ('tag', 'shapes', 'cvs')
+FACET_KEYS = {'shapes': 'shape_count', 'cvs': 'cv_count'}
+# bucket edges for the cv count facet
+CV_BUCKETS = (8, 32, 128, 1024)
+# jaccard similarity of trigram sets a name word needs to count as a typo of a term
+FUZZY_THRESHOLD = 0.3
+
+# match scores, better matches list first
+EXACT, PREFIX, WORD, TAG, SUBSTRING, FUZZY = 5.0, 4.0, 3.0, 2.5, 2.0, 1.0
+
+_WORD_RE = re.compile(r'[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+')
+_RANGE_RE = re.compile(r'^(<=|>=|<|>)?(\d+)(?:-(\d+))?$')
+
+
+def name_words(name):
+    # arrowDouble_ctrl2 -> arrow, double, ctrl, 2
+    return [word.lower() for word in _WORD_RE.findall(name)]
+
+
+def trigrams(text, pad=True):
+    # padded so the start and end of a name weigh in too, short terms still get a trigram or two
+    if pad:
+        text = f"  {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def parse_range(value):
+    # '2', '>1', '<=50', '10-100' -> (low, high) inclusive, None for an open end
+    match = _RANGE_RE.match(value)
+    if not match:
+        return None
+    op, number, upper = match.group(1), int(match.group(2)), match.group(3)
+    if upper is not None:
+        return None if op else (number, int(upper))
+    return {
+        None: (number, number),
+        '<': (None, number - 1),
+        '<=': (None, number),
+        '>': (number + 1, None),
+        '>=': (number, None),
+    }[op]
+
+
+def parse_query(text):
+    # -> (terms, facets), facets is a list of (facet, value), unknown key:value terms are plain terms
+    terms, facets = [], []
+    for part in text.lower().split():
+        key, sep, value = part.partition(':')
+        if sep and key in FACETS and value:
+            facets.append((key, value))
+        else:
+            terms.append(part)
+    return terms, facets
+
+
+def cv_bucket(cv_count):
+    low = 0
+    for edge in CV_BUCKETS:
+        if cv_count <= edge:
+            return f"{low}-{edge}"
+        low = edge + 1
+    return f">{CV_BUCKETS[-1]}"
+
+
+class SearchIndex:
+    # Word, tag and trigram postings for every library entry, kept up to date from LibraryIndex.refresh()'s
+    # added/updated/removed names rather than rebuilt, so typing in the search bar only ever touches the
+    # postings of the terms typed. Typos are caught per name word: a term is compared by trigrams with the
+    # distinct words of the library, which are far fewer than the names.
+    def __init__(self, entries=None):
+        self.entries = {}
+        self._lower = {}
+        # (tag, shape count, cv bucket) of every name, for counting facets
+        self._facet_values = {}
+        # name -> shape count / cv count, for the range facets
+        self._numbers = {facet: {} for facet in FACET_KEYS}
+        self._words = {}
+        self._tags = {}
+        self._trigrams = {}
+        self._word_trigrams = {}
+        self._sorted_words = None
+        self._sorted_tags = None
+        self._sorted_names = None
+        self._sorted_lower = None
+        self._order = None
+        if entries:
+            self.update(entries, list(entries), [], [])
+
+    def __len__(self):
+        return len(self.entries)
+
+    def update(self, entries, added, updated, removed):
+        # entries is the LibraryIndex entries dict, the lists are what its refresh() returned
+        for name in list(removed) + list(updated):
+            self._remove(name)
+        for name in list(added) + list(updated):
+            if name in entries:
+                self._add(entries[name])
+        if added or updated or removed:
+            self._sorted_words = self._sorted_tags = self._sorted_names = self._order = None
+
+    def _add(self, entry):
+        name = entry['name']
+        lower = name.lower()
+        record = {
+            'name': name,
+            'words': set(name_words(name)),
+            'tag': str(entry.get('tag') or 'default').lower(),
+            'trigrams': trigrams(lower),
+            'shape_count': entry.get('shape_count', 0),
+            'cv_count': entry.get('cv_count', 0),
+        }
+        self.entries[name] = record
+        self._lower[name] = lower
+        self._facet_values[name] = (record['tag'], record['shape_count'], cv_bucket(record['cv_count']))
+        for facet, key in FACET_KEYS.items():
+            self._numbers[facet][name] = record[key]
+        for word in record['words']:
+            if word not in self._words:
+                self._words[word] = set()
+                for gram in trigrams(word):
+                    self._word_trigrams.setdefault(gram, set()).add(word)
+            self._words[word].add(name)
+        self._tags.setdefault(record['tag'], set()).add(name)
+        for gram in record['trigrams']:
+            self._trigrams.setdefault(gram, set()).add(name)
+
+    def _remove(self, name):
+        record = self.entries.pop(name, None)
+        if record is None:
+            return
+        del self._lower[name]
+        del self._facet_values[name]
+        for numbers in self._numbers.values():
+            del numbers[name]
+        for word in record['words']:
+            names = self._words[word]
+            names.discard(name)
+            if not names:
+                del self._words[word]
+                for gram in trigrams(word):
+                    self._discard(self._word_trigrams, gram, word)
+        self._discard(self._tags, record['tag'], name)
+        for gram in record['trigrams']:
+            self._discard(self._trigrams, gram, name)
+
+    def _discard(self, postings, key, value):
+        values = postings.get(key)
+        if values is not None:
+            values.discard(value)
+            if not values:
+                del postings[key]
+
+    def prepare(self):
+        # sorts what prefix lookups and ranking go by, call it once the index is built or updated so the
+        # first keystroke doesn't pay for it
+        if self._order is None:
+            self._sorted_words = sorted(self._words)
+            self._sorted_tags = sorted(self._tags)
+            self._sorted_names = sorted(self.entries, key=str.lower)
+            self._sorted_lower = [self._lower[name] for name in self._sorted_names]
+            self._order = {name: i for i, name in enumerate(self._sorted_names)}
+
+    def _prefixed(self, postings, sorted_keys, prefix):
+        # every name posted under a key starting with prefix
+        start = bisect.bisect_left(sorted_keys, prefix)
+        names = set()
+        for key in sorted_keys[start:]:
+            if not key.startswith(prefix):
+                break
+            names |= postings[key]
+        return names
+
+    def similar_words(self, term):
+        # library words whose trigrams overlap the term's enough to count as a typo of it
+        term_grams = trigrams(term)
+        shared = Counter()
+        for gram in term_grams:
+            shared.update(self._word_trigrams.get(gram, ()))
+        return [word for word, count in shared.items()
+                if count / (len(term_grams) + len(word) + 1 - count) >= FUZZY_THRESHOLD]
+
+    def match_term(self, term, within=None):
+        # {name: score} for one plain term, within limits it to a set of names already matched
+        self.prepare()
+        # names containing the term share all of its unpadded trigrams, only those need the string check
+        grams = trigrams(term, pad=False)
+        candidates = min((self._trigrams.get(gram, ()) for gram in grams), key=len) if grams else self._lower
+        if within is not None and len(within) < len(candidates):
+            candidates = within
+        lower = self._lower
+        contained = [name for name in candidates if term in lower[name]]
+        start = bisect.bisect_left(self._sorted_lower, term)
+        end = bisect.bisect_left(self._sorted_lower, term + '\U0010ffff', start)
+        # filled worst match first, so each name ends up with its best score
+        scores = dict.fromkeys(contained, SUBSTRING)
+        scores.update(dict.fromkeys(self._prefixed(self._tags, self._sorted_tags, term), TAG))
+        scores.update(dict.fromkeys(self._prefixed(self._words, self._sorted_words, term), WORD))
+        scores.update(dict.fromkeys(self._sorted_names[start:end], PREFIX))
+        for name in self._sorted_names[start:end]:
+            if lower[name] != term:
+                break
+            scores[name] = EXACT
+
+        if not scores and len(term) >= 3:
+            for word in self.similar_words(term):
+                scores.update(dict.fromkeys(self._words[word], FUZZY))
+        if within is not None:
+            scores = {name: score for name, score in scores.items() if name in within}
+        return scores
+
+    def match_facet(self, facet, value, names):
+        if facet == 'tag':
+            return names & self._tags.get(value, set())
+        bounds = parse_range(value)
+        if bounds is None:
+            return set()
+        low = -1 if bounds[0] is None else bounds[0]
+        high = float('inf') if bounds[1] is None else bounds[1]
+        numbers = self._numbers[facet]
+        return {name for name in names if low <= numbers[name] <= high}
+
+    def search(self, text):
+        # names matching every term of the query, best matches first, then by name
+        self.prepare()
+        terms, facets = parse_query(text)
+        names = None
+        for facet, value in facets:
+            names = self.match_facet(facet, value, self.entries.keys() if names is None else names)
+        scores = None
+        for term in terms:
+            matched = self.match_term(term, names)
+            if scores is not None:
+                matched = {name: score + scores[name] for name, score in matched.items() if name in scores}
+            if not matched:
+                return []
+            scores = matched
+            names = set(scores)
+        if names is None:
+            return list(self._sorted_names)
+        if len(names) * 8 > len(self._sorted_names):
+            # most of the library, picking from the presorted names beats sorting them
+            ranked = [name for name in self._sorted_names if name in names]
+        else:
+            ranked = sorted(names, key=self._order.__getitem__)
+        if scores and len(set(scores.values())) > 1:
+            # a stable sort, equal scores stay in name order
+            ranked.sort(key=scores.__getitem__, reverse=True)
+        return ranked
+
+    def facets(self, names=None):
+        # how many of the names (all entries by default) fall under each tag, shape count and cv range
+        if names is None:
+            values = self._facet_values.values()
+        else:
+            values = [self._facet_values[name] for name in names]
+        columns = list(zip(*values)) or [(), (), ()]
+        return {facet: Counter(column) for facet, column in zip(FACETS, columns)}
+
+    def tags(self):
+        return sorted(self._tags)
@@ -0,0 +1,83 @@
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton,
+                               QHeaderView, QAbstractItemView, QFileDialog)
+
+COLUMNS = (
+    ('Operation', 'operation', '{}'),
+    ('Calls', 'calls', '{}'),
+    ('Total ms', 'total_ms', '{:.1f}'),
+    ('Mean ms', 'mean_ms', '{:.2f}'),
+    ('Recent ms', 'recent_mean_ms', '{:.2f}'),
+    ('Max ms', 'max_ms', '{:.2f}'),
+    ('Cmds/call', 'commands_per_call', '{:.1f}'),
+)
+
+
+class ProfilerPanel(QWidget):
+    # the profiler's numbers as a table, refreshed while the panel is showing. "Recent ms" is the mean of
+    # the latest calls only, so it moves when something gets slower or faster mid-session.
+    def __init__(self, profiler, interval=500, parent=None):
+        super(ProfilerPanel, self).__init__(parent)
+        self.setObjectName("profilerPanel")
+        self.profiler = profiler
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels([title for title, _, _ in COLUMNS])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.verticalHeader().hide()
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionMode(QAbstractItemView.NoSelection)
+        self.table.setMinimumHeight(140)
+
+        buttons = QHBoxLayout()
+        for text, slot in (("Reset", self.reset), ("Export JSON", self.export_json), ("Export CSV", self.export_csv)):
+            button = QPushButton(text)
+            button.setObjectName("profilerButton")
+            button.clicked.connect(slot)
+            buttons.addWidget(button)
+        buttons.addStretch()
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 4, 0, 0)
+        layout.addWidget(self.table)
+        layout.addLayout(buttons)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start()
+        super(ProfilerPanel, self).showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super(ProfilerPanel, self).hideEvent(event)
+
+    def refresh(self):
+        rows = self.profiler.stats()
+        self.table.setRowCount(len(rows))
+        for row, stats in enumerate(rows):
+            for column, (_, key, fmt) in enumerate(COLUMNS):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if column:
+                        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                    self.table.setItem(row, column, item)
+                item.setText(fmt.format(stats[key]))
+
+    def reset(self):
+        self.profiler.reset()
+        self.refresh()
+
+    def export_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export profile", "clib_profile.json", "JSON (*.json)")
+        if path:
+            self.profiler.export_json(path)
+
+    def export_csv(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export profile", "clib_profile.csv", "CSV (*.csv)")
+        if path:
+            self.profiler.export_csv(path)
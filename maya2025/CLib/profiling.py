@@ -0,0 +1,176 @@
+import csv
+import json
+import time
+import functools
+import contextlib
+from collections import deque
+
+import maya.cmds as cmds
+
+# Wall time, call counts and maya commands per operation for CLib's hot paths.
+#
+# Methods marked @profiled stay the plain functions they were until the profiler is switched on. enable()
+# swaps timing wrappers onto their classes and a counting wrapper onto every maya.cmds command, disable()
+# puts the originals back, so with profiling off nothing at all runs in between. Anything that keeps a
+# reference to a profiled method (a signal connection, say) has to look it up again on every call to be seen.
+#
+#   from CLib.profiling import profiler
+#   profiler.enable()
+#   ...
+#   profiler.export_json(path) / profiler.export_csv(path)
+STAT_FIELDS = ('operation', 'calls', 'total_ms', 'mean_ms', 'recent_mean_ms', 'min_ms', 'max_ms', 'last_ms',
+               'commands', 'commands_per_call')
+
+
+class OperationStats:
+    def __init__(self, history):
+        self.calls = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.commands = 0
+        # (seconds, commands) of the latest calls, for the rolling numbers in the stats panel
+        self.recent = deque(maxlen=history)
+
+    def add(self, seconds, commands):
+        self.calls += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.commands += commands
+        self.recent.append((seconds, commands))
+
+    def summary(self, name):
+        recent = [seconds for seconds, _ in self.recent]
+        return {
+            'operation': name,
+            'calls': self.calls,
+            'total_ms': self.total * 1000,
+            'mean_ms': self.total / self.calls * 1000,
+            'recent_mean_ms': sum(recent) / len(recent) * 1000,
+            'min_ms': self.min * 1000,
+            'max_ms': self.max * 1000,
+            'last_ms': recent[-1] * 1000,
+            'commands': self.commands,
+            'commands_per_call': self.commands / self.calls,
+        }
+
+
+class Profiler:
+    def __init__(self, history=100):
+        self.history = history
+        self.enabled = False
+        # maya commands issued while profiling, operations count theirs as the difference across the call
+        self.commands = 0
+        self._stats = {}
+        self._targets = []
+        self._cmds_originals = {}
+
+    def register(self, owner, attr, func):
+        name = func.__qualname__
+        self._targets.append((owner, attr, func, name))
+        setattr(owner, attr, self._wrap(name, func) if self.enabled else func)
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        for owner, attr, func, name in self._targets:
+            setattr(owner, attr, self._wrap(name, func))
+        for command in dir(cmds):
+            original = getattr(cmds, command)
+            if command.startswith('_') or not callable(original):
+                continue
+            self._cmds_originals[command] = original
+            setattr(cmds, command, self._count(original))
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        for owner, attr, func, name in self._targets:
+            setattr(owner, attr, func)
+        for command, original in self._cmds_originals.items():
+            setattr(cmds, command, original)
+        self._cmds_originals.clear()
+
+    def _count(self, command):
+        @functools.wraps(command)
+        def counted(*args, **kwargs):
+            self.commands += 1
+            return command(*args, **kwargs)
+        return counted
+
+    def _wrap(self, name, func):
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            commands = self.commands
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start, self.commands - commands)
+        return timed
+
+    def section(self, name):
+        # for timing a block inside a function, a do-nothing context while profiling is off
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._section(name)
+
+    @contextlib.contextmanager
+    def _section(self, name):
+        commands = self.commands
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, self.commands - commands)
+
+    def record(self, name, seconds, commands=0):
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = OperationStats(self.history)
+        stats.add(seconds, commands)
+
+    def stats(self):
+        return [self._stats[name].summary(name) for name in sorted(self._stats)]
+
+    def reset(self):
+        self._stats.clear()
+
+    def export_json(self, path):
+        data = {
+            'operations': self.stats(),
+            'recent': {name: [{'ms': seconds * 1000, 'commands': commands} for seconds, commands in stats.recent]
+                       for name, stats in sorted(self._stats.items())},
+        }
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+        return path
+
+    def export_csv(self, path):
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=STAT_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.stats())
+        return path
+
+    def format_stats(self):
+        lines = [f"{'operation':<36} {'calls':>6} {'total ms':>10} {'mean ms':>9} {'max ms':>9} {'cmds/call':>10}"]
+        for row in self.stats():
+            lines.append(f"{row['operation']:<36} {row['calls']:>6} {row['total_ms']:>10.1f} {row['mean_ms']:>9.2f} "
+                         f"{row['max_ms']:>9.2f} {row['commands_per_call']:>10.1f}")
+        return '\n'.join(lines)
+
+
+profiler = Profiler()
+
+
+class profiled:
+    # marks a method for the profiler, the class keeps the undecorated function until profiling is on
+    def __init__(self, func):
+        self.func = func
+
+    def __set_name__(self, owner, attr):
+        profiler.register(owner, attr, self.func)
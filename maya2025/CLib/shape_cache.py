@@ -0,0 +1,101 @@
+import os
+import threading
+from collections import OrderedDict
+
+from . import shape_format
+
+# rough in-memory cost of a parsed shape, used to keep the cache under its byte budget
+_CV_BYTES = 160
+_SHAPE_BYTES = 1024
+
+
+def estimate_size(curve_dict):
+    return sum(_SHAPE_BYTES + _CV_BYTES * len(info['cv_pos']) for info in curve_dict.values())
+
+
+class ShapeCache:
+    # Parsed shape files keyed on path, validated against the file's mtime + size on every lookup.
+    # Least recently used entries are dropped once either limit is passed.
+    # The returned dicts are shared between callers, copy before changing them.
+    def __init__(self, max_entries=512, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, file_path):
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry and entry[0] == stamp:
+                self._entries.move_to_end(file_path)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        curve_dict = shape_format.read_shape_file(file_path)
+        size = estimate_size(curve_dict)
+        with self._lock:
+            self._discard(file_path)
+            self._entries[file_path] = (stamp, curve_dict, size)
+            self.total_bytes += size
+            self._evict()
+        return curve_dict
+
+    def invalidate(self, file_path=None):
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+                self.total_bytes = 0
+            else:
+                self._discard(os.path.abspath(file_path))
+
+    def configure(self, max_entries=None, max_bytes=None):
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._evict()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def _discard(self, file_path):
+        entry = self._entries.pop(file_path, None)
+        if entry:
+            self.total_bytes -= entry[2]
+
+    def _evict(self):
+        # always keep the newest entry, even if it alone is over the byte budget
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self.total_bytes -= entry[2]
+            self.evictions += 1
+
+
+# one cache for the whole maya session, shared by the library ui and control creation
+shape_cache = ShapeCache()
+
+
+def load_shape(file_path):
+    return shape_cache.load(file_path)
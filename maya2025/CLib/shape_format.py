@@ -0,0 +1,250 @@
+import os
+import sys
+import json
+import struct
+import argparse
+from array import array
+from collections.abc import Sequence
+
+# Binary shape files (.clib) hold the same data as the json shape files, packed:
+#
+#   header:  magic 'CLIB' | version u16 | cv float size u8 (4 or 8) | reserved u8 | shape count u32
+#   shape:   name (u16 length + utf-8) | tag (u16 length + utf-8)
+#            degree u8 | form u8 | spans u32 | cv count u32 | knot count u32
+#            knots float64[knot count] | cvs float32/64[cv count * 3]
+#
+# Everything is little-endian. Knots are always written as doubles so periodic curves rebuild exactly.
+MAGIC = b'CLIB'
+VERSION = 1
+JSON_EXT = '.json'
+BINARY_EXT = '.clib'
+# when both formats of a shape sit in the same folder the binary one is read
+SHAPE_EXTS = (BINARY_EXT, JSON_EXT)
+
+_HEADER = struct.Struct('<4sHBBI')
+_SHAPE = struct.Struct('<BBIII')
+_LENGTH = struct.Struct('<H')
+_SWAP = sys.byteorder != 'little'
+
+
+class ShapeFormatError(ValueError):
+    pass
+
+
+class CvPoints(Sequence):
+    # the cvs of a binary shape file, kept as the flat array they were read into. Each [x, y, z] list is
+    # only made when it's asked for, building a control hands the flat array to maya as it is
+    __slots__ = ('flat',)
+
+    def __init__(self, flat):
+        self.flat = flat
+
+    def __len__(self):
+        return len(self.flat) // 3
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("cv index out of range")
+        return list(self.flat[index * 3:index * 3 + 3])
+
+    def __iter__(self):
+        values = iter(self.flat)
+        return map(list, zip(values, values, values))
+
+    def __eq__(self, other):
+        if isinstance(other, (list, CvPoints)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def tolist(self):
+        return list(self)
+
+
+def to_json(value):
+    # json.dump's default for what binary shape files read into
+    if isinstance(value, CvPoints):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} isn't json serializable")
+
+
+def _pack_array(typecode, values):
+    packed = array(typecode, values)
+    if _SWAP:
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack_array(typecode, data, offset, count):
+    packed = array(typecode)
+    end = offset + count * packed.itemsize
+    if end > len(data):
+        raise ShapeFormatError("Truncated shape data.")
+    packed.frombytes(data[offset:end])
+    if _SWAP:
+        packed.byteswap()
+    return packed, end
+
+
+def _pack_text(text):
+    raw = text.encode('utf-8')
+    return _LENGTH.pack(len(raw)) + raw
+
+
+def _unpack_text(data, offset):
+    length, = _LENGTH.unpack_from(data, offset)
+    offset += _LENGTH.size
+    return data[offset:offset + length].decode('utf-8'), offset + length
+
+
+def dumps(curve_dict, double=True):
+    cv_type = 'd' if double else 'f'
+    chunks = [_HEADER.pack(MAGIC, VERSION, 8 if double else 4, 0, len(curve_dict))]
+    for shape_name, info in curve_dict.items():
+        knots = info.get('knots') or []
+        cv_pos = info['cv_pos']
+        chunks.append(_pack_text(shape_name))
+        chunks.append(_pack_text(info.get('tag', 'default')))
+        chunks.append(_SHAPE.pack(info['degree'], info['form'], info['spans'], len(cv_pos), len(knots)))
+        chunks.append(_pack_array('d', knots))
+        flat = cv_pos.flat if isinstance(cv_pos, CvPoints) else [c for pt in cv_pos for c in pt]
+        chunks.append(_pack_array(cv_type, flat))
+    return b''.join(chunks)
+
+
+def loads(data):
+    if len(data) < _HEADER.size:
+        raise ShapeFormatError("Truncated shape file header.")
+    magic, version, float_size, _, shape_count = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ShapeFormatError("Not a CLib binary shape file.")
+    if version > VERSION:
+        raise ShapeFormatError(f"Shape file version {version} is newer than this CLib ({VERSION}).")
+    if float_size not in (4, 8):
+        raise ShapeFormatError(f"Unsupported cv float size: {float_size}")
+    cv_type = 'd' if float_size == 8 else 'f'
+
+    curve_dict = {}
+    offset = _HEADER.size
+    try:
+        for _ in range(shape_count):
+            shape_name, offset = _unpack_text(data, offset)
+            tag, offset = _unpack_text(data, offset)
+            degree, form, spans, cv_len, knot_len = _SHAPE.unpack_from(data, offset)
+            offset += _SHAPE.size
+            knots, offset = _unpack_array('d', data, offset, knot_len)
+            flat, offset = _unpack_array(cv_type, data, offset, cv_len * 3)
+            info = {
+                'spans': spans,
+                'degree': degree,
+                'form': form,
+                'cv_len': cv_len,
+                'cv_pos': CvPoints(flat),
+                'tag': tag
+            }
+            if knot_len:
+                info['knots'] = knots.tolist()
+            curve_dict[shape_name] = info
+    except struct.error:
+        raise ShapeFormatError("Truncated shape data.")
+    return curve_dict
+
+
+def read_shape_file(file_path):
+    if file_path.endswith(BINARY_EXT):
+        with open(file_path, 'rb') as f:
+            return loads(f.read())
+    with open(file_path, 'r') as f:
+        return json.load(f)
+
+
+def write_shape_file(file_path, curve_dict, double=True):
+    # written beside the target and moved over it, so nothing watching the library ever reads half a file
+    tmp_path = file_path + '.tmp'
+    if file_path.endswith(BINARY_EXT):
+        with open(tmp_path, 'wb') as f:
+            f.write(dumps(curve_dict, double=double))
+    else:
+        with open(tmp_path, 'w') as f:
+            json.dump(curve_dict, f, indent=4, default=to_json)
+    os.replace(tmp_path, file_path)
+
+
+def is_shape_file(file_name):
+    return file_name.endswith(SHAPE_EXTS)
+
+
+def shape_paths(shape_dir, name):
+    # every format a shape can be stored as, in read order
+    return [os.path.join(shape_dir, name + ext) for ext in SHAPE_EXTS]
+
+
+def find_shape_file(shape_dir, name):
+    for file_path in shape_paths(shape_dir, name):
+        if os.path.isfile(file_path):
+            return file_path
+    return None
+
+
+def list_shape_files(shape_dir):
+    # {shape name: file path}, one entry per shape even when it is stored in both formats
+    found = {}
+    for file_name in sorted(os.listdir(shape_dir)):
+        name, ext = os.path.splitext(file_name)
+        if ext in SHAPE_EXTS and (name not in found or ext == BINARY_EXT):
+            found[name] = os.path.join(shape_dir, file_name)
+    return found
+
+
+def remove_shape_files(file_path):
+    base = os.path.splitext(file_path)[0]
+    for ext in SHAPE_EXTS:
+        if os.path.exists(base + ext):
+            os.remove(base + ext)
+
+
+def convert(file_path, to_binary=True, double=True, keep_source=True):
+    base, ext = os.path.splitext(file_path)
+    target = base + (BINARY_EXT if to_binary else JSON_EXT)
+    if target == file_path:
+        return target
+    write_shape_file(target, read_shape_file(file_path), double=double)
+    if not keep_source:
+        os.remove(file_path)
+    return target
+
+
+def convert_library(shape_dir, to_binary=True, double=True, keep_source=True):
+    source_ext = JSON_EXT if to_binary else BINARY_EXT
+    return [convert(os.path.join(shape_dir, f), to_binary, double, keep_source)
+            for f in sorted(os.listdir(shape_dir)) if f.endswith(source_ext)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert CLib shape files between json and binary.")
+    parser.add_argument('direction', choices=('to-binary', 'to-json'))
+    parser.add_argument('paths', nargs='+', help="shape files or shape folders")
+    parser.add_argument('--single', action='store_true', help="store binary cvs as float32")
+    parser.add_argument('--remove-source', action='store_true', help="delete the file that was converted")
+    args = parser.parse_args(argv)
+
+    to_binary = args.direction == 'to-binary'
+    for path in args.paths:
+        if os.path.isdir(path):
+            written = convert_library(path, to_binary, not args.single, not args.remove_source)
+        else:
+            written = [convert(path, to_binary, not args.single, not args.remove_source)]
+        for target in written:
+            print(f"[CLib] wrote {target}")
+
+
+if __name__ == '__main__':
+    main()
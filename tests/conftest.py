@@ -0,0 +1,54 @@
+import os
+import sys
+import math
+
+import pytest
+
+# the tests run against the maya2025 package (maya2024 is the same code on PySide2), with the maya stand-in
+# ahead of any real maya on the path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (os.path.join(ROOT, 'maya2025'), os.path.join(ROOT, 'tools', 'standin')):
+    if path in sys.path:
+        sys.path.remove(path)
+    sys.path.insert(0, path)
+
+
+def circle_shape(cvs, name='ring', radius=1.0):
+    # a periodic degree 3 circle of cvs cvs, dense enough to decimate when cvs is large
+    points = [[radius * math.cos(2 * math.pi * i / cvs), 0.0, radius * math.sin(2 * math.pi * i / cvs)]
+              for i in range(cvs)]
+    return {f"|{name}|{name}Shape": {'spans': cvs, 'degree': 3, 'form': 2, 'cv_len': cvs, 'cv_pos': points,
+                                      'knots': list(range(-2, cvs + 3)), 'tag': 'default'}}
+
+
+@pytest.fixture
+def circle():
+    return circle_shape
+
+
+@pytest.fixture
+def make_library(tmp_path):
+    # make_library({'ring.json': curve_dict, ...}, folder='library') -> (shape_dir, icon_dir) of a new root
+    from CLib import shape_format
+
+    def make(shapes=None, folder='library'):
+        shape_dir = tmp_path / folder / 'shapes'
+        icon_dir = tmp_path / folder / 'icons'
+        shape_dir.mkdir(parents=True)
+        icon_dir.mkdir()
+        for file_name, curve_dict in (shapes or {}).items():
+            shape_format.write_shape_file(str(shape_dir / file_name), curve_dict)
+        return str(shape_dir), str(icon_dir)
+    return make
+
+
+@pytest.fixture
+def scene():
+    # an empty stand-in scene acting like mayapy, the maya.cmds module is what the test gets
+    import maya.cmds as cmds
+    from CLib import core
+    cmds.standin_reset()
+    core._bulk.update(depth=0, interactive=None)
+    yield cmds
+    cmds.standin_reset()
+    core._bulk.update(depth=0, interactive=None)
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+
+def write_spec(tmp_path, spec):
+    spec_path = tmp_path / 'rig.json'
+    spec_path.write_text(json.dumps(spec))
+    return str(spec_path)
+
+
+@pytest.mark.parametrize('control, message', [
+    ({'shape': 'ring', 'axis': 'W'}, 'axis'),
+    ({'shape': 'ring', 'color': [2, 0, 0]}, 'color'),
+    ({'shape': 'ring', 'lod': 'ultra'}, 'lod'),
+    ({'shape': 'ring', 'colour': [1, 0, 0]}, 'unknown keys'),
+    ({'targets': ['a_jnt']}, 'shape name'),
+])
+def test_read_spec_rejects_bad_controls(tmp_path, control, message):
+    from CLib import batch
+    spec_path = write_spec(tmp_path, {'controls': [control]})
+    with pytest.raises(batch.SpecError, match=message):
+        batch.read_spec(spec_path)
+
+
+def test_read_spec_fills_in_defaults(tmp_path):
+    from CLib import batch
+    spec_path = write_spec(tmp_path, {'library': 'library/shapes', 'defaults': {'suffix': 'ctrl'},
+                                      'controls': [{'shape': 'ring', 'targets': 'a_jnt'}]})
+    spec = batch.read_spec(spec_path)
+    assert spec['library'] == str(tmp_path / 'library' / 'shapes')
+    assert spec['controls'][0]['suffix'] == 'ctrl'
+    assert spec['controls'][0]['targets'] == ['a_jnt']
+
+
+def test_main_exit_code(tmp_path, scene, make_library, circle, monkeypatch):
+    from CLib import batch, library_roots
+    monkeypatch.setenv(library_roots.CONFIG_ENV, str(tmp_path / 'no_config.json'))
+    make_library({'ring.json': circle(8)})
+    placement = {'translate': [0, 1, 0], 'rotate': [0, 0, 0]}
+    good = {'shape': 'ring', 'targets': [placement, placement], 'name': 'ring{index}', 'suffix': 'ctrl'}
+
+    assert batch.main([write_spec(tmp_path, {'library': 'library/shapes', 'controls': [good]})]) == 0
+    assert scene.ls('ring1_ctrl') and scene.ls('ring2_ctrl')
+    # a failing entry is skipped, the rest is built, and the run still exits with 1
+    spec_path = write_spec(tmp_path, {'library': 'library/shapes', 'controls': [{'shape': 'nope'}, good]})
+    assert batch.main([spec_path]) == 1
+    assert batch.main([write_spec(tmp_path, {'controls': []})]) == 1
@@ -0,0 +1,15 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'tools', 'benchmarks'))
+
+import budgets
+
+
+def test_operations_stay_within_their_command_budgets(tmp_path, scene):
+    # the same check tools/benchmarks/budgets.py runs, so a per-cv or per-control command fails the suite
+    runs = budgets.run_operations(os.path.join(ROOT, 'maya2025', 'CLib', 'shapes'), str(tmp_path))
+    assert runs
+    over = [run.describe() for run in runs if run.over]
+    assert not over, '\n'.join(over)
@@ -0,0 +1,35 @@
+import sys
+
+from CLib import build_ui
+
+# stands in for uic: writes a Ui_MainWindow module for the .ui it's given
+FAKE_UIC = """import sys
+ui_file, output = sys.argv[1], sys.argv[3]
+with open(output, 'w') as f:
+    f.write('class Ui_MainWindow:\\n    pass\\n')
+"""
+
+
+def test_ensure_built_rebuilds_a_stale_module(tmp_path, monkeypatch):
+    uic = tmp_path / 'uic.py'
+    uic.write_text(FAKE_UIC)
+    monkeypatch.setattr(build_ui, 'find_uic', lambda: [sys.executable, str(uic)])
+    ui_file = tmp_path / 'ClibUI.ui'
+    ui_file.write_text('<ui version="4.0"/>')
+    output = str(tmp_path / 'ui_clib.py')
+
+    assert not build_ui.is_built(str(ui_file), output)
+    assert build_ui.ensure_built(str(ui_file), output)
+    assert build_ui.is_built(str(ui_file), output)
+
+    ui_file.write_text('<ui version="4.0"><widget/></ui>')
+    assert not build_ui.is_built(str(ui_file), output)
+    assert build_ui.ensure_built(str(ui_file), output)
+    assert f"UI_HASH = '{build_ui.ui_hash(str(ui_file))}'" in open(output).read()
+
+
+def test_ensure_built_without_uic(tmp_path, monkeypatch):
+    monkeypatch.setattr(build_ui, 'find_uic', lambda: None)
+    ui_file = tmp_path / 'ClibUI.ui'
+    ui_file.write_text('<ui version="4.0"/>')
+    assert not build_ui.ensure_built(str(ui_file), str(tmp_path / 'ui_clib.py'))
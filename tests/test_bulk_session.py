@@ -0,0 +1,47 @@
+import pytest
+
+from CLib import core
+
+
+class Boom(Exception):
+    pass
+
+
+@pytest.fixture
+def interactive(scene):
+    # as inside maya's window, where bulk sessions suspend the viewport
+    scene.standin_set_batch(False)
+    return scene
+
+
+def test_undo_chunk_and_refresh_come_back_after_an_error(interactive):
+    with pytest.raises(Boom):
+        with core.bulk_session("CLib_test"):
+            assert interactive._session['suspended']
+            assert interactive._undo['chunks'] == 1
+            raise Boom()
+    assert not interactive._session['suspended']
+    assert interactive._undo['chunks'] == 0
+    assert core._bulk['depth'] == 0
+
+
+def test_nested_sessions_share_the_outer_one(interactive):
+    with pytest.raises(Boom):
+        with core.bulk_session("outer"):
+            with core.bulk_session("inner"):
+                assert core._bulk['depth'] == 2
+                assert interactive._undo['chunks'] == 1
+                raise Boom()
+    assert core._bulk['depth'] == 0
+    assert interactive._undo['chunks'] == 0
+    assert not interactive._session['suspended']
+
+
+def test_undo_state_comes_back_when_not_undoable(scene):
+    # batch mode has no viewport, only the undo queue is switched off and back on
+    with pytest.raises(Boom):
+        with core.bulk_session("CLib_batch", undoable=False):
+            assert scene.undoInfo(query=True, state=True) is False
+            raise Boom()
+    assert scene.undoInfo(query=True, state=True) is True
+    assert not scene._session['suspended']
@@ -0,0 +1,40 @@
+import os
+
+from CLib import shape_format
+from CLib.decimate import decimate_library
+from CLib.library_index import LibraryIndex
+
+
+def indexed_library(make_library, circle, ext, folder='library'):
+    shape_dir, icon_dir = make_library({'ring' + ext: circle(400)}, folder)
+    index = LibraryIndex(shape_dir, icon_dir)
+    index.refresh()
+    return shape_dir, icon_dir, index
+
+
+def test_decimation_reaches_the_index(make_library, circle):
+    for ext in (shape_format.JSON_EXT, shape_format.BINARY_EXT):
+        shape_dir, icon_dir, index = indexed_library(make_library, circle, ext, ext[1:])
+        old_id = index.entries['ring']['content_id']
+
+        (name, before, after), = decimate_library(shape_dir, 0.01)
+        assert (name, before) == ('ring', 400) and after < before
+        assert os.listdir(shape_dir) == ['ring' + ext]
+
+        index.refresh()
+        assert index.entries['ring']['cv_count'] == after
+        assert index.entries['ring']['content_id'] != old_id
+        assert LibraryIndex(shape_dir, icon_dir).entries['ring']['cv_count'] == after
+
+
+def test_decimation_refreshes_a_given_index(make_library, circle):
+    shape_dir, _, index = indexed_library(make_library, circle, shape_format.JSON_EXT)
+    (_, _, after), = decimate_library(shape_dir, 0.01, index=index)
+    assert index.entries['ring']['cv_count'] == after
+
+
+def test_dry_run_leaves_the_library_alone(make_library, circle):
+    shape_dir, _, index = indexed_library(make_library, circle, shape_format.JSON_EXT)
+    decimate_library(shape_dir, 0.01, dry_run=True, index=index)
+    assert index.refresh() == ([], [], [])
+    assert index.entries['ring']['cv_count'] == 400
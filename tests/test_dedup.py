@@ -0,0 +1,31 @@
+import json
+
+from CLib import dedup
+from CLib.library_index import LibraryIndex, content_id
+
+
+def test_content_id_ignores_names_tags_and_shape_order(circle):
+    ring = circle(16)
+    info = dict(next(iter(ring.values())))
+    renamed = {'|other|otherShape': dict(info, tag='fk', cv_pos=[[c + 1e-7 for c in pt] for pt in info['cv_pos']])}
+    assert content_id(ring) == content_id(renamed)
+
+    two = {**circle(8, 'a'), **circle(16, 'b')}
+    assert content_id(two) == content_id(dict(reversed(list(two.items()))))
+    assert content_id(circle(16)) != content_id(circle(16, radius=2.0))
+
+
+def test_merge_deletes_duplicates_and_updates_the_index(make_library, circle, tmp_path):
+    shape_dir, icon_dir = make_library({'ring.json': circle(16), 'ring_copy.json': circle(16, 'copy'),
+                                        'big_ring.json': circle(16, radius=2.0)})
+    root = str(tmp_path / 'library')
+    map_path = str(tmp_path / 'map.json')
+
+    assert dedup.main(['--root', root, '--merge', '--dry-run']) == 0
+    assert sorted(LibraryIndex(shape_dir, icon_dir).entries) == ['big_ring', 'ring', 'ring_copy']
+
+    assert dedup.main(['--root', root, '--merge', '--map', map_path]) == 0
+    with open(map_path) as f:
+        assert json.load(f) == {'ring_copy': 'ring'}
+    # the persisted index matches the folder without another refresh
+    assert sorted(LibraryIndex(shape_dir, icon_dir).entries) == ['big_ring', 'ring']
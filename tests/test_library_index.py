@@ -0,0 +1,30 @@
+import os
+
+from CLib import shape_format
+from CLib.library_index import LibraryIndex
+
+
+def test_file_rewritten_in_place_is_updated(make_library, circle):
+    shape_dir, icon_dir = make_library({'ring.json': circle(400)})
+    index = LibraryIndex(shape_dir, icon_dir)
+    assert index.refresh() == (['ring'], [], [])
+    old_id = index.entries['ring']['content_id']
+
+    # rewriting the file in place leaves the folder's mtime alone, pin it to be sure
+    dir_stat = os.stat(shape_dir)
+    shape_format.write_shape_file(os.path.join(shape_dir, 'ring.json'), circle(109))
+    os.utime(shape_dir, ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns))
+
+    assert index.refresh() == ([], ['ring'], [])
+    assert index.entries['ring']['cv_count'] == 109
+    assert index.entries['ring']['content_id'] != old_id
+    # and the persisted index has it too
+    assert LibraryIndex(shape_dir, icon_dir).entries['ring']['cv_count'] == 109
+
+
+def test_unchanged_library_refreshes_to_nothing(make_library, circle):
+    shape_dir, icon_dir = make_library({'ring.json': circle(8)})
+    index = LibraryIndex(shape_dir, icon_dir)
+    index.refresh()
+    assert index.refresh() == ([], [], [])
+    assert LibraryIndex(shape_dir, icon_dir).refresh() == ([], [], [])
@@ -0,0 +1,25 @@
+import os
+import json
+
+from CLib import core
+from CLib.library_roots import Library, LibraryRoot, load_library
+
+
+def test_new_writable_root_gets_its_folders(tmp_path, scene):
+    config = tmp_path / 'libraries.json'
+    config.write_text(json.dumps({'roots': [{'path': str(tmp_path / 'personal')}]}))
+    library = load_library(str(config))
+    assert os.path.isdir(library.shape_dir) and os.path.isdir(library.write_root.icon_dir)
+
+    # the first save into it goes through
+    scene.select(core.Draw(shape_dir=core.SHAPE_DIR).create_curve('first', 'circle'))
+    builder = core.ControlBuilder(library.shape_dir, library.search_dirs())
+    assert builder.save_selected('default') == 'first'
+    library.refresh()
+    assert library.owners['first'] is library.write_root
+
+
+def test_read_only_root_is_not_created(tmp_path):
+    root = LibraryRoot(str(tmp_path / 'share'), read_only=True, mirror=False)
+    Library([root])
+    assert not os.path.exists(root.path)
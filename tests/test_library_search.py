@@ -0,0 +1,46 @@
+from CLib.library_search import SearchIndex
+
+
+def entry(name, tag='default', shape_count=1, cv_count=8):
+    return {'name': name, 'tag': tag, 'shape_count': shape_count, 'cv_count': cv_count}
+
+
+def make_index(*entries):
+    index = SearchIndex({e['name']: e for e in entries})
+    index.prepare()
+    return index
+
+
+def test_search_ranks_and_filters():
+    index = make_index(entry('arrow'), entry('arrowDouble', tag='fk', shape_count=2, cv_count=40),
+                       entry('circleArrow'), entry('square', tag='fk'))
+    # exact name, then name prefix, then a name word
+    assert index.search('arrow') == ['arrow', 'arrowDouble', 'circleArrow']
+    assert index.search('tag:fk') == ['arrowDouble', 'square']
+    assert index.search('arrow shapes:>1') == ['arrowDouble']
+    assert index.search('cvs:10-100') == ['arrowDouble']
+    # a typo still finds the word
+    assert index.search('sqare') == ['square']
+    assert index.search('nothing') == []
+
+
+def test_update_follows_refresh():
+    entries = {'arrow': entry('arrow'), 'square': entry('square')}
+    index = SearchIndex(entries)
+    assert index.search('sq') == ['square']
+    entries['squareThin'] = entry('squareThin')
+    del entries['square']
+    index.update(entries, ['squareThin'], [], ['square'])
+    assert index.search('sq') == ['squareThin']
+    assert len(index) == 2
+
+
+def test_facets_count_the_given_names():
+    index = make_index(entry('a', tag='fk'), entry('b', tag='fk', cv_count=200), entry('c', shape_count=3))
+    facets = index.facets()
+    assert facets['tag'] == {'fk': 2, 'default': 1}
+    assert facets['shapes'] == {1: 2, 3: 1}
+    assert facets['cvs'] == {'0-8': 2, '129-1024': 1}
+    assert index.facets(['b'])['cvs'] == {'129-1024': 1}
+    assert index.facets([]) == {'tag': {}, 'shapes': {}, 'cvs': {}}
+    assert index.tags() == ['default', 'fk']
@@ -0,0 +1,57 @@
+import math
+
+import pytest
+
+from CLib import core, curve_math
+
+
+def apply(matrix, points):
+    return curve_math.transform_points(points, matrix)
+
+
+def test_fit_matrix_recovers_an_affine_matrix():
+    source = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 2, 3], [-2, 1, 0.5]]
+    matrix = [[0, 2, 0, 0], [-2, 0, 0, 0], [0, 0, 3, 0], [1, 2, 3, 1]]
+    fitted = curve_math.fit_matrix(source, apply(matrix, source))
+    for row, expected in zip(fitted, matrix):
+        assert row == pytest.approx(expected, abs=1e-6)
+
+
+def test_fit_matrix_of_a_flat_shape(circle):
+    # a circle in xz leaves y undetermined, the fit still takes every point where it has to go
+    source = circle(16)['|ring|ringShape']['cv_pos']
+    matrix = [[2, 0, 0, 0], [0, 2, 0, 0], [0, 0, 2, 0], [0, 5, 0, 1]]
+    target = apply(matrix, source)
+    for got, want in zip(apply(curve_math.fit_matrix(source, target), source), target):
+        assert got == pytest.approx(want, abs=1e-6)
+
+
+def cvs(cmds, ctrl):
+    node = cmds.listRelatives(ctrl, shapes=True, fullPath=True, type='nurbsCurve')[0]
+    return core.Draw(ctrl).get_shape_info(node)['cv_pos']
+
+
+def test_set_lod_keeps_scale_and_placement(scene, make_library, circle):
+    shape_dir, _ = make_library({'ring.json': circle(400)})
+    joint = scene.createNode('joint', name='target_jnt')
+    scene.xform(joint, worldSpace=True, translation=(0, 5, 0))
+    scene.select(joint)
+    builder = core.ControlBuilder(shape_dir)
+    builder.ctrlscalevalue = 2.0
+    builder.bake_placement = True
+    ctrl, = builder.create_control('ring')
+    high = cvs(scene, ctrl)
+
+    assert builder.set_lod('low') == [ctrl]
+    low = cvs(scene, ctrl)
+    assert len(low) < len(high)
+    # decimated cvs stay on the scaled, moved circle
+    for x, y, z in low:
+        assert math.hypot(x, z) == pytest.approx(2.0, rel=0.1)
+        assert y == pytest.approx(5.0, abs=1e-6)
+    # already there, nothing to switch
+    assert builder.set_lod('low', [ctrl]) == []
+
+    assert builder.set_lod('high', [ctrl]) == [ctrl]
+    for got, want in zip(cvs(scene, ctrl), high):
+        assert got == pytest.approx(want, abs=1e-6)
@@ -0,0 +1,30 @@
+import pytest
+
+from CLib import core, shape_format
+
+
+def saved_cvs(save_dir, name):
+    curve_dict = shape_format.read_shape_file(shape_format.find_shape_file(save_dir, name))
+    return [pt for info in curve_dict.values() for pt in info['cv_pos']]
+
+
+def test_save_reads_the_shape_in_object_space(scene, make_library, circle, tmp_path):
+    # a control moved, turned and scaled after it was built saves the same cvs as one left at the origin
+    shape_dir, _ = make_library({'ring.json': circle(12)})
+    ctrl, = core.ControlBuilder(shape_dir).create_control('ring')
+    scene.xform(ctrl, worldSpace=True, translation=(3, 4, 5), rotation=(10, 45, 0), scale=(2, 2, 2))
+
+    save_dir = tmp_path / 'saved'
+    save_dir.mkdir()
+    scene.select(ctrl)
+    name = core.ControlBuilder(str(save_dir)).save_selected()
+    assert name
+    for got, want in zip(saved_cvs(str(save_dir), name), circle(12)['|ring|ringShape']['cv_pos']):
+        assert got == pytest.approx(want, abs=1e-6)
+    # and the control is left where it was
+    assert scene.xform(ctrl, query=True, worldSpace=True, translation=True) == pytest.approx([3, 4, 5])
+
+
+def test_save_without_selection_writes_nothing(scene, tmp_path):
+    assert core.ControlBuilder(str(tmp_path)).save_selected() is None
+    assert not list(tmp_path.iterdir())
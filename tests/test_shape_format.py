@@ -0,0 +1,52 @@
+import json
+import struct
+
+import pytest
+
+from CLib import shape_format
+
+
+def test_binary_round_trip(tmp_path, circle):
+    curve_dict = circle(50)
+    file_path = str(tmp_path / 'ring.clib')
+    shape_format.write_shape_file(file_path, curve_dict)
+    read = shape_format.read_shape_file(file_path)
+    assert read == curve_dict
+    info = read['|ring|ringShape']
+    assert len(info['cv_pos']) == 50
+    assert info['cv_pos'][-1] == curve_dict['|ring|ringShape']['cv_pos'][-1]
+    assert info['cv_pos'][1:3] == curve_dict['|ring|ringShape']['cv_pos'][1:3]
+
+    # and back to json, as the converter does
+    json_path = shape_format.convert(file_path, to_binary=False)
+    with open(json_path) as f:
+        assert json.load(f) == curve_dict
+
+
+def test_single_precision_stays_close(circle):
+    curve_dict = circle(8)
+    read = shape_format.loads(shape_format.dumps(curve_dict, double=False))
+    for got, want in zip(read['|ring|ringShape']['cv_pos'], curve_dict['|ring|ringShape']['cv_pos']):
+        assert got == pytest.approx(want, abs=1e-6)
+
+
+def test_newer_version_is_refused(circle):
+    data = bytearray(shape_format.dumps(circle(8)))
+    struct.pack_into('<H', data, 4, shape_format.VERSION + 1)
+    with pytest.raises(shape_format.ShapeFormatError, match='newer'):
+        shape_format.loads(bytes(data))
+
+
+@pytest.mark.parametrize('data, message', [
+    (b'CLI', 'header'),
+    (b'JSON' + bytes(8), 'Not a CLib'),
+])
+def test_bad_header(data, message):
+    with pytest.raises(shape_format.ShapeFormatError, match=message):
+        shape_format.loads(data)
+
+
+def test_truncated_shape_data(circle):
+    data = shape_format.dumps(circle(8))
+    with pytest.raises(shape_format.ShapeFormatError, match='Truncated'):
+        shape_format.loads(data[:-10])
@@ -0,0 +1,358 @@
+import os
+import sys
+import json
+import math
+import time
+import shutil
+import argparse
+import statistics
+import tempfile
+import contextlib
+import tracemalloc
+
+# Benchmarks for CLib's shape i/o and curve building, run on plain python against the maya stand-in in
+# tools/standin, so performance work can be measured (and checked against a baseline) without maya.
+#
+#   python tools/benchmarks/bench.py                          quick suite, printed as a table
+#   python tools/benchmarks/bench.py --suite full             10 to 10k shapes, 4 to 100k cvs
+#   python tools/benchmarks/bench.py --baseline               compare with tools/benchmarks/baseline.json
+#   python tools/benchmarks/bench.py --save-baseline          write the results as the new baseline
+#
+# Every case reports ops/sec, ms per op, the peak python memory of one op (tracemalloc) and the maya
+# commands one op issues. Timings depend on the machine, command counts don't: a case issuing more commands
+# than its baseline always counts as a regression, a slower one only past --tolerance.
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+STANDIN_DIR = os.path.join(ROOT, 'tools', 'standin')
+DEFAULT_CLIB = os.path.join(ROOT, 'maya2025')
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+SUITES = {
+    'quick': {'cvs': (4, 1000, 10000), 'shapes': (10, 1000), 'targets': (1, 50), 'mirror_shapes': (100,)},
+    'full': {'cvs': (4, 100, 1000, 10000, 100000), 'shapes': (10, 100, 1000, 10000), 'targets': (1, 50, 500),
+             'mirror_shapes': (100, 1000)},
+}
+# cvs per shape in the synthetic libraries used for the library-sized cases
+LIBRARY_SHAPE_CVS = 16
+SEARCH_QUERIES = (('first_key', 's'), ('fuzzy', 'shpe'), ('facets', 'tag:bench cvs:<20'))
+# seconds every call reaching a mirrored root's source waits, a slow network share stood in for by a local folder
+SHARE_LATENCY = 0.02
+
+
+def setup_paths(clib_root):
+    # the stand-in has to win over any real maya on the path
+    for path in (clib_root, STANDIN_DIR):
+        if path in sys.path:
+            sys.path.remove(path)
+        sys.path.insert(0, path)
+
+
+def synthetic_shape(cvs, seed=0):
+    # a wobbly periodic cubic loop with <cvs> unique cvs, stored the way Draw.get_shape_info reads curves
+    degree = min(3, cvs - 1)
+    points = []
+    for i in range(cvs):
+        angle = 2.0 * math.pi * i / cvs
+        radius = 10.0 + math.sin(angle * 7.0 + seed)
+        points.append([radius * math.cos(angle), math.sin(angle * 3.0 + seed), radius * math.sin(angle)])
+    return {
+        '|bench|benchShape': {
+            'spans': cvs,
+            'degree': degree,
+            'form': 2,
+            'cv_len': cvs,
+            'cv_pos': points,
+            'knots': [float(k) for k in range(1 - degree, cvs + degree)],
+            'tag': 'bench',
+        }
+    }
+
+
+def make_library(root, shapes, cvs=LIBRARY_SHAPE_CVS, binary=False):
+    from CLib import shape_format
+    shape_dir = os.path.join(root, f"lib_{shapes}_{'bin' if binary else 'json'}", 'shapes')
+    icon_dir = os.path.join(os.path.dirname(shape_dir), 'icons')
+    if not os.path.isdir(shape_dir):
+        os.makedirs(shape_dir)
+        os.makedirs(icon_dir)
+        ext = shape_format.BINARY_EXT if binary else shape_format.JSON_EXT
+        for i in range(shapes):
+            shape_format.write_shape_file(os.path.join(shape_dir, f"shape_{i:05d}{ext}"), synthetic_shape(cvs, i))
+    return shape_dir, icon_dir
+
+
+def throttle(mirror, latency=SHARE_LATENCY):
+    # every call of the mirror that reaches the source waits first, a scan once per file it stats
+    def slowed(method, per_file=False):
+        def slow(*args, **kwargs):
+            time.sleep(latency)
+            result = method(*args, **kwargs)
+            if per_file:
+                time.sleep(latency * (len(result) - 1))
+            return result
+        return slow
+    mirror.remote_manifest = slowed(mirror.remote_manifest)
+    mirror.remote_scan = slowed(mirror.remote_scan, per_file=True)
+    mirror.remote_copy = slowed(mirror.remote_copy)
+    return mirror
+
+
+class Case:
+    def __init__(self, key, run, setup=None, teardown=None):
+        self.key = key
+        self.run = run
+        # setup/teardown run around every op and aren't timed, setup's return value is handed to run
+        self.setup = setup
+        self.teardown = teardown
+
+    def once(self, probe=None):
+        # probe, a context manager, wraps just the op, for counting what the op itself does
+        state = self.setup() if self.setup else None
+        with probe or contextlib.nullcontext():
+            start = time.perf_counter()
+            self.run(state)
+            elapsed = time.perf_counter() - start
+        if self.teardown:
+            self.teardown(state)
+        return elapsed
+
+
+@contextlib.contextmanager
+def counting_commands(result):
+    import maya.cmds as cmds
+    before = sum(cmds.standin_calls.values())
+    yield
+    result['commands'] = sum(cmds.standin_calls.values()) - before
+
+
+@contextlib.contextmanager
+def tracing_memory(result):
+    tracemalloc.start()
+    try:
+        yield
+        result['peak'] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(case, min_time, min_runs, max_runs):
+    # a first untimed op warms up imports, caches and the like
+    case.once()
+
+    times = []
+    while (sum(times) < min_time or len(times) < min_runs) and len(times) < max_runs:
+        times.append(case.once())
+
+    counts = {}
+    case.once(counting_commands(counts))
+    case.once(tracing_memory(counts))
+
+    # the median op, a stray slow run (gc, the disk) doesn't move it
+    median = statistics.median(times)
+    return {
+        'ops_per_sec': 1.0 / median if median else float('inf'),
+        'ms_per_op': median * 1000,
+        'runs': len(times),
+        'peak_kb': counts['peak'] / 1024,
+        'commands': counts['commands'],
+    }
+
+
+def build_cases(suite, work_dir):
+    import maya.cmds as cmds
+    from CLib import shape_format, core
+    from CLib.library_index import LibraryIndex, INDEX_FILE
+    from CLib.library_search import SearchIndex
+    from CLib.library_roots import Library, LibraryRoot, write_manifest, MANIFEST_FILE
+    from CLib.shape_cache import shape_cache
+
+    cases = []
+    shape_dir = os.path.join(work_dir, 'single', 'shapes')
+    os.makedirs(shape_dir)
+
+    def new_scene(state=None):
+        cmds.file(new=True, force=True)
+
+    for cvs in suite['cvs']:
+        curve_dict = synthetic_shape(cvs)
+        name = f"cvs_{cvs}"
+        for binary, ext in ((False, shape_format.JSON_EXT), (True, shape_format.BINARY_EXT)):
+            path = os.path.join(shape_dir, name + ext)
+            shape_format.write_shape_file(path, curve_dict)
+            cases.append(Case(f"read_shape_file/{ext[1:]}/cvs={cvs}",
+                              lambda state, path=path: shape_format.read_shape_file(path)))
+
+        def built_curve(cvs=cvs, curve_dict=curve_dict):
+            new_scene()
+            return core.Draw(shape_dir=shape_dir).build_curve('bench', curve_dict)
+
+        for binary in (False, True):
+            out_dir = os.path.join(work_dir, f"write_{cvs}_{binary}")
+            os.makedirs(out_dir)
+            cases.append(Case(f"write_curve/{'binary' if binary else 'json'}/cvs={cvs}",
+                              lambda curve, out_dir=out_dir, binary=binary:
+                                  core.Draw(curve, out_dir).write_curve('bench', binary=binary),
+                              setup=built_curve, teardown=new_scene))
+        cases.append(Case(f"get_cv_positions/cvs={cvs}",
+                          lambda curve: core.Draw(curve, shape_dir).get_cv_positions(curve + '|benchShape'),
+                          setup=built_curve, teardown=new_scene))
+        cases.append(Case(f"create_curve/cvs={cvs}",
+                          lambda state, name=name: core.Draw(shape_dir=shape_dir).create_curve('bench', name),
+                          teardown=new_scene))
+
+    for shapes in suite['shapes']:
+        library_dir, icon_dir = make_library(work_dir, shapes)
+        index_path = os.path.join(os.path.dirname(library_dir), INDEX_FILE)
+
+        def cold_index(index_path=index_path):
+            # nothing on disk or in memory from an earlier op, like the first launch on a new library
+            if os.path.exists(index_path):
+                os.remove(index_path)
+            shape_cache.invalidate()
+
+        cases.append(Case(f"load_controls/index_cold/shapes={shapes}",
+                          lambda state, library_dir=library_dir, icon_dir=icon_dir:
+                              LibraryIndex(library_dir, icon_dir).refresh(),
+                          setup=cold_index))
+        cases.append(Case(f"load_controls/index_warm/shapes={shapes}",
+                          lambda state, library_dir=library_dir, icon_dir=icon_dir:
+                              LibraryIndex(library_dir, icon_dir).refresh()))
+
+        # one keystroke in the search bar: a first letter matching every shape, a typo, facets alone
+        library_index = LibraryIndex(library_dir, icon_dir)
+        library_index.refresh()
+        search_index = SearchIndex(library_index.entries)
+        for label, query in SEARCH_QUERIES:
+            cases.append(Case(f"search/{label}/shapes={shapes}",
+                              lambda state, search_index=search_index, query=query: search_index.search(query)))
+
+    library_dir, _ = make_library(work_dir, 1, cvs=LIBRARY_SHAPE_CVS)
+    for targets in suite['targets']:
+        def selected_targets(targets=targets):
+            new_scene()
+            nodes = []
+            for i in range(targets):
+                node = cmds.createNode('joint', name=f"bench_{i}_jnt", skipSelect=True)
+                cmds.xform(node, worldSpace=True, translation=(i, 0, 0), rotation=(0, 0, i % 90))
+                nodes.append(node)
+            cmds.select(nodes)
+            builder = core.ControlBuilder(library_dir)
+            builder.addOffset = True
+            return builder
+
+        cases.append(Case(f"create_control/targets={targets}",
+                          lambda builder: builder.create_control('shape_00000'),
+                          setup=selected_targets, teardown=new_scene))
+
+    # a read-only root on a slow share, browsing and building go through its local mirror and shouldn't
+    # notice the latency at all, only syncing the mirror pays it
+    latency = f"latency={SHARE_LATENCY * 1000:.0f}ms"
+    for shapes in suite['mirror_shapes']:
+        share_dir, _ = make_library(work_dir, shapes)
+        share_root = os.path.dirname(share_dir)
+        cache_dir = os.path.join(work_dir, f"mirrors_{shapes}")
+        root = LibraryRoot(share_root, 'share', read_only=True, cache_dir=cache_dir)
+        throttle(root.mirror).sync()
+        library = Library([root], cache_dir)
+
+        def cold_mirror(root=root):
+            index_path = os.path.join(root.local_path, INDEX_FILE)
+            if os.path.exists(index_path):
+                os.remove(index_path)
+            shape_cache.invalidate()
+
+        cases.append(Case(f"mirror/browse_cold/{latency}/shapes={shapes}",
+                          lambda state, root=root: Library([root]).refresh(), setup=cold_mirror))
+        cases.append(Case(f"mirror/create_control/{latency}/shapes={shapes}",
+                          lambda state, library=library: core.ControlBuilder(
+                              library.shape_dir, library.search_dirs()).create_control('shape_00000'),
+                          teardown=new_scene))
+
+        def manifest(publish, share_root=share_root):
+            manifest_path = os.path.join(share_root, MANIFEST_FILE)
+            if publish and not os.path.exists(manifest_path):
+                write_manifest(share_root)
+            elif not publish and os.path.exists(manifest_path):
+                os.remove(manifest_path)
+
+        cases.append(Case(f"mirror/sync_manifest/{latency}/shapes={shapes}",
+                          lambda state, root=root: root.mirror.sync(), setup=lambda: manifest(True)))
+        cases.append(Case(f"mirror/sync_no_manifest/{latency}/shapes={shapes}",
+                          lambda state, root=root: root.mirror.sync(), setup=lambda: manifest(False)))
+    return cases
+
+
+def compare(results, baseline, tolerance):
+    # adds the change against the baseline to every result, returns the keys that regressed
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if not base:
+            result['change'] = 'new'
+            continue
+        speed = result['ops_per_sec'] / base['ops_per_sec'] - 1.0 if base['ops_per_sec'] else 0.0
+        notes = [f"{speed * 100:+.0f}% ops/s"]
+        if result['commands'] > base['commands']:
+            notes.append(f"cmds {base['commands']} -> {result['commands']}")
+            regressions.append(key)
+        elif speed < -tolerance:
+            regressions.append(key)
+        if result['peak_kb'] > base['peak_kb'] * (1.0 + tolerance) + 64:
+            notes.append(f"memory {base['peak_kb']:.0f} -> {result['peak_kb']:.0f} KB")
+            regressions.append(key)
+        result['change'] = ', '.join(notes)
+    return sorted(set(regressions))
+
+
+def format_results(results):
+    lines = [f"{'case':<44} {'ops/s':>10} {'ms/op':>10} {'peak KB':>10} {'cmds':>7}  change"]
+    for key, r in results.items():
+        lines.append(f"{key:<44} {r['ops_per_sec']:>10.1f} {r['ms_per_op']:>10.3f} {r['peak_kb']:>10.1f} "
+                     f"{r['commands']:>7}  {r.get('change', '')}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark CLib against the maya stand-in.")
+    parser.add_argument('--suite', choices=sorted(SUITES), default='quick')
+    parser.add_argument('--filter', help="only run cases whose name contains this")
+    parser.add_argument('--clib', default=DEFAULT_CLIB, help="folder holding the CLib package to measure")
+    parser.add_argument('--min-time', type=float, default=0.2, help="seconds to keep repeating each case for")
+    parser.add_argument('--max-runs', type=int, default=5000)
+    parser.add_argument('--baseline', nargs='?', const=BASELINE_FILE, help="baseline json to compare against")
+    parser.add_argument('--save-baseline', nargs='?', const=BASELINE_FILE, help="write the results as a baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="how much slower (or bigger) than the baseline still passes, 0.25 = 25%%")
+    parser.add_argument('--json', help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    setup_paths(os.path.abspath(args.clib))
+    work_dir = tempfile.mkdtemp(prefix='clib_bench_')
+    try:
+        results = {}
+        for case in build_cases(SUITES[args.suite], work_dir):
+            if args.filter and args.filter not in case.key:
+                continue
+            results[case.key] = measure(case, args.min_time, 1, args.max_runs)
+            print(f"  {case.key}", file=sys.stderr)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            regressions = compare(results, json.load(f)['results'], args.tolerance)
+    print(format_results(results))
+
+    output = {'suite': args.suite, 'python': sys.version.split()[0], 'results': results}
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(output, f, indent=1, sort_keys=True)
+    if regressions:
+        print(f"\n{len(regressions)} regressed against {args.baseline}:\n  " + '\n  '.join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
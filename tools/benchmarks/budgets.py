@@ -0,0 +1,170 @@
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+from collections import Counter
+
+from bench import setup_paths, synthetic_shape, DEFAULT_CLIB
+
+# Maya command budgets for CLib's public operations, checked against the maya stand-in:
+#
+#   python tools/benchmarks/budgets.py          exit 1 if any operation goes over its budget
+#   python tools/benchmarks/budgets.py -v       every run with its commands, not just the failures
+#
+# Round-trips to maya are most of what CLib costs, so every operation gets an explicit number of commands it
+# may issue: a fixed part plus so many per control built and per curve shape. Nothing is allowed per cv,
+# every operation is also run on a 1000-cv curve, so a per-cv command (an xform per cv, say) blows the
+# budget straight away. Tighten a budget whenever an operation gets cheaper.
+BUDGETS = {
+    # operation: (fixed, per control, per curve shape)
+    'create_curve': (2, 0, 2),
+    'create_control': (10, 2, 5),
+    'create_control/selection': (10, 3, 5),
+    'create_control/selection/offset': (10, 4, 5),
+    'save_selected': (2, 0, 0),
+    'set_lod': (5, 4, 1),
+}
+HEAVY_CVS = 1000
+
+
+class CallRecorder:
+    # records every maya.cmds call made inside the with block, works the same on real maya
+    def __init__(self):
+        self.calls = []
+        self._originals = {}
+
+    def __enter__(self):
+        import maya.cmds as cmds
+        for name in dir(cmds):
+            command = getattr(cmds, name)
+            if name.startswith('_') or name.startswith('standin_') or not callable(command):
+                continue
+            self._originals[name] = command
+            setattr(cmds, name, self._record(name, command))
+        return self
+
+    def __exit__(self, *exc_info):
+        import maya.cmds as cmds
+        for name, command in self._originals.items():
+            setattr(cmds, name, command)
+        self._originals.clear()
+
+    def _record(self, name, command):
+        def recorded(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return command(*args, **kwargs)
+        return recorded
+
+    @property
+    def counts(self):
+        return Counter(name for name, _, _ in self.calls)
+
+
+class Run:
+    def __init__(self, operation, label, controls, shapes, recorder):
+        # operation picks the budget, label tells the runs of one operation apart
+        self.operation = operation
+        self.label = label
+        self.controls = controls
+        self.shapes = shapes
+        self.recorder = recorder
+        fixed, per_control, per_shape = BUDGETS[operation]
+        self.budget = fixed + per_control * controls + per_shape * shapes
+        self.used = len(recorder.calls)
+
+    @property
+    def over(self):
+        return self.used > self.budget
+
+    def describe(self, verbose=False):
+        status = 'OVER BUDGET' if self.over else 'ok'
+        lines = [f"{self.operation + '/' + self.label:<48} {self.used:>5} / {self.budget:<5} {status}"]
+        if verbose or self.over:
+            lines.append('    ' + ', '.join(f"{name} x{count}" for name, count in sorted(self.recorder.counts.items())))
+        return '\n'.join(lines)
+
+
+def run_operations(shape_dir, work_dir):
+    import maya.cmds as cmds
+    from CLib import shape_format, core
+
+    # counted as in the window, where bulk sessions suspend the viewport
+    cmds.standin_set_batch(False)
+    runs = []
+    shapes = {name: shape_format.read_shape_file(path)
+              for name, path in sorted(shape_format.list_shape_files(shape_dir).items())}
+    library = os.path.join(work_dir, 'shapes')
+    os.makedirs(library)
+    for name, curve_dict in shapes.items():
+        shape_format.write_shape_file(os.path.join(library, name + shape_format.JSON_EXT), curve_dict)
+    heavy = f"heavy_{HEAVY_CVS}"
+    shapes[heavy] = synthetic_shape(HEAVY_CVS)
+    shape_format.write_shape_file(os.path.join(library, heavy + shape_format.JSON_EXT), shapes[heavy])
+    multi = max(shapes, key=lambda name: len(shapes[name]))
+
+    def record(func, *args):
+        with CallRecorder() as recorder:
+            func(*args)
+        return recorder
+
+    for name, curve_dict in shapes.items():
+        cmds.file(new=True, force=True)
+        runs.append(Run('create_curve', name, 1, len(curve_dict),
+                        record(core.Draw(shape_dir=library).create_curve, 'bench', name)))
+
+        cmds.file(new=True, force=True)
+        runs.append(Run('create_control', name, 1, len(curve_dict),
+                        record(core.ControlBuilder(library).create_control, name)))
+
+        cmds.file(new=True, force=True)
+        control = core.Draw(shape_dir=library).create_curve(name, name)
+        cmds.select(control)
+        save_dir = os.path.join(work_dir, 'saved')
+        os.makedirs(save_dir, exist_ok=True)
+        runs.append(Run('save_selected', name, 1, len(curve_dict),
+                        record(core.ControlBuilder(save_dir).save_selected)))
+
+    for name in ('circle', multi, heavy):
+        for targets in (1, 10):
+            for offset in (False, True):
+                cmds.file(new=True, force=True)
+                nodes = [cmds.createNode('joint', name=f"target_{i}_jnt") for i in range(targets)]
+                for i, node in enumerate(nodes):
+                    cmds.xform(node, worldSpace=True, translation=(i, i, 0), rotation=(0, 0, 15 * i))
+                cmds.select(nodes)
+                builder = core.ControlBuilder(library)
+                builder.addOffset = offset
+                runs.append(Run('create_control/selection' + ('/offset' if offset else ''), f"{name}/targets={targets}",
+                                targets, targets * len(shapes[name]), record(builder.create_control, name)))
+
+        for lod in ('low', 'high'):
+            # every control of the scene switched at once, there and back again
+            runs.append(Run('set_lod', f"{name}/{lod}", 10, 10 * len(shapes[name]), record(builder.set_lod, lod)))
+    return runs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check CLib's maya command budgets against the maya stand-in.")
+    parser.add_argument('--clib', default=DEFAULT_CLIB, help="folder holding the CLib package to check")
+    parser.add_argument('-v', '--verbose', action='store_true', help="list the commands of every run")
+    args = parser.parse_args(argv)
+
+    clib_root = os.path.abspath(args.clib)
+    setup_paths(clib_root)
+    work_dir = tempfile.mkdtemp(prefix='clib_budgets_')
+    try:
+        runs = run_operations(os.path.join(clib_root, 'CLib', 'shapes'), work_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    over = [run for run in runs if run.over]
+    for run in runs:
+        if args.verbose or run.over:
+            print(run.describe(args.verbose))
+    print(f"{len(runs) - len(over)} of {len(runs)} runs within their maya command budget")
+    return 1 if over else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
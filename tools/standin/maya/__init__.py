@@ -0,0 +1 @@
+# Stand-in for the parts of maya that CLib's window-free code uses, see cmds.py.
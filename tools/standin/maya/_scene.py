@@ -0,0 +1,203 @@
+import math
+import fnmatch
+
+# The in-memory dag behind the stand-in maya.cmds and maya.api.OpenMaya: transforms, shapes and their
+# attributes, world matrices and name lookup. Matrices follow maya's row-vector convention (point * matrix,
+# translation in the last row) and rotations are xyz eulers in degrees. Only what CLib touches is modelled,
+# transforms are assumed to have no shear and their rotate pivots sit at their origin.
+TRANSFORM_TYPES = ('transform', 'joint', 'parentConstraint')
+SHAPE_TYPES = ('nurbsCurve', 'mesh', 'locator')
+
+
+class Node:
+    def __init__(self, name, node_type, parent=None):
+        self.name = name
+        self.type = node_type
+        self.parent = parent
+        self.children = []
+        self.attrs = {}
+        if node_type in TRANSFORM_TYPES:
+            self.attrs.update(translate=(0.0, 0.0, 0.0), rotate=(0.0, 0.0, 0.0), scale=(1.0, 1.0, 1.0))
+
+    @property
+    def path(self):
+        names = []
+        node = self
+        while node:
+            names.append(node.name)
+            node = node.parent
+        return '|' + '|'.join(reversed(names))
+
+    @property
+    def is_transform(self):
+        return self.type in TRANSFORM_TYPES
+
+    def descendants(self):
+        for child in self.children:
+            yield child
+            yield from child.descendants()
+
+
+class Scene:
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.roots = []
+        self.selection = []
+        self.name = ''
+
+    def nodes(self):
+        for root in self.roots:
+            yield root
+            yield from root.descendants()
+
+    def find(self, name):
+        # full paths match exactly, short and partial paths match the end of a node's path
+        name = name.split('.')[0]
+        if name.startswith('|'):
+            return [node for node in self.nodes() if node.path == name]
+        suffix = '|' + name
+        return [node for node in self.nodes() if node.path.endswith(suffix)]
+
+    def get(self, name):
+        found = self.find(name)
+        if not found:
+            raise RuntimeError(f"No object matches name: {name}")
+        if len(found) > 1:
+            raise RuntimeError(f"More than one object matches name: {name}")
+        return found[0]
+
+    def match(self, pattern):
+        if not any(c in pattern for c in '*?['):
+            return self.find(pattern)
+        key = (lambda node: node.path) if '|' in pattern else (lambda node: node.name)
+        if pattern.startswith('|') or '|' not in pattern:
+            return [node for node in self.nodes() if fnmatch.fnmatchcase(key(node), pattern)]
+        return [node for node in self.nodes() if fnmatch.fnmatchcase(node.path, '*|' + pattern)]
+
+    def unique_name(self, name):
+        # new nodes never reuse a name in the scene, a trailing number is bumped until the name is free
+        taken = {node.name for node in self.nodes()}
+        if name not in taken:
+            return name
+        base = name.rstrip('0123456789')
+        number = int(name[len(base):] or 0) + 1
+        while f"{base}{number}" in taken:
+            number += 1
+        return f"{base}{number}"
+
+    def add(self, name, node_type, parent=None):
+        node = Node(self.unique_name(name), node_type, parent)
+        (parent.children if parent else self.roots).append(node)
+        return node
+
+    def reparent(self, node, parent):
+        (node.parent.children if node.parent else self.roots).remove(node)
+        node.parent = parent
+        (parent.children if parent else self.roots).append(node)
+
+    def copy(self, node, parent, name=None):
+        # copies a node and everything under it
+        duplicate = self.add(name or node.name, node.type, parent)
+        duplicate.attrs = {k: (dict(v) if isinstance(v, dict) else v) for k, v in node.attrs.items()}
+        for child in node.children:
+            self.copy(child, duplicate)
+        return duplicate
+
+    def remove(self, node):
+        (node.parent.children if node.parent else self.roots).remove(node)
+        gone = {node} | set(node.descendants())
+        self.selection = [sel for sel in self.selection if sel not in gone]
+
+    def short_name(self, node):
+        return node.name if len(self.find(node.name)) == 1 else node.path
+
+    def world_matrix(self, node):
+        matrix = local_matrix(node) if node.is_transform else identity()
+        parent = node.parent
+        while parent:
+            matrix = multiply(matrix, local_matrix(parent))
+            parent = parent.parent
+        return matrix
+
+    def set_world(self, node, translation=None, rotation=None):
+        world = self.world_matrix(node)
+        current_translation, current_rotation = decompose(world)
+        target = compose_trs(translation if translation is not None else current_translation,
+                             rotation if rotation is not None else current_rotation)
+        parent_world = self.world_matrix(node.parent) if node.parent else identity()
+        node.attrs['translate'], node.attrs['rotate'] = decompose(multiply(target, inverse(parent_world)))
+
+
+def identity():
+    return [[1.0 if i == j else 0.0 for j in range(4)] for i in range(4)]
+
+
+def multiply(a, b):
+    return [[sum(a[i][k] * b[k][j] for k in range(4)) for j in range(4)] for i in range(4)]
+
+
+def rotation_matrix(rotation):
+    rx, ry, rz = [math.radians(a) for a in rotation]
+    cx, sx = math.cos(rx), math.sin(rx)
+    cy, sy = math.cos(ry), math.sin(ry)
+    cz, sz = math.cos(rz), math.sin(rz)
+    return [[cy * cz, cy * sz, -sy, 0.0],
+            [sx * sy * cz - cx * sz, sx * sy * sz + cx * cz, sx * cy, 0.0],
+            [cx * sy * cz + sx * sz, cx * sy * sz - sx * cz, cx * cy, 0.0],
+            [0.0, 0.0, 0.0, 1.0]]
+
+
+def compose_trs(translation, rotation, scale=(1.0, 1.0, 1.0)):
+    matrix = rotation_matrix(rotation)
+    for i in range(3):
+        matrix[i] = [v * scale[i] for v in matrix[i]]
+    matrix[3] = [float(translation[0]), float(translation[1]), float(translation[2]), 1.0]
+    return matrix
+
+
+def local_matrix(node):
+    return compose_trs(node.attrs['translate'], node.attrs['rotate'], node.attrs['scale'])
+
+
+def decompose(matrix):
+    # translation and xyz euler rotation (degrees) of a matrix without shear, scale is divided out
+    rows = []
+    for i in range(3):
+        length = math.sqrt(sum(v * v for v in matrix[i][:3])) or 1.0
+        rows.append([v / length for v in matrix[i][:3]])
+    ry = math.asin(max(-1.0, min(1.0, -rows[0][2])))
+    if abs(rows[0][2]) < 1.0 - 1e-9:
+        rx = math.atan2(rows[1][2], rows[2][2])
+        rz = math.atan2(rows[0][1], rows[0][0])
+    else:
+        # gimbal lock, all of the remaining twist goes into x
+        rx = math.atan2(-rows[2][1], rows[1][1])
+        rz = 0.0
+    return (tuple(matrix[3][:3]), tuple(math.degrees(a) for a in (rx, ry, rz)))
+
+
+def inverse(matrix):
+    # gauss-jordan, plenty for the 4x4 transforms here
+    m = [list(row) + [1.0 if i == j else 0.0 for j in range(4)] for i, row in enumerate(matrix)]
+    for col in range(4):
+        pivot = max(range(col, 4), key=lambda r: abs(m[r][col]))
+        if abs(m[pivot][col]) < 1e-12:
+            raise RuntimeError("Matrix is not invertible")
+        m[col], m[pivot] = m[pivot], m[col]
+        factor = m[col][col]
+        m[col] = [v / factor for v in m[col]]
+        for row in range(4):
+            if row != col and m[row][col]:
+                scale = m[row][col]
+                m[row] = [a - scale * b for a, b in zip(m[row], m[col])]
+    return [row[4:] for row in m]
+
+
+def transform_point(point, matrix):
+    x, y, z = point
+    return tuple(x * matrix[0][j] + y * matrix[1][j] + z * matrix[2][j] + matrix[3][j] for j in range(3))
+
+
+scene = Scene()
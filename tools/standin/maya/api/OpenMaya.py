@@ -0,0 +1,156 @@
+import math
+
+from .. import _scene
+
+# Stand-in for the few maya.api.OpenMaya classes CLib reads the scene with, backed by the same scene as
+# the stand-in maya.cmds.
+
+
+class MSpace:
+    kInvalid = 0
+    kTransform = 1
+    kPreTransform = 2
+    kObject = 2
+    kPostTransform = 3
+    kWorld = 4
+
+
+class MPoint:
+    def __init__(self, x=0.0, y=0.0, z=0.0, w=1.0):
+        self.x, self.y, self.z, self.w = float(x), float(y), float(z), float(w)
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z, self.w)[index]
+
+    def __repr__(self):
+        return f"MPoint({self.x}, {self.y}, {self.z}, {self.w})"
+
+
+class MVector(MPoint):
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        super(MVector, self).__init__(x, y, z, 0.0)
+
+
+class MEulerRotation:
+    kXYZ = 0
+
+    def __init__(self, x=0.0, y=0.0, z=0.0, order=kXYZ):
+        self.x, self.y, self.z, self.order = float(x), float(y), float(z), order
+
+
+class MMatrix:
+    def __init__(self, rows=None):
+        self._rows = [list(row) for row in rows] if rows else _scene.identity()
+
+    def getElement(self, row, column):
+        return self._rows[row][column]
+
+    def __getitem__(self, index):
+        return self._rows[index // 4][index % 4]
+
+
+class MTransformationMatrix:
+    def __init__(self, matrix=None):
+        self._rows = matrix._rows if matrix is not None else _scene.identity()
+
+    def translation(self, space=MSpace.kTransform):
+        return MVector(*self._rows[3][:3])
+
+    def rotation(self, asQuaternion=False):
+        return MEulerRotation(*[math.radians(a) for a in _scene.decompose(self._rows)[1]])
+
+
+class MDagPath:
+    def __init__(self, node):
+        self._node = node
+
+    def fullPathName(self):
+        return self._node.path
+
+    def partialPathName(self):
+        return _scene.scene.short_name(self._node)
+
+    def inclusiveMatrix(self):
+        return MMatrix(_scene.scene.world_matrix(self._node))
+
+    def exclusiveMatrix(self):
+        parent = self._node.parent
+        return MMatrix(_scene.scene.world_matrix(parent) if parent else None)
+
+
+class MSelectionList:
+    def __init__(self):
+        self._nodes = []
+
+    def add(self, name):
+        found = _scene.scene.match(name)
+        if not found:
+            raise RuntimeError("(kInvalidParameter): Object does not exist")
+        self._nodes.extend(node for node in found if node not in self._nodes)
+        return self
+
+    def length(self):
+        return len(self._nodes)
+
+    def getDagPath(self, index):
+        return MDagPath(self._nodes[index])
+
+
+class MFnTransform:
+    def __init__(self, dag_path):
+        self._node = dag_path._node
+        if not self._node.is_transform:
+            raise RuntimeError("(kInvalidParameter): Object is incompatible with this method")
+
+    def rotatePivot(self, space=MSpace.kTransform):
+        if space == MSpace.kWorld:
+            return MPoint(*_scene.transform_point((0.0, 0.0, 0.0), _scene.scene.world_matrix(self._node)))
+        return MPoint()
+
+    def translation(self, space=MSpace.kTransform):
+        if space == MSpace.kWorld:
+            return MVector(*_scene.scene.world_matrix(self._node)[3][:3])
+        return MVector(*self._node.attrs['translate'])
+
+
+class MFnNurbsCurve:
+    kInvalid = 0
+    kOpen = 1
+    kClosed = 2
+    kPeriodic = 3
+
+    def __init__(self, dag_path):
+        self._dag_path = dag_path
+        self._node = dag_path._node
+        if self._node.type != 'nurbsCurve' or 'cached' not in self._node.attrs:
+            raise RuntimeError("(kInvalidParameter): Object is incompatible with this method")
+
+    @property
+    def degree(self):
+        return self._node.attrs['degree']
+
+    @property
+    def form(self):
+        return self._node.attrs['form'] + self.kOpen
+
+    @property
+    def numCVs(self):
+        return len(self._node.attrs['cached']['points'])
+
+    @property
+    def numSpans(self):
+        return self._node.attrs['spans']
+
+    @property
+    def numKnots(self):
+        return len(self._node.attrs['cached']['knots'])
+
+    def knots(self):
+        return list(self._node.attrs['cached']['knots'])
+
+    def cvPositions(self, space=MSpace.kObject):
+        points = self._node.attrs['cached']['points']
+        if space == MSpace.kWorld:
+            matrix = _scene.scene.world_matrix(self._node)
+            points = [_scene.transform_point(pt, matrix) for pt in points]
+        return [MPoint(*pt) for pt in points]
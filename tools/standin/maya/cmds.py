@@ -0,0 +1,336 @@
+import json
+import builtins
+import functools
+import collections
+
+from ._scene import scene
+from . import _scene
+
+# Stand-in for maya.cmds, enough of it to run CLib's window-free code (core.py, batch.py) with plain python.
+# Put tools/standin on sys.path ahead of anything else and `import maya.cmds` resolves here. Every call is
+# counted in standin_calls, standin_reset() gives a new empty scene. Scenes are saved and opened as json.
+# Only maya commands and the standin_ helpers may be public here, tools wrap every public callable as a command.
+standin_calls = collections.Counter()
+_undo = {'state': True, 'chunks': 0}
+# about(batch=True) answers batch unless standin_set_batch(False) says to act like the interactive ui
+_session = {'batch': True, 'suspended': False}
+
+
+def standin_reset():
+    scene.clear()
+    standin_calls.clear()
+    _undo.update(state=True, chunks=0)
+    _session.update(batch=True, suspended=False)
+
+
+def standin_set_batch(batch):
+    _session['batch'] = bool(batch)
+
+
+def _command(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        standin_calls[func.__name__] += 1
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def _flag(kwargs, long_name, short_name, default=None):
+    return kwargs.get(long_name, kwargs.get(short_name, default))
+
+
+def _names(args):
+    names = []
+    for arg in args:
+        names.extend([arg] if isinstance(arg, str) else arg)
+    return names
+
+
+def _split(plug):
+    node, _, attr = plug.partition('.')
+    return scene.get(node), attr
+
+
+@_command
+def createNode(node_type, name=None, parent=None, skipSelect=False, **kwargs):
+    name = name or kwargs.get('n') or f"{node_type}1"
+    parent = parent or kwargs.get('p')
+    parent_node = scene.get(parent) if parent else None
+    if node_type in _scene.SHAPE_TYPES and parent_node is None:
+        # like maya, a shape made on its own gets a transform to live under
+        parent_node = scene.add(node_type.replace('nurbsCurve', 'curve') + '1', 'transform')
+    if parent_node is not None and not parent_node.is_transform:
+        raise RuntimeError(f"Cannot parent under {parent_node.name}, it is not a transform")
+    node = scene.add(name, node_type, parent_node)
+    if not skipSelect:
+        scene.selection = [node]
+    return node.name
+
+
+@_command
+def group(*args, empty=False, name=None, parent=None, **kwargs):
+    if args and not empty:
+        raise RuntimeError("group: the stand-in only makes empty groups")
+    node = scene.add(name or kwargs.get('n') or 'group1', 'transform', scene.get(parent) if parent else None)
+    scene.selection = [node]
+    return node.name
+
+
+@_command
+def duplicate(*args, name=None, **kwargs):
+    # a duplicated shape comes back under a copy of its transform, like maya's duplicate of a shape node
+    copies = []
+    for source in [scene.get(n) for n in _names(args)]:
+        if source.is_transform:
+            copied = scene.copy(source, source.parent, name or source.name)
+        else:
+            transform = source.parent
+            copied = scene.add(name or transform.name, transform.type, transform.parent)
+            copied.attrs = dict(transform.attrs)
+            scene.copy(source, copied)
+        copies.append(copied)
+    scene.selection = copies
+    return [scene.short_name(n) for n in copies]
+
+
+@_command
+def parent(*args, world=False, shape=False, relative=False, **kwargs):
+    names = _names(args)
+    nodes = [scene.get(n) for n in (names if world else names[:-1])]
+    new_parent = None if world else scene.get(names[-1])
+    for node in nodes:
+        if not node.is_transform and not (shape and relative):
+            raise RuntimeError("parent: the stand-in only moves shapes with shape=True, relative=True")
+        if node.is_transform and not relative:
+            world_matrix = scene.world_matrix(node)
+            scene.reparent(node, new_parent)
+            parent_world = scene.world_matrix(new_parent) if new_parent else _scene.identity()
+            node.attrs['translate'], node.attrs['rotate'] = _scene.decompose(
+                _scene.multiply(world_matrix, _scene.inverse(parent_world)))
+        else:
+            scene.reparent(node, new_parent)
+    return [scene.short_name(n) for n in nodes]
+
+
+@_command
+def parentConstraint(target, constrained, maintainOffset=False, **kwargs):
+    # snaps the constrained node onto the target right away, the constraint node itself does nothing after
+    target_node, constrained_node = scene.get(target), scene.get(constrained)
+    translation, rotation = _scene.decompose(scene.world_matrix(target_node))
+    scene.set_world(constrained_node, translation, rotation)
+    node = scene.add(f"{constrained_node.name}_parentConstraint1", 'parentConstraint', constrained_node)
+    return [node.name]
+
+
+@_command
+def setAttr(plug, *values, type=None, **kwargs):
+    node, attr = _split(plug)
+    if type == 'nurbsCurve':
+        degree, spans, form, rational, dimension, knots, cv_count = values[:7]
+        points = [tuple(float(v) for v in pt) for pt in values[7:]]
+        if len(points) != cv_count:
+            raise RuntimeError(f"{plug}: expected {cv_count} cvs, got {len(points)}")
+        if len(knots) != cv_count + degree - 1:
+            raise RuntimeError(f"{plug}: {cv_count} cvs of degree {degree} need {cv_count + degree - 1} knots")
+        if spans != cv_count - degree:
+            raise RuntimeError(f"{plug}: {cv_count} cvs of degree {degree} make {cv_count - degree} spans")
+        node.attrs.update(degree=degree, spans=spans, form=form,
+                          cached={'knots': [float(k) for k in knots], 'points': points})
+        return
+    node.attrs[attr] = tuple(values) if len(values) > 1 else values[0]
+
+
+@_command
+def addAttr(*args, longName=None, attributeType=None, dataType=None, enumName=None, defaultValue=None, **kwargs):
+    # the new attribute starts at its default, strings at None like maya's
+    attr = longName or kwargs.get('ln')
+    names = _names(args) or [n.name for n in scene.selection]
+    default = defaultValue if defaultValue is not None else kwargs.get('dv')
+    if default is None and not (dataType or kwargs.get('dt')):
+        default = 0
+    for name in names:
+        node = scene.get(name)
+        if attr in node.attrs:
+            raise RuntimeError(f"Found a conflicting attribute name {attr} for {node.name}")
+        node.attrs[attr] = default
+
+
+@_command
+def getAttr(plug, **kwargs):
+    node, attr = _split(plug)
+    if attr not in node.attrs:
+        raise ValueError(f"No object matches name: {plug}")
+    value = node.attrs[attr]
+    return [value] if isinstance(value, tuple) else value
+
+
+@_command
+def xform(name, query=False, worldSpace=False, **kwargs):
+    node = scene.get(name)
+    query = query or kwargs.get('q', False)
+    world = worldSpace or kwargs.get('ws', False)
+    translation = _flag(kwargs, 'translation', 't')
+    rotation = _flag(kwargs, 'rotation', 'ro')
+    if query:
+        matrix = scene.world_matrix(node) if world else _scene.local_matrix(node)
+        if _flag(kwargs, 'rotatePivot', 'rp') or translation:
+            return list(_scene.transform_point((0.0, 0.0, 0.0), matrix))
+        if rotation:
+            return list(_scene.decompose(matrix)[1])
+        if _flag(kwargs, 'matrix', 'm'):
+            return [v for row in matrix for v in row]
+        raise RuntimeError("xform: the stand-in only queries translation, rotation, rotatePivot and matrix")
+    if world:
+        scene.set_world(node, translation, rotation)
+    else:
+        if translation is not None:
+            node.attrs['translate'] = tuple(float(v) for v in translation)
+        if rotation is not None:
+            node.attrs['rotate'] = tuple(float(v) for v in rotation)
+
+
+@_command
+def listRelatives(*args, shapes=False, fullPath=False, type=None, children=False, parent=False,
+                  allDescendents=False, **kwargs):
+    shapes = shapes or kwargs.get('s', False)
+    full = fullPath or kwargs.get('f', False)
+    found = []
+    for name in _names(args):
+        node = scene.get(name)
+        if parent or kwargs.get('p'):
+            related = [node.parent] if node.parent else []
+        elif allDescendents or kwargs.get('ad'):
+            related = list(node.descendants())
+        else:
+            related = node.children
+        if shapes:
+            related = [n for n in related if not n.is_transform]
+        if type:
+            types = [type] if isinstance(type, str) else type
+            related = [n for n in related if n.type in types]
+        found.extend(n.path if full else scene.short_name(n) for n in related)
+    return found or None
+
+
+@_command
+def ls(*args, selection=False, long=False, transforms=False, type=None, shapes=False, **kwargs):
+    if selection or kwargs.get('sl'):
+        nodes = list(scene.selection)
+    elif args:
+        # node.attr patterns match the nodes that have the attribute
+        nodes = []
+        for pattern in _names(args):
+            pattern, _, attr = pattern.partition('.')
+            nodes.extend(n for n in scene.match(pattern) if n not in nodes and (not attr or attr in n.attrs))
+    else:
+        nodes = list(scene.nodes())
+    if transforms or kwargs.get('tr'):
+        nodes = [n for n in nodes if n.is_transform]
+    if shapes:
+        nodes = [n for n in nodes if not n.is_transform]
+    node_type = type or kwargs.get('typ')
+    if node_type:
+        types = [node_type] if isinstance(node_type, str) else node_type
+        nodes = [n for n in nodes if n.type in types]
+    full = long or kwargs.get('l', False)
+    return [n.path if full else scene.short_name(n) for n in nodes]
+
+
+@_command
+def select(*args, clear=False, add=False, deselect=False, **kwargs):
+    if clear or kwargs.get('cl'):
+        scene.selection = []
+        return
+    nodes = [scene.get(name) for name in _names(args)]
+    if deselect or kwargs.get('d'):
+        scene.selection = [n for n in scene.selection if n not in nodes]
+    elif add:
+        scene.selection += [n for n in nodes if n not in scene.selection]
+    else:
+        scene.selection = nodes
+
+
+@_command
+def objExists(name):
+    return len(scene.find(name)) == 1
+
+
+@_command
+def delete(*args):
+    for name in _names(args):
+        scene.remove(scene.get(name))
+
+
+@_command
+def undoInfo(query=False, state=None, stateWithoutFlush=None, openChunk=False, closeChunk=False,
+             chunkName=None, **kwargs):
+    if query or kwargs.get('q'):
+        return _undo['state']
+    if openChunk:
+        _undo['chunks'] += 1
+    elif closeChunk:
+        if not _undo['chunks']:
+            raise RuntimeError("undoInfo: no chunk is open")
+        _undo['chunks'] -= 1
+    elif state is not None:
+        _undo['state'] = bool(state)
+    elif stateWithoutFlush is not None:
+        _undo['state'] = bool(stateWithoutFlush)
+
+
+@_command
+def refresh(suspend=None, force=False, **kwargs):
+    if suspend is not None:
+        if _session['batch']:
+            raise RuntimeError("refresh: there is no viewport to suspend in batch mode")
+        _session['suspended'] = bool(suspend)
+
+
+@_command
+def error(message):
+    raise RuntimeError(message)
+
+
+@_command
+def warning(message):
+    print(f"# Warning: {message}")
+
+
+@_command
+def about(batch=False, version=False, **kwargs):
+    if batch:
+        return _session['batch']
+    if version:
+        return 'standin'
+    raise RuntimeError("about: the stand-in only answers batch and version")
+
+
+@_command
+def file(path=None, new=False, force=False, open=False, save=False, rename=None, query=False, sceneName=False,
+         **kwargs):
+    if query or kwargs.get('q'):
+        return scene.name
+    if new:
+        scene.clear()
+        return ''
+    if rename:
+        scene.name = rename
+        return rename
+    if open:
+        with builtins.open(path, 'r') as f:
+            data = json.load(f)
+        scene.clear()
+        for entry in data['nodes']:
+            parent_path, _, name = entry['path'].rpartition('|')
+            node = scene.add(name, entry['type'], scene.get(parent_path) if parent_path else None)
+            node.attrs.update({k: tuple(v) if isinstance(v, list) else v for k, v in entry['attrs'].items()})
+        scene.name = path
+        return path
+    if save:
+        if not scene.name:
+            raise RuntimeError("file: the scene has no name to save to, rename it first")
+        with builtins.open(scene.name, 'w') as f:
+            json.dump({'nodes': [{'path': n.path, 'type': n.type, 'attrs': n.attrs} for n in scene.nodes()]},
+                      f, indent=1)
+        return scene.name
+    raise RuntimeError("file: the stand-in only does new, open, rename, save and query")
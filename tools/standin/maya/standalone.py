@@ -0,0 +1,9 @@
+# nothing to start, the stand-in scene exists as soon as maya.cmds is imported
+
+
+def initialize(name='python'):
+    pass
+
+
+def uninitialize():
+    pass